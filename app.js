@@ -7,13 +7,19 @@
     'use strict';
 
     // ─── State ───────────────────────────────────────────────────────
-    let hrData = [];
-    let entitlementData = [];
-    let entByEmployee = {};
-    let hrByEmployee = {};
+    let entIndex = null;  // RoleEngine.buildEntitlementIndex: interned dictionary + CSR holdings
+    let hrByEmployee = {};  // Employee ID → { first name, last name }
     let uploadedUserIds = [];
     let optimizedSolutions = [];
+    let solutionsPhase1 = null;  // the Phase 1 result optimizedSolutions were solved against
+    let orgColumns = null;  // RoleEngine.createOrgColumnsBuilder over the HR master
+    let orgDigest = null;  // orgColumnsDigest(orgColumns), the org group index cache key
+    let orgGroupIndexes = new Map();  // candidate mode → RoleEngine.buildOrgGroupIndex, cached in IndexedDB
     let selectedOptionIndex = 0;
+    let dataVersion = 0;    // bumped whenever the HR master or entitlements reload
+    let uploadVersion = 0;  // bumped whenever a new user list is accepted
+    let phase1Cache = null;  // last Phase 1 result: { key, minGroup, raw, rawKey, targets }
+    let diagnostics = null;  // traces of the last analysis or re-solve: { config, main, tasks, interactions }
 
     // ─── DOM refs ────────────────────────────────────────────────────
     const $ = id => document.getElementById(id);
@@ -30,31 +36,14 @@
     const thresholdValue = $('threshold-value');
     const minGroupSlider = $('min-group');
     const minGroupValue = $('min-group-value');
+    const candidateModeSelect = $('candidate-mode');
+    const solverBudgetSelect = $('solver-budget');
     const analyzeBtn = $('analyze-btn');
     const progressPanel = $('progress-panel');
     const progressBar = $('progress-bar');
     const progressText = $('progress-text');
     const resultsPanel = $('results-panel');
-
-    // ─── Grouping Strategies ─────────────────────────────────────────
-    const strategies = [
-        // Single-attribute
-        { name: 'Business Line', key: u => u.hr['Business Line'], attrCount: 1 },
-        { name: 'Job Family', key: u => u.hr['Job Family'], attrCount: 1 },
-        { name: 'Cost Center', key: u => u.hr['Cost Center Name'], attrCount: 1 },
-        { name: 'Region', key: u => u.hr['Region'], attrCount: 1 },
-        // Two-attribute
-        { name: 'Business Line + Job Family', key: u => `${u.hr['Business Line']}|${u.hr['Job Family']}`, attrCount: 2 },
-        { name: 'Business Line + Job Grade', key: u => `${u.hr['Business Line']}|${u.hr['Job Grade / Band']}`, attrCount: 2 },
-        { name: 'Business Line + Region', key: u => `${u.hr['Business Line']}|${u.hr['Region']}`, attrCount: 2 },
-        { name: 'Job Family + Job Grade', key: u => `${u.hr['Job Family']}|${u.hr['Job Grade / Band']}`, attrCount: 2 },
-        { name: 'SNODE L3 + L4', key: u => `${u.hr['SNODE L3']}|${u.hr['SNODE L4']}`, attrCount: 2 },
-        { name: 'Cost Center + Job Family', key: u => `${u.hr['Cost Center Name']}|${u.hr['Job Family']}`, attrCount: 2 },
-        // Three-attribute
-        { name: 'SNODE L3 + L4 + L5', key: u => `${u.hr['SNODE L3']}|${u.hr['SNODE L4']}|${u.hr['SNODE L5']}`, attrCount: 3 },
-        { name: 'Region + Job Family + Job Grade', key: u => `${u.hr['Region']}|${u.hr['Job Family']}|${u.hr['Job Grade / Band']}`, attrCount: 3 },
-        { name: 'Business Line + Job Family + Job Grade', key: u => `${u.hr['Business Line']}|${u.hr['Job Family']}|${u.hr['Job Grade / Band']}`, attrCount: 3 },
-    ];
+    const diagnosticsPanel = $('diagnostics-panel');
 
     // ─── Init: Load bundled data ─────────────────────────────────────
     async function init() {
@@ -65,18 +54,58 @@
         }
     }
 
+    // ─── Streaming CSV Ingestion ─────────────────────────────────────
+    // Data files are fetched as a Blob, which the browser can keep off the
+    // JS heap, and parsed chunk by chunk in Papa Parse's worker. Each chunk's
+    // rows are indexed and dropped, so neither the file text nor the full
+    // array of row objects is ever held at once.
+    const CSV_CHUNK_BYTES = 8 * 1024 * 1024;
+
+    async function streamCsv(url, onRows, onProgress) {
+        const resp = await fetch(url);
+        if (!resp.ok) throw new Error(`${url}: HTTP ${resp.status}`);
+        const blob = await resp.blob();
+        await new Promise((resolve, reject) => {
+            Papa.parse(blob, {
+                header: true,
+                skipEmptyLines: true,
+                worker: true,
+                chunkSize: CSV_CHUNK_BYTES,
+                chunk: results => {
+                    onRows(results.data);
+                    // cursor counts characters; close enough to bytes for progress
+                    if (onProgress) onProgress(Math.min(results.meta.cursor / Math.max(blob.size, 1), 1));
+                },
+                complete: () => resolve(),
+                error: err => reject(err)
+            });
+        });
+    }
+
+    const loadingText = fraction => `Loading ${Math.round(fraction * 100)}%`;
+
     async function loadHRData() {
         try {
-            const resp = await fetch('data/commercial_bank_hr_data.csv');
-            const text = await resp.text();
-            const result = Papa.parse(text, { header: true, skipEmptyLines: true });
-            hrData = result.data;
-            hrByEmployee = {};
-            for (const row of hrData) {
-                hrByEmployee[row['Employee ID']] = row;
-            }
+            const builder = RoleEngine.createOrgColumnsBuilder();
+            const names = {};
+            await streamCsv('data/commercial_bank_hr_data.csv', rows => {
+                for (const row of rows) {
+                    builder.add(row);
+                    // Only the name is kept per employee, for member labels
+                    names[row['Employee ID']] = {
+                        'Employee First Name': row['Employee First Name'],
+                        'Employee Last Name': row['Employee Last Name']
+                    };
+                }
+            }, fraction => { hrCount.textContent = loadingText(fraction); });
+            hrByEmployee = names;
+            orgColumns = builder.finish();
+            orgDigest = null;
+            orgGroupIndexes = new Map();
+            await orgGroupIndexFor(candidateModeSelect.value);
+            dataVersion++;
             hrIcon.className = 'overview-icon success';
-            hrCount.textContent = hrData.length.toLocaleString();
+            hrCount.textContent = orgColumns.rowCount.toLocaleString();
             updateOverviewTimestamp();
         } catch (e) {
             hrIcon.className = 'overview-icon error';
@@ -87,18 +116,14 @@
 
     async function loadEntitlementData() {
         try {
-            const resp = await fetch('data/entitlements.csv');
-            const text = await resp.text();
-            const result = Papa.parse(text, { header: true, skipEmptyLines: true });
-            entitlementData = result.data;
-            entByEmployee = {};
-            for (const row of entitlementData) {
-                const eid = row['Employee ID'];
-                if (!entByEmployee[eid]) entByEmployee[eid] = new Set();
-                entByEmployee[eid].add(`${row['Entitlement ID']}|${row['Application']}|${row['Application ID']}|${row['Application Business Unit']}|${row['Entitlement Name']}`);
-            }
+            const builder = RoleEngine.createEntitlementIndexBuilder();
+            await streamCsv('data/entitlements.csv', rows => {
+                for (const row of rows) builder.add(row);
+            }, fraction => { entCount.textContent = loadingText(fraction); });
+            entIndex = builder.finish();
+            dataVersion++;
             entIcon.className = 'overview-icon success';
-            entCount.textContent = entitlementData.length.toLocaleString();
+            entCount.textContent = entIndex.rowCount.toLocaleString();
             updateOverviewTimestamp();
         } catch (e) {
             entIcon.className = 'overview-icon error';
@@ -107,6 +132,84 @@
         }
     }
 
+    // ─── Org Group Index Cache ───────────────────────────────────────
+    // The org-wide group counts only change with the HR master and the
+    // candidate strategies, so they are kept in IndexedDB under a SHA-256 of
+    // the encoded strategy columns (the file itself is streamed, never held
+    // whole) plus the candidate mode. Only the latest HR master's indexes
+    // are kept. Without IndexedDB or crypto.subtle (e.g. on
+    // file://) the index is rebuilt on every load.
+    const ORG_INDEX_DB = 'rbac-role-mining';
+    const ORG_INDEX_STORE = 'org-group-index';
+
+    function idbRequest(req) {
+        return new Promise((resolve, reject) => {
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    function openOrgIndexDb() {
+        const req = indexedDB.open(ORG_INDEX_DB, 1);
+        req.onupgradeneeded = () => req.result.createObjectStore(ORG_INDEX_STORE);
+        return idbRequest(req);
+    }
+
+    // Digest of the per-column digests, so no buffer of the whole org is built
+    async function orgColumnsDigest(org) {
+        const parts = new Uint8Array(32 * RoleEngine.strategyColumns.length);
+        for (const [i, name] of RoleEngine.strategyColumns.entries()) {
+            parts.set(new Uint8Array(await crypto.subtle.digest('SHA-256', org.columns[name].codes)), 32 * i);
+        }
+        const digest = await crypto.subtle.digest('SHA-256', parts);
+        return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    async function loadOrgGroupIndex(org, mode) {
+        const strats = RoleEngine.candidateStrategies(mode);
+        let db = null;
+        let key = null;
+        try {
+            if (typeof indexedDB === 'undefined' || !(window.crypto && crypto.subtle)) {
+                throw new Error('IndexedDB or crypto.subtle not available');
+            }
+            if (!orgDigest) orgDigest = await orgColumnsDigest(org);
+            key = `${orgDigest}|${mode}`;
+            db = await openOrgIndexDb();
+            const cached = await idbRequest(db.transaction(ORG_INDEX_STORE).objectStore(ORG_INDEX_STORE).get(key));
+            if (RoleEngine.isOrgGroupIndexCurrent(cached, strats) && cached.rowCount === org.rowCount) {
+                db.close();
+                return cached;
+            }
+        } catch (e) {
+            console.warn('Org group index cache unavailable, building it in memory:', e);
+        }
+
+        const index = RoleEngine.buildOrgGroupIndex(org, strats);
+        if (db) {
+            try {
+                const store = db.transaction(ORG_INDEX_STORE, 'readwrite').objectStore(ORG_INDEX_STORE);
+                for (const k of await idbRequest(store.getAllKeys())) {
+                    if (!String(k).startsWith(`${orgDigest}|`)) store.delete(k);
+                }
+                await idbRequest(store.put(index, key));
+            } catch (e) {
+                console.warn('Could not cache the org group index:', e);
+            }
+            db.close();
+        }
+        return index;
+    }
+
+    async function orgGroupIndexFor(mode) {
+        if (!orgGroupIndexes.has(mode)) {
+            const span = RoleEngine.startSpan('orgIndex.load');
+            orgGroupIndexes.set(mode, await loadOrgGroupIndex(orgColumns, mode));
+            RoleEngine.endSpan(span, { mode });
+        }
+        return orgGroupIndexes.get(mode);
+    }
+
     // ─── Overview Timestamp ──────────────────────────────────────────
     function updateOverviewTimestamp() {
         if (overviewTimestamp) {
@@ -175,6 +278,7 @@
             console.warn(`${invalid.length} IDs not found in HR data:`, invalid);
         }
         uploadedUserIds = valid;
+        uploadVersion++;
 
         if (uploadedUserIds.length < 2) {
             alert('Need at least 2 valid employee IDs found in HR data.');
@@ -188,22 +292,15 @@
     // ─── Configuration ───────────────────────────────────────────────
     thresholdSlider.addEventListener('input', () => {
         thresholdValue.textContent = thresholdSlider.value + '%';
+        resolveLive();
     });
     minGroupSlider.addEventListener('input', () => {
         minGroupValue.textContent = minGroupSlider.value;
+        resolveLive();
     });
+    solverBudgetSelect.addEventListener('change', () => resolveLive(true));
 
     // ─── Utilities ───────────────────────────────────────────────────
-    function groupBy(arr, keyFn) {
-        const groups = {};
-        for (const item of arr) {
-            const key = keyFn(item);
-            if (!groups[key]) groups[key] = [];
-            groups[key].push(item);
-        }
-        return groups;
-    }
-
     function sleep(ms) {
         return new Promise(r => setTimeout(r, ms));
     }
@@ -215,7 +312,7 @@
     }
 
     function downloadFile(content, filename, mimeType) {
-        const blob = new Blob([content], { type: mimeType });
+        const blob = content instanceof Blob ? content : new Blob([content], { type: mimeType });
         const url = URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
@@ -232,179 +329,232 @@
 
     analyzeBtn.addEventListener('click', runOptimizedAnalysis);
 
-    async function runOptimizedAnalysis() {
-        const threshold = parseInt(thresholdSlider.value) / 100;
-        const minGroup = parseInt(minGroupSlider.value);
-
-        progressPanel.hidden = false;
-        resultsPanel.hidden = true;
-        analyzeBtn.disabled = true;
-        progressBar.style.width = '0%';
-        progressText.textContent = 'Preparing analysis...';
-        await sleep(50);
-
-        // Build user objects
-        const users = uploadedUserIds.map(id => ({
-            id,
-            hr: hrByEmployee[id],
-            entitlements: entByEmployee[id] || new Set()
-        }));
-        const allUserIds = new Set(users.map(u => u.id));
-
-        // ─── PHASE 1: Generate raw candidate pool ────────────────
-        // Also build org-wide groupings to measure "overspill" — how many
-        // employees from the full HR master file match each criteria but
-        // are NOT in the uploaded target list.
-        progressText.textContent = 'Phase 1: Building org-wide index...';
-        progressBar.style.width = '5%';
-        await sleep(30);
-
-        // Build full org user objects (lightweight — just HR + key functions)
-        const allOrgUsers = hrData.map(row => ({
-            id: row['Employee ID'],
-            hr: row
-        }));
-
-        // Pre-compute org-wide group counts for every strategy
-        const orgGroupCounts = {};  // "strategyName::groupKey" → count of ALL org employees
-        for (const strat of strategies) {
-            const orgGroups = groupBy(allOrgUsers, strat.key);
-            for (const [groupKey, orgMembers] of Object.entries(orgGroups)) {
-                orgGroupCounts[`${strat.name}::${groupKey}`] = orgMembers.length;
+    // ─── Engine Workers ──────────────────────────────────────────────
+    // Phase 1 runs on the first worker and each variant on its own worker.
+    // Inputs travel as transferred typed arrays (see engine.js); without
+    // Worker support the same engine calls run on the main thread.
+    let workerPool = null;
+    let nextTaskId = 0;
+    let nextRawKey = 0;  // names a Phase 1 result, so workers can keep it and its candidate index
+    const workerRawKeys = new WeakMap();  // worker → rawKey of the Phase 1 result it holds
+
+    function getWorkerPool() {
+        if (workerPool === null) {
+            try {
+                workerPool = RoleEngine.variantConfigs.map(() => new Worker('engine-worker.js'));
+            } catch (e) {
+                console.warn('Web Workers unavailable, running the engine on the main thread:', e);
+                workerPool = [];
             }
         }
+        return workerPool;
+    }
 
-        progressText.textContent = 'Phase 1: Generating candidate groups...';
-        progressBar.style.width = '10%';
-        await sleep(30);
-
-        const rawGroupData = [];
+    function runEngineInline(type, payload, onProgress) {
+        const run = type === 'phase1' ? RoleEngine.runPhase1 : RoleEngine.runVariant;
+        return sleep(0).then(() => {
+            RoleEngine.beginTrace(type);
+            try {
+                return run(payload, onProgress);
+            } finally {
+                recordTaskTrace(type, payload, -1, RoleEngine.endTrace());
+            }
+        });
+    }
 
-        for (let i = 0; i < strategies.length; i++) {
-            const strat = strategies[i];
-            progressText.textContent = `Phase 1: Analyzing ${strat.name}...`;
-            progressBar.style.width = `${10 + (i / strategies.length) * 35}%`;
-            await sleep(15);
+    // The worker gets a transferred copy of payload's typed arrays, so the
+    // caller's payload stays usable for other tasks and for the fallback.
+    // A variant task leaves out raw and targets when the worker already
+    // holds that Phase 1 result (see engine-worker.js).
+    function runEngineTask(worker, type, payload, onProgress) {
+        if (!worker) return runEngineInline(type, payload, onProgress);
+        const id = nextTaskId++;
+        const held = type === 'variant' && workerRawKeys.get(worker) === payload.rawKey;
+        const message = RoleEngine.cloneTyped(held ? { ...payload, raw: undefined, targets: undefined } : payload);
+        return new Promise((resolve, reject) => {
+            const cleanup = () => {
+                worker.removeEventListener('message', onMessage);
+                worker.removeEventListener('error', onError);
+            };
+            const onMessage = e => {
+                const msg = e.data;
+                if (msg.id !== id) return;
+                if (msg.type === 'progress') {
+                    if (onProgress) onProgress(msg.fraction, msg.text);
+                    return;
+                }
+                cleanup();
+                if (msg.type === 'result') {
+                    if (type === 'variant') workerRawKeys.set(worker, payload.rawKey);
+                    recordTaskTrace(type, payload, getWorkerPool().indexOf(worker), msg.trace);
+                    resolve(msg.result);
+                } else {
+                    reject(new Error(msg.message));
+                }
+            };
+            const onError = e => {
+                // Script failed to load (e.g. opened from file://): stop using workers
+                e.preventDefault();
+                cleanup();
+                console.warn('Engine worker failed, running on the main thread:', e.message);
+                workerPool = [];
+                resolve(runEngineInline(type, payload, onProgress));
+            };
+            worker.addEventListener('message', onMessage);
+            worker.addEventListener('error', onError);
+            worker.postMessage({ id, type, payload: message }, RoleEngine.transferables(message));
+        });
+    }
 
-            const groups = groupBy(users, strat.key);
+    // ─── Diagnostics ─────────────────────────────────────────────────
+    // An analysis or live re-solve opens a main-thread RoleEngine trace and
+    // collects the trace each engine task posts back. Roles expanded
+    // afterwards add interaction traces. The panel and the trace export
+    // both read the last run's diagnostics.
+    const DIAGNOSTICS_MAX_INTERACTIONS = 200;
 
-            for (const [groupKey, members] of Object.entries(groups)) {
-                if (members.length < 2) continue;
+    function beginDiagnostics(label, config) {
+        diagnostics = { config, main: RoleEngine.beginTrace(label), tasks: [], interactions: [] };
+        return diagnostics;
+    }
 
-                // Count entitlement frequency
-                const entCounts = {};
-                for (const user of members) {
-                    for (const ent of user.entitlements) {
-                        entCounts[ent] = (entCounts[ent] || 0) + 1;
-                    }
-                }
+    function endDiagnostics(run) {
+        RoleEngine.endTrace(run.main);
+        if (run === diagnostics) renderDiagnostics();
+    }
 
-                // Build criteria
-                const criteriaValues = groupKey.split('|');
-                const criteriaLabels = strat.name.split(' + ');
-                const criteria = {};
-                criteriaLabels.forEach((label, idx) => {
-                    criteria[label.trim()] = criteriaValues[idx] ? criteriaValues[idx].trim() : '';
-                });
+    // worker is the pool index, or -1 for a task run on the main thread
+    function recordTaskTrace(type, payload, worker, trace) {
+        if (!diagnostics || !trace) return;
+        diagnostics.tasks.push({ type, variantIndex: type === 'variant' ? payload.variantIndex : null, worker, trace });
+    }
 
-                // Overspill analysis: how many org-wide employees match this criteria?
-                const candidateId = `${strat.name}::${groupKey}`;
-                const orgTotal = orgGroupCounts[candidateId] || members.length;
-                const overspill = orgTotal - members.length;
-                // Precision: what % of the org-wide match are actually in our target list
-                const precision = members.length / orgTotal;
-
-                rawGroupData.push({
-                    id: candidateId,
-                    strategyName: strat.name,
-                    attrCount: strat.attrCount,
-                    groupKey,
-                    memberIds: new Set(members.map(m => m.id)),
-                    members,
-                    memberCount: members.length,
-                    criteria,
-                    roleName: criteriaValues.map(v => v.trim()).join(' - '),
-                    entCounts,
-                    orgTotal,
-                    overspill,
-                    precision
-                });
+    // Runs fn (a render step after the run) in its own trace
+    function traceInteraction(name, fn) {
+        if (!diagnostics) return fn();
+        const run = diagnostics;
+        RoleEngine.beginTrace(name);
+        const span = RoleEngine.startSpan(name);
+        try {
+            return fn();
+        } finally {
+            RoleEngine.endSpan(span);
+            const trace = RoleEngine.endTrace();
+            if (run === diagnostics && run.main.end !== null) {
+                run.interactions.push(trace);
+                if (run.interactions.length > DIAGNOSTICS_MAX_INTERACTIONS) run.interactions.shift();
+                renderDiagnostics();
             }
         }
+    }
 
-        // ─── PHASE 2+3: Generate 5 variant solutions ─────────────
-        progressText.textContent = 'Phase 2: Optimizing role assignments...';
-        progressBar.style.width = '50%';
-        await sleep(30);
+    function diagnosticsConfig(threshold, minGroup, candidateMode, solverBudgetMs) {
+        return {
+            users: uploadedUserIds.length,
+            threshold,
+            minGroup,
+            candidateMode,
+            solverBudgetMs
+        };
+    }
 
-        const variantConfigs = [
-            {
-                name: 'Recommended (Fewest Roles, Best Precision)',
-                description: 'Optimized to assign all users into the fewest possible roles while minimizing overspill — extra org employees pulled into the role who are not in your target list.',
-                weights: { coverage: 0.35, commonality: 0.20, richness: 0.10, groupSize: 0.05, precision: 0.30 },
-                thresholdAdjust: 0, minGroupAdjust: 0
-            },
-            {
-                name: 'Maximum Precision (Minimal Overspill)',
-                description: 'Prioritizes the tightest possible role criteria so that virtually no unintended employees are scoped in. May produce more roles to achieve precision.',
-                weights: { coverage: 0.20, commonality: 0.15, richness: 0.05, groupSize: 0.05, precision: 0.55 },
-                thresholdAdjust: 0, minGroupAdjust: 0,
-                preferGranular: true
-            },
-            {
-                name: 'Maximum Commonality',
-                description: 'Prioritizes the highest possible entitlement alignment within each role, with moderate overspill control.',
-                weights: { coverage: 0.20, commonality: 0.45, richness: 0.10, groupSize: 0.05, precision: 0.20 },
-                thresholdAdjust: 0.05, minGroupAdjust: 0
-            },
-            {
-                name: 'Broad Coverage',
-                description: 'Focuses on covering every user with minimal gaps, accepting slightly lower commonality and precision to reduce ungrouped users.',
-                weights: { coverage: 0.50, commonality: 0.15, richness: 0.10, groupSize: 0.05, precision: 0.20 },
-                thresholdAdjust: -0.05, minGroupAdjust: 0
-            },
-            {
-                name: 'Simple Grouping',
-                description: 'Favors broad, single-attribute groupings (e.g., Business Line or Job Family alone) for easier organizational mapping. May have higher overspill.',
-                weights: { coverage: 0.35, commonality: 0.20, richness: 0.10, groupSize: 0.15, precision: 0.20 },
-                thresholdAdjust: 0, minGroupAdjust: 0,
-                preferSimple: true
-            }
-        ];
+    // ─── Phase 1 cache ───────────────────────────────────────────────
+    // Phase 1 depends on the data, the uploaded list and the candidate mode,
+    // not on the sliders, except that it drops groups below phase1MinGroup:
+    // a cached result serves any minimum group size at least that large.
+    function phase1Key(candidateMode) {
+        return `${dataVersion}|${uploadVersion}|${candidateMode}`;
+    }
 
-        optimizedSolutions = [];
+    function cachedPhase1(candidateMode, minGroup) {
+        const c = phase1Cache;
+        return c && c.key === phase1Key(candidateMode) && c.minGroup <= RoleEngine.phase1MinGroup(minGroup) ? c : null;
+    }
 
-        for (let v = 0; v < variantConfigs.length; v++) {
-            const config = variantConfigs[v];
-            progressText.textContent = `Phase 2: Computing Option ${v + 1} — ${config.name}...`;
-            progressBar.style.width = `${50 + (v / variantConfigs.length) * 40}%`;
-            await sleep(25);
+    async function getPhase1(candidateMode, minGroup, onProgress) {
+        const cached = cachedPhase1(candidateMode, minGroup);
+        if (cached) return cached;
 
-            const adjThreshold = Math.max(0.50, Math.min(1.0, threshold + config.thresholdAdjust));
-            const adjMinGroup = Math.max(2, minGroup + config.minGroupAdjust);
+        // Encode the targets as typed arrays (org columns and group index come from loadHRData)
+        if (!orgColumns) orgColumns = RoleEngine.encodeOrgColumns([]);
+        const orgIndex = await orgGroupIndexFor(candidateMode);
+        const targets = RoleEngine.encodeTargets(uploadedUserIds, orgColumns, entIndex || RoleEngine.buildEntitlementIndex([]));
+        const phase1Min = RoleEngine.phase1MinGroup(minGroup);
+        const raw = await runEngineTask(getWorkerPool()[0], 'phase1',
+            {
+                rowCount: orgColumns.rowCount,
+                columns: orgColumns.columns,
+                strategies: RoleEngine.candidateStrategies(candidateMode),
+                minGroup: phase1Min,
+                orgIndex,
+                targets
+            },
+            onProgress);
+        phase1Cache = { key: phase1Key(candidateMode), minGroup: phase1Min, raw, rawKey: nextRawKey++, targets };
+        return phase1Cache;
+    }
 
-            // Filter candidates for this variant
-            const candidates = filterCandidatesForThreshold(rawGroupData, adjThreshold, adjMinGroup);
+    // Variant v always goes to worker v, which keeps the Phase 1 result
+    // between solves. A nonzero solverBudgetMs lets each variant improve its
+    // greedy cover for that long (RoleEngine.improveSetCover).
+    function solveVariants(phase1, threshold, minGroup, solverBudgetMs, onVariantProgress) {
+        const pool = getWorkerPool();
+        const { raw, rawKey, targets } = phase1;
+        return Promise.all(RoleEngine.variantConfigs.map((_, v) =>
+            runEngineTask(pool.length ? pool[v % pool.length] : null, 'variant',
+                { raw, rawKey, targets, threshold, minGroup, variantIndex: v, solverBudgetMs },
+                onVariantProgress && onVariantProgress(v))));
+    }
 
-            // Apply granularity/simplicity bonuses
-            for (const c of candidates) {
-                if (config.preferGranular) {
-                    c.bonus = c.attrCount * 0.10;
-                } else if (config.preferSimple) {
-                    c.bonus = (1 / c.attrCount) * 0.15;
-                } else {
-                    c.bonus = 0;
-                }
-            }
+    async function runOptimizedAnalysis() {
+        const threshold = parseInt(thresholdSlider.value) / 100;
+        const minGroup = parseInt(minGroupSlider.value);
+        const candidateMode = candidateModeSelect.value;
+        const solverBudgetMs = parseInt(solverBudgetSelect.value);
 
-            const solution = greedySetCover(candidates, allUserIds, config.weights, adjMinGroup);
-            solution.optionIndex = v + 1;
-            solution.optionName = config.name;
-            solution.optionDescription = config.description;
-            solution.weights = config.weights;
-            solution.compositeScore = scoreSolution(solution);
+        progressPanel.hidden = false;
+        resultsPanel.hidden = true;
+        analyzeBtn.disabled = true;
+        progressBar.style.width = '0%';
+        progressText.textContent = 'Preparing analysis...';
+        await sleep(50);
 
-            optimizedSolutions.push(solution);
+        const run = beginDiagnostics('analysis', diagnosticsConfig(threshold, minGroup, candidateMode, solverBudgetMs));
+        try {
+            // ─── PHASE 1: Generate raw candidate pool ────────────
+            progressText.textContent = 'Phase 1: Encoding target users...';
+            progressBar.style.width = '5%';
+            await sleep(30);
+            let span = RoleEngine.startSpan('analysis.phase1');
+            const cached = cachedPhase1(candidateMode, minGroup) !== null;
+            const phase1 = await getPhase1(candidateMode, minGroup, (fraction, text) => {
+                progressText.textContent = text;
+                progressBar.style.width = `${10 + fraction * 35}%`;
+            });
+            RoleEngine.endSpan(span, { cached });
+
+            // ─── PHASE 2+3: Solve the variants in parallel ───────
+            progressText.textContent = 'Phase 2: Optimizing role assignments...';
+            progressBar.style.width = '50%';
+
+            const variantCount = RoleEngine.variantConfigs.length;
+            const fractions = new Array(variantCount).fill(0);
+            span = RoleEngine.startSpan('analysis.variants');
+            optimizedSolutions = await solveVariants(phase1, threshold, minGroup, solverBudgetMs, v => fraction => {
+                fractions[v] = fraction;
+                const done = fractions.filter(f => f >= 1).length;
+                progressBar.style.width = `${50 + (fractions.reduce((s, f) => s + f, 0) / variantCount) * 45}%`;
+                progressText.textContent = `Phase 2: Computing options (${done}/${variantCount} complete)...`;
+            });
+            RoleEngine.endSpan(span);
+            solutionsPhase1 = phase1;
+        } catch (e) {
+            console.error('Analysis failed:', e);
+            endDiagnostics(run);
+            alert(`Analysis failed: ${e.message}`);
+            progressPanel.hidden = true;
+            analyzeBtn.disabled = false;
+            return;
         }
 
         progressBar.style.width = '100%';
@@ -413,172 +563,103 @@
         progressPanel.hidden = true;
         analyzeBtn.disabled = false;
 
+        const span = RoleEngine.startSpan('render.options');
         renderOptionCards(optimizedSolutions);
+        RoleEngine.endSpan(span);
+        endDiagnostics(run);
     }
 
-    // ─── Filter candidates for a given threshold ─────────────────────
-    function filterCandidatesForThreshold(rawGroupData, threshold, minGroup) {
-        const candidates = [];
-        for (const raw of rawGroupData) {
-            if (raw.memberCount < minGroup) continue;
-
-            const sharedEnts = [];
-            const outlierEnts = [];
-
-            for (const [ent, count] of Object.entries(raw.entCounts)) {
-                const commonality = count / raw.memberCount;
-                const parts = ent.split('|');
-                const entObj = {
-                    entitlementId: parts[0],
-                    application: parts[1],
-                    applicationId: parts[2],
-                    applicationBU: parts[3],
-                    entitlementName: parts[4],
-                    commonality,
-                    userCount: count,
-                    totalUsers: raw.memberCount
-                };
-                if (commonality >= threshold) {
-                    sharedEnts.push(entObj);
-                } else if (commonality < 0.2) {
-                    outlierEnts.push(entObj);
-                }
-            }
-
-            if (sharedEnts.length === 0) continue;
-
-            const avgCommonality = sharedEnts.reduce((s, e) => s + e.commonality, 0) / sharedEnts.length;
-
-            // Per-user outliers
-            const userOutliers = {};
-            for (const user of raw.members) {
-                const uniqueToUser = [];
-                for (const ent of user.entitlements) {
-                    if (raw.entCounts[ent] === 1) {
-                        const parts = ent.split('|');
-                        uniqueToUser.push({
-                            entitlementId: parts[0],
-                            application: parts[1],
-                            applicationId: parts[2],
-                            applicationBU: parts[3],
-                            entitlementName: parts[4]
-                        });
-                    }
-                }
-                if (uniqueToUser.length > 0) userOutliers[user.id] = uniqueToUser;
-            }
-
-            candidates.push({
-                id: raw.id,
-                strategyName: raw.strategyName,
-                attrCount: raw.attrCount,
-                groupKey: raw.groupKey,
-                memberIds: new Set(raw.memberIds),
-                members: raw.members,
-                memberCount: raw.memberCount,
-                criteria: raw.criteria,
-                roleName: raw.roleName,
-                sharedEntitlements: sharedEnts.sort((a, b) => b.commonality - a.commonality),
-                outlierEntitlements: outlierEnts.sort((a, b) => a.commonality - b.commonality),
-                userOutliers,
-                avgCommonality,
-                orgTotal: raw.orgTotal,
-                overspill: raw.overspill,
-                precision: raw.precision,
-                bonus: 0
-            });
+    // ─── Live re-solve ───────────────────────────────────────────────
+    // Once results are showing, slider moves re-run only candidate filtering
+    // and the greedy set cover against the cached Phase 1 result. A minimum
+    // group size below the cached one re-runs Phase 1 first. The solver
+    // budget applies only to Run Analysis and to a change of #solver-budget
+    // (budgeted = true). Moves that arrive during a solve coalesce into one
+    // more solve with the latest values.
+    let liveSolving = false;
+    let livePending = false;
+    let liveBudgeted = false;
+
+    async function resolveLive(budgeted = false) {
+        if (resultsPanel.hidden || analyzeBtn.disabled) return;
+        liveBudgeted = budgeted;
+        if (liveSolving) {
+            livePending = true;
+            return;
         }
-        return candidates;
-    }
-
-    // ─── Greedy Set Cover ────────────────────────────────────────────
-    function greedySetCover(candidates, allUserIds, weights, minGroup) {
-        const uncovered = new Set(allUserIds);
-        const solution = [];
-        const usedCandidateIds = new Set();
-
-        while (uncovered.size > 0) {
-            let bestCandidate = null;
-            let bestScore = -Infinity;
-
-            for (const candidate of candidates) {
-                if (usedCandidateIds.has(candidate.id)) continue;
-
-                // Count newly covered users
-                let newlyCoveredCount = 0;
-                for (const mid of candidate.memberIds) {
-                    if (uncovered.has(mid)) newlyCoveredCount++;
-                }
-
-                if (newlyCoveredCount < Math.min(minGroup, uncovered.size)) continue;
-
-                const score =
-                    weights.coverage * (newlyCoveredCount / uncovered.size) +
-                    weights.commonality * candidate.avgCommonality +
-                    weights.richness * Math.min(candidate.sharedEntitlements.length / 50, 1) +
-                    weights.groupSize * Math.min(candidate.memberCount / allUserIds.size, 1) +
-                    (weights.precision || 0) * (candidate.precision || 0) +
-                    (candidate.bonus || 0);
-
-                if (score > bestScore) {
-                    bestScore = score;
-                    bestCandidate = candidate;
+        liveSolving = true;
+        try {
+            do {
+                livePending = false;
+                const threshold = parseInt(thresholdSlider.value) / 100;
+                const minGroup = parseInt(minGroupSlider.value);
+                const candidateMode = candidateModeSelect.value;
+                const solverBudgetMs = liveBudgeted ? parseInt(solverBudgetSelect.value) : 0;
+                const run = beginDiagnostics('re-solve', diagnosticsConfig(threshold, minGroup, candidateMode, solverBudgetMs));
+                try {
+                    let span = RoleEngine.startSpan('analysis.phase1');
+                    const cached = cachedPhase1(candidateMode, minGroup) !== null;
+                    if (!cached || solverBudgetMs > 0) {
+                        progressPanel.hidden = false;
+                        progressBar.style.width = '0%';
+                        progressText.textContent = cached ? 'Improving role selection...' : 'Phase 1: Regrouping target users...';
+                    }
+                    const phase1 = await getPhase1(candidateMode, minGroup, (fraction, text) => {
+                        progressText.textContent = text;
+                        progressBar.style.width = `${fraction * 50}%`;
+                    });
+                    RoleEngine.endSpan(span, { cached });
+
+                    span = RoleEngine.startSpan('analysis.variants');
+                    const variantCount = RoleEngine.variantConfigs.length;
+                    const fractions = new Array(variantCount).fill(0);
+                    const base = cached ? 0 : 50;
+                    optimizedSolutions = await solveVariants(phase1, threshold, minGroup, solverBudgetMs,
+                        progressPanel.hidden ? null : v => fraction => {
+                            fractions[v] = fraction;
+                            const done = fractions.reduce((t, f) => t + f, 0) / variantCount;
+                            progressBar.style.width = `${base + done * (100 - base)}%`;
+                        });
+                    RoleEngine.endSpan(span);
+                    solutionsPhase1 = phase1;
+                    const detailOpen = !$('option-detail-panel').hidden;
+                    span = RoleEngine.startSpan('render.options');
+                    renderOptionCards(optimizedSolutions);
+                    if (detailOpen) expandOption(selectedOptionIndex);
+                    RoleEngine.endSpan(span);
+                } finally {
+                    progressPanel.hidden = true;
+                    endDiagnostics(run);
                 }
-            }
-
-            if (!bestCandidate) break;
-
-            usedCandidateIds.add(bestCandidate.id);
-
-            // Remove covered users from uncovered set
-            for (const mid of bestCandidate.memberIds) {
-                uncovered.delete(mid);
-            }
-
-            solution.push(bestCandidate);
+            } while (livePending);
+        } catch (e) {
+            console.error('Live re-analysis failed:', e);
+        } finally {
+            liveSolving = false;
         }
-
-        const ungroupedUsers = Array.from(uncovered);
-        const totalCovered = allUserIds.size - uncovered.size;
-
-        const avgPrecision = solution.length > 0
-            ? solution.reduce((s, r) => s + (r.precision || 0), 0) / solution.length
-            : 0;
-        const totalOverspill = solution.reduce((s, r) => s + (r.overspill || 0), 0);
-
-        return {
-            roles: solution,
-            ungroupedUsers,
-            totalRoles: solution.length,
-            totalUsersCovered: totalCovered,
-            totalUsers: allUserIds.size,
-            coveragePercent: allUserIds.size > 0 ? totalCovered / allUserIds.size : 0,
-            avgCommonality: solution.length > 0
-                ? solution.reduce((s, r) => s + r.avgCommonality, 0) / solution.length
-                : 0,
-            avgPrecision,
-            totalOverspill,
-            totalSharedEntitlements: solution.reduce((s, r) => s + r.sharedEntitlements.length, 0),
-            strategiesUsed: [...new Set(solution.map(r => r.strategyName))]
-        };
     }
 
-    // ─── Solution Scoring ────────────────────────────────────────────
-    function scoreSolution(solution) {
-        const normalizedRoleCount = solution.totalUsers > 0 ? solution.totalRoles / solution.totalUsers : 1;
-        return (
-            solution.coveragePercent * 30 +
-            (1 - Math.min(normalizedRoleCount, 1)) * 25 +
-            solution.avgCommonality * 15 +
-            (solution.avgPrecision || 0) * 20 +
-            Math.min(solution.totalSharedEntitlements / (Math.max(solution.totalRoles, 1) * 40), 1) * 10
-        );
+    // Solutions carry no outliers; they are worked out on the main thread
+    // from the cached Phase 1 result when a role is expanded or exported
+    function roleOutliers(role) {
+        return RoleEngine.roleOutliers(solutionsPhase1, role.groupIndex);
     }
 
     // ═══════════════════════════════════════════════════════════════════
     //  RENDERING
     // ═══════════════════════════════════════════════════════════════════
 
+    // One line on how far the solver got: roles against the greedy cover,
+    // and the gap between the option's weighted cost and its Lagrangian
+    // lower bound (a cost gap, not a role count gap)
+    function solverSummary(solver) {
+        const bound = solver.optimal
+            ? 'proven lowest cost'
+            : `cost within ${(solver.gap * 100).toFixed(1)}% of the lower bound`;
+        return `Solver: <strong>${solver.roles}</strong> roles (greedy ${solver.greedyRoles}), ${bound}, ` +
+            `${(solver.elapsedMs / 1000).toFixed(1)} s`;
+    }
+
     function renderOptionCards(solutions) {
         resultsPanel.hidden = false;
         const detailPanel = $('option-detail-panel');
@@ -617,6 +698,7 @@
                     </div>
                     <h3 class="option-name">${escHtml(sol.optionName)}</h3>
                     <p class="option-description">${escHtml(sol.optionDescription)}</p>
+                    ${sol.solver ? `<p class="option-solver">${solverSummary(sol.solver)}</p>` : ''}
                 </div>
                 <div class="option-stats-row">
                     <div class="option-stat">
@@ -645,12 +727,15 @@
                     <button class="btn btn-primary btn-sm option-expand-btn">View Roles</button>
                     <button class="btn btn-secondary btn-sm option-csv-btn">Export CSV</button>
                     <button class="btn btn-secondary btn-sm option-json-btn">Export JSON</button>
+                    <button class="btn btn-secondary btn-sm option-jsonl-btn">Export JSONL</button>
                 </div>
             `;
 
-            card.querySelector('.option-expand-btn').addEventListener('click', () => expandOption(idx));
+            card.querySelector('.option-expand-btn').addEventListener('click', () =>
+                traceInteraction(`render.option: ${sol.optionIndex}`, () => expandOption(idx)));
             card.querySelector('.option-csv-btn').addEventListener('click', () => exportOptionCsv(idx));
             card.querySelector('.option-json-btn').addEventListener('click', () => exportOptionJson(idx));
+            card.querySelector('.option-jsonl-btn').addEventListener('click', () => exportOptionJsonl(idx));
 
             grid.appendChild(card);
         });
@@ -686,38 +771,187 @@
             <span class="option-detail-stat ${precisionClass}"><strong>${sol.totalOverspill}</strong> overspill users</span>
             <span class="option-detail-stat"><strong>${sol.totalSharedEntitlements}</strong> total entitlements</span>
             <span class="option-detail-stat"><strong>${sol.strategiesUsed.length}</strong> strategies used</span>
+            ${sol.solver ? `<span class="option-detail-stat">${solverSummary(sol.solver)}</span>` : ''}
         `;
 
         // Export buttons in detail view
         $('detail-csv-btn').onclick = () => exportOptionCsv(idx);
         $('detail-json-btn').onclick = () => exportOptionJson(idx);
+        $('detail-jsonl-btn').onclick = () => exportOptionJsonl(idx);
 
-        // Ungrouped users
+        // Ungrouped users — listed on first "View Details"
         const ungroupedWarn = $('ungrouped-warning');
         if (sol.ungroupedUsers.length > 0) {
             ungroupedWarn.hidden = false;
             $('ungrouped-count').textContent = `${sol.ungroupedUsers.length} user${sol.ungroupedUsers.length > 1 ? 's' : ''}`;
             const ungroupedList = $('ungrouped-list');
             ungroupedList.hidden = true;
-            ungroupedList.innerHTML = sol.ungroupedUsers.map(uid => {
-                const emp = hrByEmployee[uid];
-                const label = emp ? `${uid} (${emp['Employee First Name']} ${emp['Employee Last Name']})` : uid;
-                return `<span class="member-tag">${escHtml(label)}</span>`;
-            }).join('');
+            ungroupedList.innerHTML = '';
+            let listed = false;
             $('show-ungrouped-btn').onclick = () => {
                 ungroupedList.hidden = !ungroupedList.hidden;
+                if (!listed && !ungroupedList.hidden) {
+                    listed = true;
+                    fillMemberList(ungroupedList, sol.ungroupedUsers);
+                }
             };
         } else {
             ungroupedWarn.hidden = true;
         }
 
-        // Render role cards
+        // Render role cards (headers only; bodies fill in on first expand)
         const container = $('option-role-cards');
         container.innerHTML = '';
-
+        const cards = document.createDocumentFragment();
         for (const role of sol.roles) {
-            container.appendChild(buildRoleCard(role));
+            cards.appendChild(buildRoleCard(role));
+        }
+        container.appendChild(cards);
+    }
+
+    // ─── Virtualized lists ───────────────────────────────────────────
+    // Lists longer than VIRTUAL_MIN_ROWS render only the rows in view
+    // (plus VIRTUAL_OVERSCAN either side) inside a fixed-height scroll
+    // box, with spacers standing in for the rest, so the DOM stays the
+    // same size however many entitlements or members a role has.
+    const VIRTUAL_MIN_ROWS = 100;
+    const VIRTUAL_OVERSCAN = 10;
+    const VIRTUAL_VIEWPORT_PX = 384;  // .virtual-scroll max-height
+    const ENT_ROW_PX = 34;
+    const MEMBER_ROW_PX = 28;
+    const MEMBER_CELL_PX = 190;
+    const OUTLIER_ROW_PX = 28;
+
+    // renderWindow(start, end, topPx, bottomPx) draws rows [start, end);
+    // measureRow(), if given, reports a drawn row's real height so the
+    // spacers follow the stylesheet rather than the constant.
+    function virtualList(viewport, rowHeight, renderWindow, measureRow) {
+        let rowCount = 0;
+        let first = -1, last = -1;
+        let frame = 0;
+        function update() {
+            const height = viewport.clientHeight || VIRTUAL_VIEWPORT_PX;
+            const start = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - VIRTUAL_OVERSCAN);
+            const end = Math.min(rowCount, Math.ceil((viewport.scrollTop + height) / rowHeight) + VIRTUAL_OVERSCAN);
+            if (start === first && end === last) return;
+            first = start;
+            last = end;
+            renderWindow(start, end, start * rowHeight, (rowCount - end) * rowHeight);
         }
+        viewport.addEventListener('scroll', () => {
+            if (!frame) frame = requestAnimationFrame(() => { frame = 0; update(); });
+        }, { passive: true });
+        return {
+            setRowCount(n) {
+                rowCount = n;
+                first = last = -1;
+                update();
+                const measured = measureRow ? measureRow() : 0;
+                if (measured > 0 && Math.abs(measured - rowHeight) > 0.5) {
+                    rowHeight = measured;
+                    first = last = -1;
+                    update();
+                }
+            },
+        };
+    }
+
+    function virtualBlocks(viewport, rowHeight, rowHtml) {
+        const content = document.createElement('div');
+        viewport.appendChild(content);
+        return virtualList(viewport, rowHeight, (start, end, top, bottom) => {
+            let html = '';
+            for (let i = start; i < end; i++) html += rowHtml(i);
+            content.style.paddingTop = `${top}px`;
+            content.style.paddingBottom = `${bottom}px`;
+            content.innerHTML = html;
+        });
+    }
+
+    function memberLabel(uid) {
+        const emp = hrByEmployee[uid];
+        return emp ? `${uid} (${emp['Employee First Name']} ${emp['Employee Last Name']})` : uid;
+    }
+
+    function memberTagHtml(uid) {
+        const label = escHtml(memberLabel(uid));
+        return `<span class="member-tag" title="${label}">${label}</span>`;
+    }
+
+    // Members as wrapped tags, or as a windowed grid of fixed-width cells
+    function fillMemberList(el, memberIds) {
+        if (memberIds.length <= VIRTUAL_MIN_ROWS) {
+            el.innerHTML = memberIds.map(memberTagHtml).join('');
+            return;
+        }
+        el.classList.add('virtual-list');
+        const viewport = document.createElement('div');
+        viewport.className = 'virtual-scroll';
+        el.appendChild(viewport);
+        let cols = 0;
+        const list = virtualBlocks(viewport, MEMBER_ROW_PX, row => {
+            let html = `<div class="member-row" style="--member-cols:${cols}">`;
+            const stop = Math.min(memberIds.length, (row + 1) * cols);
+            for (let i = row * cols; i < stop; i++) html += memberTagHtml(memberIds[i]);
+            return html + '</div>';
+        });
+        const layout = () => {
+            if (viewport.clientWidth === 0 && cols > 0) return;  // collapsed; keep the last layout
+            const c = Math.max(1, Math.floor(viewport.clientWidth / MEMBER_CELL_PX));
+            if (c === cols) return;
+            cols = c;
+            list.setRowCount(Math.ceil(memberIds.length / cols));
+        };
+        if (typeof ResizeObserver !== 'undefined') new ResizeObserver(layout).observe(viewport);
+        layout();
+    }
+
+    function entRowHtml(ent) {
+        const pct = Math.round(ent.commonality * 100);
+        const barW = pct * 0.6;
+        return `<tr>
+                <td>${escHtml(ent.applicationBU || '')}</td>
+                <td>${escHtml(ent.application)}</td>
+                <td>${escHtml(ent.entitlementName)}</td>
+                <td><code>${escHtml(ent.entitlementId)}</code></td>
+                <td><span class="commonality-bar" style="width:${barW}px"></span>${pct}% (${ent.userCount}/${ent.totalUsers})</td>
+            </tr>`;
+    }
+
+    function fillEntitlementTable(section, ents) {
+        const table = section.querySelector('.ent-table');
+        const tbody = table.tBodies[0];
+        if (ents.length <= VIRTUAL_MIN_ROWS) {
+            tbody.innerHTML = ents.map(entRowHtml).join('');
+            return;
+        }
+        const viewport = document.createElement('div');
+        viewport.className = 'virtual-scroll';
+        table.replaceWith(viewport);
+        viewport.appendChild(table);
+        virtualList(viewport, ENT_ROW_PX, (start, end, top, bottom) => {
+            let html = `<tr class="virtual-spacer" style="height:${top}px"></tr>`;
+            for (let i = start; i < end; i++) html += entRowHtml(ents[i]);
+            tbody.innerHTML = html + `<tr class="virtual-spacer" style="height:${bottom}px"></tr>`;
+        }, () => tbody.rows.length > 2 ? tbody.rows[1].getBoundingClientRect().height : 0).setRowCount(ents.length);
+    }
+
+    function outlierRowHtml(uid, ents) {
+        const emp = hrByEmployee[uid];
+        const uname = emp ? `${emp['Employee First Name']} ${emp['Employee Last Name']}` : uid;
+        const list = escHtml(ents.map(e => `${e.application} / ${e.entitlementName}`).join(', '));
+        return `<div class="outlier-item" title="${list}"><strong>${escHtml(uid)} (${escHtml(uname)})</strong>: ${list}</div>`;
+    }
+
+    function fillOutliers(section, userOutliers, outlierUsers) {
+        const el = section.querySelector('.outlier-list');
+        if (outlierUsers.length <= VIRTUAL_MIN_ROWS) {
+            el.innerHTML = outlierUsers.map(uid => outlierRowHtml(uid, userOutliers[uid])).join('');
+            return;
+        }
+        el.classList.add('virtual-scroll');
+        virtualBlocks(el, OUTLIER_ROW_PX, i => outlierRowHtml(outlierUsers[i], userOutliers[outlierUsers[i]]))
+            .setRowCount(outlierUsers.length);
     }
 
     // ─── Build a single role card ────────────────────────────────────
@@ -743,12 +977,25 @@
                 <span class="role-chevron">&#9660;</span>
             </div>
         `;
-        header.addEventListener('click', () => card.classList.toggle('expanded'));
 
-        // Body
+        // Body — built the first time the card is expanded
         const body = document.createElement('div');
         body.className = 'role-card-body';
+        let built = false;
+        header.addEventListener('click', () => {
+            card.classList.toggle('expanded');
+            if (!built && card.classList.contains('expanded')) {
+                built = true;
+                traceInteraction(`render.role: ${role.roleName}`, () => fillRoleBody(body, role));
+            }
+        });
+
+        card.appendChild(header);
+        card.appendChild(body);
+        return card;
+    }
 
+    function fillRoleBody(body, role) {
         // Criteria section
         let criteriaHtml = '<div class="role-section"><h4>Grouping Criteria</h4><div class="criteria-list">';
         for (const [label, value] of Object.entries(role.criteria)) {
@@ -770,165 +1017,271 @@
         }
         overspillHtml += '</div></div>';
 
-        // Shared entitlements table
-        let entHtml = '<div class="role-section"><h4>Recommended Role Entitlements</h4>';
-        entHtml += '<table class="ent-table"><thead><tr><th>App Business Unit</th><th>Application</th><th>Entitlement</th><th>Entitlement ID</th><th>Commonality</th></tr></thead><tbody>';
-        for (const ent of role.sharedEntitlements) {
-            const pct = Math.round(ent.commonality * 100);
-            const barW = pct * 0.6;
-            entHtml += `<tr>
-                <td>${escHtml(ent.applicationBU || '')}</td>
-                <td>${escHtml(ent.application)}</td>
-                <td>${escHtml(ent.entitlementName)}</td>
-                <td><code>${escHtml(ent.entitlementId)}</code></td>
-                <td><span class="commonality-bar" style="width:${barW}px"></span>${pct}% (${ent.userCount}/${ent.totalUsers})</td>
-            </tr>`;
-        }
-        entHtml += '</tbody></table></div>';
-
-        // Members section
-        let membersHtml = '<div class="role-section"><h4>Group Members</h4><div class="member-list">';
-        const memberIds = Array.from(role.memberIds);
-        for (const mid of memberIds) {
-            const emp = hrByEmployee[mid];
-            const label = emp ? `${mid} (${emp['Employee First Name']} ${emp['Employee Last Name']})` : mid;
-            membersHtml += `<span class="member-tag">${escHtml(label)}</span>`;
-        }
-        membersHtml += '</div></div>';
+        // Shared entitlements table, members and outliers: rows filled in below
+        const entHtml = '<div class="role-section ent-section"><h4>Recommended Role Entitlements</h4>' +
+            '<table class="ent-table"><thead><tr><th>App Business Unit</th><th>Application</th><th>Entitlement</th><th>Entitlement ID</th><th>Commonality</th></tr></thead><tbody></tbody></table></div>';
+        const membersHtml = '<div class="role-section"><h4>Group Members</h4><div class="member-list"></div></div>';
 
-        // Outliers section
         let outliersHtml = '';
-        const outlierUsers = Object.keys(role.userOutliers || {});
+        const { userOutliers } = roleOutliers(role);
+        const outlierUsers = Object.keys(userOutliers);
         if (outlierUsers.length > 0) {
             outliersHtml = '<div class="role-section outlier-section"><h4>Exception / Individual Entitlements</h4>';
             outliersHtml += '<p style="font-size:0.82rem;color:var(--text-secondary);margin-bottom:0.5rem;">These entitlements are unique to individual users and should be reviewed for individual access grants, not included in the role.</p>';
-            for (const uid of outlierUsers) {
-                const emp = hrByEmployee[uid];
-                const uname = emp ? `${emp['Employee First Name']} ${emp['Employee Last Name']}` : uid;
-                outliersHtml += `<div class="outlier-item"><strong>${escHtml(uid)} (${escHtml(uname)})</strong>: `;
-                outliersHtml += role.userOutliers[uid].map(e =>
-                    `${escHtml(e.application)} / ${escHtml(e.entitlementName)}`
-                ).join(', ');
-                outliersHtml += '</div>';
-            }
-            outliersHtml += '</div>';
+            outliersHtml += '<div class="outlier-list"></div></div>';
         }
 
         body.innerHTML = criteriaHtml + overspillHtml + entHtml + membersHtml + outliersHtml;
 
-        card.appendChild(header);
-        card.appendChild(body);
-        return card;
+        fillEntitlementTable(body.querySelector('.ent-section'), role.sharedEntitlements);
+        fillMemberList(body.querySelector('.member-list'), Array.from(role.memberIds));
+        if (outlierUsers.length > 0) fillOutliers(body.querySelector('.outlier-section'), userOutliers, outlierUsers);
     }
 
     // ═══════════════════════════════════════════════════════════════════
     //  EXPORT FUNCTIONS
     // ═══════════════════════════════════════════════════════════════════
 
-    function exportOptionCsv(optionIdx) {
+    // Exports are written row by row into Blob parts of about
+    // EXPORT_PART_CHARS characters, so no single string ever holds the whole
+    // file, and yield to the event loop every EXPORT_YIELD_ROLES roles.
+    const EXPORT_PART_CHARS = 1 << 20;
+    const EXPORT_YIELD_ROLES = 200;
+
+    function createBlobWriter() {
+        const parts = [];
+        let buffer = [];
+        let size = 0;
+        const flush = () => {
+            if (buffer.length === 0) return;
+            parts.push(new Blob(buffer));
+            buffer = [];
+            size = 0;
+        };
+        return {
+            write(str) {
+                buffer.push(str);
+                size += str.length;
+                if (size >= EXPORT_PART_CHARS) flush();
+            },
+            blob(mimeType) {
+                flush();
+                return new Blob(parts, { type: mimeType });
+            },
+        };
+    }
+
+    function csvLine(row) {
+        return row.map(cell => {
+            const s = String(cell);
+            return s.includes(',') || s.includes('"') || s.includes('\n')
+                ? '"' + s.replace(/"/g, '""') + '"'
+                : s;
+        }).join(',');
+    }
+
+    // Two files: one row per role × shared entitlement, and the role
+    // memberships (one row per role × member, ungrouped users included)
+    async function exportOptionCsv(optionIdx) {
         const sol = optimizedSolutions[optionIdx];
         if (!sol) return;
 
-        const csvRows = [
-            ['Option', 'Option Name', 'Role Name', 'Strategy', 'Criteria',
-             'Member Count', 'Org Total Match', 'Overspill', 'Precision %',
-             'Avg Commonality %',
-             'App Business Unit', 'Application', 'Application ID',
-             'Entitlement Name', 'Entitlement ID',
-             'Entitlement Commonality %', 'Members']
-        ];
+        const roles = createBlobWriter();
+        const members = createBlobWriter();
+        roles.write(csvLine([
+            'Option', 'Option Name', 'Role Name', 'Strategy', 'Criteria',
+            'Member Count', 'Org Total Match', 'Overspill', 'Precision %',
+            'Avg Commonality %',
+            'App Business Unit', 'Application', 'Application ID',
+            'Entitlement Name', 'Entitlement ID',
+            'Entitlement Commonality %'
+        ]));
+        members.write(csvLine(['Option', 'Role Name', 'Strategy', 'Employee ID', 'First Name', 'Last Name']));
+        const writeMembers = (roleName, strategy, ids) => {
+            for (const uid of ids) {
+                const emp = hrByEmployee[uid];
+                members.write('\n' + csvLine([
+                    sol.optionIndex, roleName, strategy, uid,
+                    emp ? emp['Employee First Name'] : '', emp ? emp['Employee Last Name'] : ''
+                ]));
+            }
+        };
 
-        for (const role of sol.roles) {
+        for (let r = 0; r < sol.roles.length; r++) {
+            if (r > 0 && r % EXPORT_YIELD_ROLES === 0) await sleep(0);
+            const role = sol.roles[r];
             const criteriaStr = Object.entries(role.criteria)
                 .map(([k, v]) => `${k}=${v}`).join('; ');
-            const membersStr = Array.from(role.memberIds).join('; ');
-
+            const roleCells = [
+                sol.optionIndex,
+                sol.optionName,
+                role.roleName,
+                role.strategyName,
+                criteriaStr,
+                role.memberCount,
+                role.orgTotal || role.memberCount,
+                role.overspill || 0,
+                Math.round((role.precision || 1) * 100),
+                Math.round(role.avgCommonality * 100)
+            ];
             for (const ent of role.sharedEntitlements) {
-                csvRows.push([
-                    sol.optionIndex,
-                    sol.optionName,
-                    role.roleName,
-                    role.strategyName,
-                    criteriaStr,
-                    role.memberCount,
-                    role.orgTotal || role.memberCount,
-                    role.overspill || 0,
-                    Math.round((role.precision || 1) * 100),
-                    Math.round(role.avgCommonality * 100),
+                roles.write('\n' + csvLine(roleCells.concat([
                     ent.applicationBU || '',
                     ent.application,
                     ent.applicationId || '',
                     ent.entitlementName,
                     ent.entitlementId,
-                    Math.round(ent.commonality * 100),
-                    membersStr
-                ]);
+                    Math.round(ent.commonality * 100)
+                ])));
             }
+            writeMembers(role.roleName, role.strategyName, role.memberIds);
         }
 
         // Ungrouped users row
         if (sol.ungroupedUsers.length > 0) {
-            csvRows.push([
+            roles.write('\n' + csvLine([
                 sol.optionIndex, sol.optionName,
                 'UNGROUPED', 'N/A', 'N/A',
                 sol.ungroupedUsers.length, 'N/A', 'N/A', 'N/A',
                 'N/A',
-                'N/A', 'N/A', 'N/A', 'N/A', 'N/A', 'N/A',
-                sol.ungroupedUsers.join('; ')
-            ]);
+                'N/A', 'N/A', 'N/A', 'N/A', 'N/A', 'N/A'
+            ]));
+            writeMembers('UNGROUPED', 'N/A', sol.ungroupedUsers);
         }
 
-        const csv = csvRows.map(row => row.map(cell => {
-            const s = String(cell);
-            return s.includes(',') || s.includes('"') || s.includes('\n')
-                ? '"' + s.replace(/"/g, '""') + '"'
-                : s;
-        }).join(',')).join('\n');
+        const baseName = RoleEngine.exportBaseName(sol);
+        downloadFile(roles.blob('text/csv'), `${baseName}.csv`, 'text/csv');
+        downloadFile(members.blob('text/csv'), `${baseName}_members.csv`, 'text/csv');
+    }
 
-        const safeName = sol.optionName.replace(/[^a-zA-Z0-9]/g, '_');
-        downloadFile(csv, `rbac_option${sol.optionIndex}_${safeName}.csv`, 'text/csv');
+    // Same document as JSON.stringify(exportData, null, 2), written a role at a time
+    async function exportOptionJson(optionIdx) {
+        const sol = optimizedSolutions[optionIdx];
+        if (!sol) return;
+        const out = createBlobWriter();
+        await writeParts(out, RoleEngine.optionJsonParts(sol, solutionsPhase1));
+        downloadFile(out.blob('application/json'), `${RoleEngine.exportBaseName(sol)}.json`, 'application/json');
     }
 
-    function exportOptionJson(optionIdx) {
+    // JSON Lines for provisioning tools (see RoleEngine.optionJsonlParts)
+    async function exportOptionJsonl(optionIdx) {
         const sol = optimizedSolutions[optionIdx];
         if (!sol) return;
+        const out = createBlobWriter();
+        await writeParts(out, RoleEngine.optionJsonlParts(sol, solutionsPhase1));
+        downloadFile(out.blob('application/x-ndjson'), `${RoleEngine.exportBaseName(sol)}.jsonl`, 'application/x-ndjson');
+    }
 
-        const exportData = {
-            option: sol.optionIndex,
-            name: sol.optionName,
-            description: sol.optionDescription,
-            summary: {
-                totalRoles: sol.totalRoles,
-                totalUsersCovered: sol.totalUsersCovered,
-                totalUsers: sol.totalUsers,
-                coveragePercent: Math.round(sol.coveragePercent * 100),
-                avgCommonality: Math.round(sol.avgCommonality * 100),
-                avgPrecision: Math.round((sol.avgPrecision || 0) * 100),
-                totalOverspill: sol.totalOverspill || 0,
-                strategiesUsed: sol.strategiesUsed
-            },
-            roles: sol.roles.map(role => ({
-                roleName: role.roleName,
-                strategy: role.strategyName,
-                criteria: role.criteria,
-                memberCount: role.memberCount,
-                orgTotalMatch: role.orgTotal || role.memberCount,
-                overspill: role.overspill || 0,
-                precision: Math.round((role.precision || 1) * 100),
-                members: Array.from(role.memberIds),
-                avgCommonality: Math.round(role.avgCommonality * 100),
-                sharedEntitlements: role.sharedEntitlements,
-                outlierEntitlements: role.outlierEntitlements,
-                userOutliers: role.userOutliers
-            })),
-            ungroupedUsers: sol.ungroupedUsers
-        };
+    // One part per role: yield to the UI every EXPORT_YIELD_ROLES of them
+    async function writeParts(out, parts) {
+        let n = 0;
+        for (const part of parts) {
+            if (++n % EXPORT_YIELD_ROLES === 0) await sleep(0);
+            out.write(part);
+        }
+    }
+
+    // ═══════════════════════════════════════════════════════════════════
+    //  DIAGNOSTICS
+    // ═══════════════════════════════════════════════════════════════════
+
+    // Every trace of a run and the thread it ran on: tid 0 is the main
+    // thread, tid n + 1 engine worker n
+    function diagnosticsTraces(run) {
+        const rows = [{ thread: 'main', tid: 0, name: run.main.label, trace: run.main }];
+        for (const task of run.tasks) {
+            rows.push({
+                thread: task.worker < 0 ? 'main' : `worker ${task.worker + 1}`,
+                tid: task.worker + 1,
+                name: task.type === 'variant' ? `variant ${task.variantIndex + 1}` : task.type,
+                trace: task.trace
+            });
+        }
+        for (const trace of run.interactions) rows.push({ thread: 'main', tid: 0, name: trace.label, trace });
+        return rows;
+    }
 
-        const json = JSON.stringify(exportData, null, 2);
-        const safeName = sol.optionName.replace(/[^a-zA-Z0-9]/g, '_');
-        downloadFile(json, `rbac_option${sol.optionIndex}_${safeName}.json`, 'application/json');
+    function renderDiagnostics() {
+        const run = diagnostics;
+        diagnosticsPanel.hidden = !run;
+        if (!run) return;
+
+        const origin = run.main.start;
+        const ms = t => t.toFixed(1);
+        const mb = bytes => bytes === null || bytes === undefined ? '\u2014' : (bytes / 1048576).toFixed(1);
+        let spanRows = '';
+        let counterRows = '';
+        for (const { thread, name, trace } of diagnosticsTraces(run)) {
+            spanRows += `<tr class="diagnostics-trace"><td>${escHtml(thread)}</td><td>${escHtml(name)}</td>` +
+                `<td>${ms(trace.start - origin)}</td><td>${ms(trace.end - trace.start)}</td><td>${mb(trace.heapUsed)}</td></tr>`;
+            for (const span of trace.spans) {
+                spanRows += `<tr><td>${escHtml(thread)}</td><td class="diagnostics-span">${escHtml(span.name)}</td>` +
+                    `<td>${ms(span.start - origin)}</td><td>${ms(span.duration)}</td><td>${mb(span.heapUsed)}</td></tr>`;
+            }
+            for (const [counter, value] of Object.entries(trace.counters)) {
+                counterRows += `<tr><td>${escHtml(thread)}</td><td>${escHtml(name)}</td><td>${escHtml(counter)}</td>` +
+                    `<td>${value.toLocaleString()}</td></tr>`;
+            }
+            for (const [series, values] of Object.entries(trace.series)) {
+                const total = values.reduce((s, v) => s + v, 0);
+                const max = values.reduce((m, v) => Math.max(m, v), 0);
+                counterRows += `<tr><td>${escHtml(thread)}</td><td>${escHtml(name)}</td><td>${escHtml(series)}</td>` +
+                    `<td>${values.length.toLocaleString()} samples, total ${total.toLocaleString()}, max ${max.toLocaleString()}</td></tr>`;
+            }
+        }
+
+        $('diagnostics-summary').textContent =
+            `${run.main.label} took ${ms(run.main.end - run.main.start)} ms \u2022 ${run.tasks.length} engine tasks`;
+        $('diagnostics-spans').querySelector('tbody').innerHTML = spanRows;
+        $('diagnostics-counters').querySelector('tbody').innerHTML =
+            counterRows || '<tr><td colspan="4">No counters recorded</td></tr>';
+    }
+
+    // Trace Event Format (chrome://tracing, Perfetto): one complete event
+    // per trace and span, in microseconds from the start of the run.
+    // Counters and series ride in the args of their trace's event.
+    function exportDiagnosticsTrace() {
+        const run = diagnostics;
+        if (!run) return;
+
+        const origin = run.main.start;
+        const us = t => Math.round((t - origin) * 1000);
+        const traceEvents = [{ name: 'process_name', ph: 'M', pid: 1, tid: 0, args: { name: 'RBAC Role Mining Tool' } }];
+        const namedThreads = new Set();
+        for (const { thread, tid, name, trace } of diagnosticsTraces(run)) {
+            if (!namedThreads.has(tid)) {
+                namedThreads.add(tid);
+                traceEvents.push({ name: 'thread_name', ph: 'M', pid: 1, tid, args: { name: thread } });
+            }
+            traceEvents.push({
+                name, cat: 'trace', ph: 'X', pid: 1, tid,
+                ts: us(trace.start), dur: us(trace.end) - us(trace.start),
+                args: { heapUsed: trace.heapUsed, counters: trace.counters, series: trace.series }
+            });
+            for (const { name: spanName, start, duration, ...args } of trace.spans) {
+                traceEvents.push({
+                    name: spanName, cat: 'engine', ph: 'X', pid: 1, tid,
+                    ts: us(start), dur: Math.round(duration * 1000), args
+                });
+            }
+        }
+
+        const startedAt = new Date(origin).toISOString();
+        const doc = {
+            traceEvents,
+            displayTimeUnit: 'ms',
+            otherData: {
+                startedAt,
+                ...run.config,
+                workers: getWorkerPool().length,
+                userAgent: typeof navigator !== 'undefined' ? navigator.userAgent : ''
+            }
+        };
+        downloadFile(JSON.stringify(doc), `rbac_trace_${startedAt.replace(/[:.]/g, '-')}.json`, 'application/json');
     }
 
+    $('diagnostics-export-btn').addEventListener('click', exportDiagnosticsTrace);
+
     // ─── Boot ────────────────────────────────────────────────────────
     init();
 })();
@@ -0,0 +1,241 @@
+"""
+Benchmark the role-mining engine (engine.js, run headless by engine-cli.js)
+at several target list sizes on synthetic data, and gate changes against a
+JSON baseline.
+
+Data: an HR master of --org-size employees (regenerate_hr_data, numpy
+backend), its entitlement extract (generate_entitlements) and one user list
+per --sizes entry, sampled from the master. Everything is seeded, and kept
+in --data-dir when given, so later runs reuse it.
+
+Cases: engine/<target users>/<phase> for every phase engine-cli.js reports
+(load.hr, load.entitlements, load.users, orgIndex, phase1, variant.1 to
+variant.5, export). Each run is a fresh node process; per phase the fastest
+of --repeat runs is kept, and the lowest peak RSS. Peak RSS is the process
+high-water mark at the end of the phase, so it never drops from one phase
+to the next.
+
+--save-baseline writes the results; --baseline compares against a saved run
+and exits 1 when a phase slows down by more than --tolerance or grows its
+peak RSS by more than --memory-tolerance. Baselines are machine specific:
+save and compare on the same host.
+
+Usage: python bench_engine.py [--sizes N ...] [--org-size N] [--cases SUBSTR ...] [--repeat R]
+                              [--data-dir DIR] [--baseline PATH] [--save-baseline PATH] [--out PATH]
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import generate_entitlements as ents
+import regenerate_hr_data as hr
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "engine-cli.js")
+# Phases engine-cli.js reports, in run order
+PHASES = (["load.hr", "load.entitlements", "load.users", "orgIndex", "phase1"]
+          + [f"variant.{v}" for v in range(1, 6)] + ["export"])
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_ORG_SIZE = 100_000
+DEFAULT_TOLERANCE = 0.20
+DEFAULT_MEMORY_TOLERANCE = 0.20
+# Slowdowns below this are timer and scheduler noise, not a regression
+TIME_SLACK_SECONDS = 0.05
+# RSS growth below this is noise (heap sizing, lazily mapped pages), not a regression
+MEMORY_SLACK_BYTES = 16 << 20
+
+
+# ─── Data ───
+
+def _write_atomic(path, write):
+    """write(tmp_path), then move into place, so an interrupted run leaves no partial file to reuse."""
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def prepare_data(data_dir, org_size, sizes, seed=hr.DEFAULT_SEED):
+    """Generate (or reuse) the HR master, entitlements and user lists; returns (hr, ents, {size: users})."""
+    stem = os.path.join(data_dir, f"org{org_size}_seed{seed}")
+    hr_path = stem + "_hr.csv"
+    ent_path = stem + "_entitlements.csv"
+    if not os.path.exists(hr_path):
+        print(f"Generating {org_size:,} employees...", file=sys.stderr)
+        _write_atomic(hr_path, lambda p: hr.generate_serial(org_size, p, seed, "numpy"))
+    if not os.path.exists(ent_path):
+        print("Synthesizing entitlements...", file=sys.stderr)
+        _write_atomic(ent_path, lambda p: ents.write_entitlements(hr_path, p, seed))
+
+    ids = None
+    users = {}
+    for n in sizes:
+        users[n] = f"{stem}_users{n}.csv"
+        if os.path.exists(users[n]):
+            continue
+        if ids is None:
+            with open(hr_path, newline='', encoding='utf-8') as f:
+                ids = [row["Employee ID"] for row in csv.DictReader(f)]
+        sample = random.Random(seed).sample(ids, n)
+        _write_atomic(users[n], lambda p: _write_user_list(p, sample))
+    return hr_path, ent_path, users
+
+
+def _write_user_list(path, ids):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write("Employee ID\n" + "".join(i + "\n" for i in ids))
+
+
+# ─── Measurement ───
+
+def run_engine(node, hr_path, ent_path, users_path, engine_args, tmpdir):
+    """One engine-cli.js run; returns its --report document."""
+    report_path = os.path.join(tmpdir, "report.json")
+    cmd = [node, CLI_PATH, "--hr", hr_path, "--entitlements", ent_path, "--users", users_path,
+           "--out-dir", os.path.join(tmpdir, "out"), "--report", report_path] + engine_args
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"engine-cli.js failed ({proc.returncode}):\n{proc.stderr}")
+    with open(report_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def measure(node, hr_path, ent_path, users_path, engine_args, repeat=1):
+    """{phase: result} over repeat runs: best wall time, lowest peak RSS."""
+    results = {}
+    tmpdir = tempfile.mkdtemp(prefix="engine_bench_")
+    try:
+        for _ in range(repeat):
+            report = run_engine(node, hr_path, ent_path, users_path, engine_args, tmpdir)
+            roles = {f"variant.{o['option']}": o["roles"] for o in report["options"]}
+            for p in report["phases"]:
+                r = results.setdefault(p["name"], {"users": report["config"]["users"]})
+                r["seconds"] = round(min(r.get("seconds", p["seconds"]), p["seconds"]), 4)
+                r["peak_rss_bytes"] = min(r.get("peak_rss_bytes", p["peakRssBytes"]), p["peakRssBytes"])
+                r["heap_used_bytes"] = p["heapUsedBytes"]
+                if p["name"] in roles:
+                    r["roles"] = roles[p["name"]]
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, org_size=DEFAULT_ORG_SIZE, repeat=1, only=None, data_dir=None,
+                   node="node", engine_args=()):
+    keep_data = data_dir is not None
+    if keep_data:
+        os.makedirs(data_dir, exist_ok=True)
+    else:
+        data_dir = tempfile.mkdtemp(prefix="engine_bench_data_")
+    try:
+        hr_path, ent_path, users = prepare_data(data_dir, org_size, sizes)
+        version = subprocess.run([node, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+        results = {}
+        for n in sizes:
+            # One run covers every phase of a size: skip sizes with no selected case
+            selected = [p for p in PHASES if not only or any(s in f"engine/{n}/{p}" for s in only)]
+            if not selected:
+                continue
+            measured = measure(node, hr_path, ent_path, users[n], list(engine_args), repeat)
+            for phase in selected:
+                name = f"engine/{n}/{phase}"
+                r = results[name] = measured[phase]
+                print(f"{name:35s} {r['seconds']:>10.3f} s  {r['peak_rss_bytes'] / 2**20:>9.1f} MiB peak RSS"
+                      + (f"  {r['roles']:>6} roles" if "roles" in r else ""), file=sys.stderr)
+    finally:
+        if not keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        "node": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "org_size": org_size,
+        "engine_args": list(engine_args),
+        "cases": results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE, memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    """Return a list of regression messages for cases present in both runs."""
+    regressions = []
+    if report.get("org_size") != baseline.get("org_size") or report.get("engine_args") != baseline.get("engine_args"):
+        print("note: org size or engine options differ from the baseline", file=sys.stderr)
+    for name, r in report["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        if r["seconds"] > base["seconds"] * (1 + tolerance) + TIME_SLACK_SECONDS:
+            regressions.append(f"{name}: {r['seconds']:.3f} s vs baseline {base['seconds']:.3f} s "
+                               f"(+{r['seconds'] / max(base['seconds'], 1e-9) - 1:.0%})")
+        limit = base["peak_rss_bytes"] * (1 + memory_tolerance) + MEMORY_SLACK_BYTES
+        if r["peak_rss_bytes"] > limit:
+            regressions.append(f"{name}: peak RSS {r['peak_rss_bytes']:,} B "
+                               f"vs baseline {base['peak_rss_bytes']:,} B")
+        if "roles" in base and r.get("roles") != base["roles"]:
+            print(f"note: {name}: role count changed ({base['roles']} → {r.get('roles')})", file=sys.stderr)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the role-mining engine against a JSON baseline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"target user list sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--org-size", type=int, default=DEFAULT_ORG_SIZE,
+                        help=f"employees in the synthetic HR master (default: {DEFAULT_ORG_SIZE})")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="only report cases whose name contains one of these substrings (e.g. engine/1000/ phase1)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size, best kept (default: 1)")
+    parser.add_argument("--data-dir", default=None,
+                        help="keep the synthetic data here and reuse it on later runs (default: a temporary directory)")
+    parser.add_argument("--node", default="node", help="Node.js executable (default: node)")
+    parser.add_argument("--threshold", type=int, default=80, help="commonality threshold in percent (default: 80)")
+    parser.add_argument("--min-group", type=int, default=2, help="minimum group size (default: 2)")
+    parser.add_argument("--candidate-mode", default="standard", help="standard or lattice-<k> (default: standard)")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to gate against")
+    parser.add_argument("--save-baseline", default=None, help="write this run's results as a baseline JSON")
+    parser.add_argument("--out", default=None, help="write this run's results as JSON (default: stdout)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed fractional slowdown per phase (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help=f"allowed fractional peak RSS growth per phase (default: {DEFAULT_MEMORY_TOLERANCE})")
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 2 or max(args.sizes) > args.org_size:
+        parser.error("--sizes must be at least 2 and at most --org-size")
+    if shutil.which(args.node) is None:
+        parser.error(f"Node.js executable not found: {args.node}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine_args = ["--threshold", str(args.threshold), "--min-group", str(args.min_group),
+                   "--candidate-mode", args.candidate_mode]
+    report = run_benchmarks(args.sizes, args.org_size, args.repeat, args.cases, args.data_dir, args.node, engine_args)
+    text = json.dumps(report, indent=2)
+    for path in (args.out, args.save_baseline):
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+    if args.out is None and args.save_baseline is None:
+        print(text)
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.memory_tolerance)
+        for msg in regressions:
+            print(f"REGRESSION {msg}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Benchmark the HR data generator and gate changes against a JSON baseline.
+
+Cases:
+- generate: every regenerate_hr_data mode (backend × output format × serial
+  or process pool) at each --sizes row count; records rows/sec, peak
+  traced memory and output bytes
+- micro: flatten_org_paths over the whole org, generate_deeper_snodes at full
+  depth and generate_employees (in-memory list) at each size up to 100k
+
+Throughput and memory are measured in separate runs, so tracemalloc overhead
+never shows up in rows/sec. Throughput is taken from the median of --repeat
+timed runs, so one slow run never fails the gate, and each run is paired with
+a fixed calibration loop whose median is saved alongside it: the gate rescales
+the baseline by the ratio of calibration times, so a host that is slower
+across the board (frequency scaling, noisy neighbours) does not read as a
+regression. tracemalloc only sees the parent process: for pooled cases it
+covers the coordinator, not the workers.
+
+--save-baseline writes the results; --baseline compares against a saved run
+and exits 1 when a case loses more than --tolerance of its throughput (and
+more than TIME_SLACK_SECONDS of wall time, both after calibration) or grows
+its peak memory by more than --memory-tolerance, and still does so when
+re-measured --rechecks times. Baselines are machine specific: save and
+compare on the same host.
+
+Usage: python bench_hr_data.py [--sizes N ...] [--cases SUBSTR ...] [--workers W] [--repeat R]
+                               [--rechecks K] [--baseline PATH] [--save-baseline PATH] [--out PATH]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import regenerate_hr_data as hr
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.20
+DEFAULT_MEMORY_TOLERANCE = 0.20
+DEFAULT_RECHECKS = 1
+# Slowdowns below this are timer and scheduler noise, not a regression
+TIME_SLACK_SECONDS = 0.05
+# Iterations of the calibration loop timed before every run (~25 ms)
+CALIBRATION_LOOPS = 50_000
+# Peak-memory growth below this is noise (interned strings, caches), not a regression
+MEMORY_SLACK_BYTES = 1 << 20
+# generate_employees holds every row in memory; don't benchmark it past this
+MAX_LIST_ROWS = 100_000
+
+
+# ─── Cases ───
+
+def generation_cases(sizes, workers):
+    """(name, rows, run(tmpdir) -> output bytes) for every generator mode at every size."""
+    cases = []
+    pools = [1] + ([workers] if workers > 1 else [])
+    for backend in hr.BACKENDS:
+        for fmt in hr.FORMATS:
+            for w in pools:
+                for n in sizes:
+                    cases.append((f"generate/{backend}/{fmt}/w{w}/{n}", n, _generate_runner(n, backend, fmt, w)))
+    return cases
+
+
+def _generate_runner(n, backend, fmt, workers):
+    def run(tmpdir):
+        out_path = os.path.join(tmpdir, f"hr.{fmt}")
+        if fmt == "hrcol":
+            hr.generate_hrcol(n, out_path, hr.DEFAULT_SEED, workers, backend)
+        elif workers > 1:
+            hr.generate_parallel(n, out_path, hr.DEFAULT_SEED, workers, backend)
+        else:
+            hr.generate_serial(n, out_path, hr.DEFAULT_SEED, backend)
+        return os.path.getsize(out_path)
+    return run
+
+
+def micro_cases(sizes):
+    """(name, operations, run(tmpdir) -> None) for the generator's building blocks."""
+    def flatten(tmpdir):
+        for bl_name, bl_data in hr.ORG_STRUCTURE.items():
+            hr.flatten_org_paths(bl_name, bl_data["divisions"])
+
+    def deeper(tmpdir):
+        for i in range(10_000):
+            hr.generate_deeper_snodes(hr.CounterRandom(hr.DEFAULT_SEED, i), 15)
+
+    def employee_list(n):
+        def run(tmpdir):
+            hr.generate_employees(n)
+        return run
+
+    paths = sum(len(hr.flatten_org_paths(b, d["divisions"])) for b, d in hr.ORG_STRUCTURE.items())
+    cases = [("micro/flatten_org_paths", paths, flatten),
+             ("micro/generate_deeper_snodes", 10_000, deeper)]
+    for n in sizes:
+        if n <= MAX_LIST_ROWS:
+            cases.append((f"micro/generate_employees/{n}", n, employee_list(n)))
+    return cases
+
+
+# ─── Measurement ───
+
+def calibrate():
+    """Wall time of a fixed pure-Python loop: how fast this host is running right now."""
+    t0 = time.perf_counter()
+    slots = {}
+    for i in range(CALIBRATION_LOOPS):
+        slots[i & 1023] = f"{i}|{i * 7}"
+    return time.perf_counter() - t0
+
+
+def measure(rows, run, repeat=DEFAULT_REPEAT):
+    """Median and best wall time over repeat runs (each after a calibration loop), then one traced run for peak memory."""
+    result = {"rows": rows}
+    tmpdir = tempfile.mkdtemp(prefix="hr_bench_")
+    try:
+        times, calibrations = [], []
+        for _ in range(repeat):
+            calibrations.append(calibrate())
+            t0 = time.perf_counter()
+            output = run(tmpdir)
+            times.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            run(tmpdir)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    median = statistics.median(times)
+    result.update(seconds=round(median, 4), best_seconds=round(min(times), 4),
+                  rows_per_sec=round(rows / max(median, 1e-9), 1), peak_memory_bytes=peak,
+                  calibration_seconds=round(statistics.median(calibrations), 6))
+    if output is not None:
+        result["output_bytes"] = output
+    return result
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, workers=1, repeat=DEFAULT_REPEAT, only=None, names=None):
+    cases = generation_cases(sizes, workers) + micro_cases(sizes)
+    if only:
+        cases = [c for c in cases if any(s in c[0] for s in only)]
+    if names is not None:
+        cases = [c for c in cases if c[0] in names]
+    # Warm the lookup tables and caches every mode shares, so no case pays for them
+    measure(1, _generate_runner(1, "numpy", "hrcol", 1), 1)
+    measure(1, _generate_runner(1, "python", "csv", 1), 1)
+    results = {}
+    for name, rows, run in cases:
+        results[name] = measure(rows, run, repeat)
+        r = results[name]
+        print(f"{name:45s} {r['rows_per_sec']:>14,.0f} ops/s  {r['peak_memory_bytes'] / 2**20:>8.1f} MiB peak"
+              + (f"  {r['output_bytes']:>14,} B" if "output_bytes" in r else ""), file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": workers,
+        "cases": results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE, memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    """Return (case name, message) for each regression in cases present in both runs."""
+    regressions = []
+    for name, r in report["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        # >1 when the host ran slower for this run than for the baseline's
+        speed = 1.0
+        if "calibration_seconds" in base and "calibration_seconds" in r:
+            speed = r["calibration_seconds"] / base["calibration_seconds"]
+        expected_seconds = base["seconds"] * speed
+        expected_rate = base["rows_per_sec"] / speed
+        if (r["rows_per_sec"] < expected_rate * (1 - tolerance)
+                and r["seconds"] > expected_seconds + TIME_SLACK_SECONDS):
+            regressions.append((name, f"throughput {r['rows_per_sec']:,.0f} ops/s "
+                                      f"vs calibrated baseline {expected_rate:,.0f} (-{1 - r['rows_per_sec'] / expected_rate:.0%})"))
+        limit = base["peak_memory_bytes"] * (1 + memory_tolerance) + MEMORY_SLACK_BYTES
+        if r["peak_memory_bytes"] > limit:
+            regressions.append((name, f"peak memory {r['peak_memory_bytes']:,} B "
+                                      f"vs baseline {base['peak_memory_bytes']:,} B"))
+        if "output_bytes" in base and r.get("output_bytes") != base["output_bytes"]:
+            print(f"note: {name}: output size changed ({base['output_bytes']:,} → {r.get('output_bytes'):,} B)",
+                  file=sys.stderr)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the HR data generator against a JSON baseline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"row counts for generation cases (default: {DEFAULT_SIZES})")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="only run cases whose name contains one of these substrings (e.g. numpy micro/)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for the pooled cases; 1 skips them (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"timed runs per case, median compared (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to gate against")
+    parser.add_argument("--save-baseline", default=None, help="write this run's results as a baseline JSON")
+    parser.add_argument("--out", default=None, help="write this run's results as JSON (default: stdout)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed fractional throughput loss (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help=f"allowed fractional peak memory growth (default: {DEFAULT_MEMORY_TOLERANCE})")
+    parser.add_argument("--rechecks", type=int, default=DEFAULT_RECHECKS,
+                        help=f"times a flagged case is re-measured before it fails the gate (default: {DEFAULT_RECHECKS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmarks(args.sizes, args.workers, args.repeat, args.cases)
+    text = json.dumps(report, indent=2)
+    for path in (args.out, args.save_baseline):
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+    if args.out is None and args.save_baseline is None:
+        print(text)
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.memory_tolerance)
+        # Host speed drifts by tens of percent over minutes; a real regression
+        # shows up again when the flagged cases are re-measured, drift rarely does
+        for _ in range(args.rechecks):
+            if not regressions:
+                break
+            names = {name for name, _ in regressions}
+            print(f"rechecking {len(names)} flagged case(s)", file=sys.stderr)
+            recheck = run_benchmarks(args.sizes, args.workers, args.repeat, names=names)
+            regressions = compare(recheck, baseline, args.tolerance, args.memory_tolerance)
+        for name, msg in regressions:
+            print(f"REGRESSION {name}: {msg}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env node
+/* ===================================================================
+   RBAC Role Mining Tool — Headless CLI
+   Runs the engine.js pipeline on CSV files, without a browser:
+     HR master + entitlement extract + user list → one JSON file per
+     option, the same documents the app's "Export JSON" downloads.
+   --report writes per-phase wall time and memory plus the engine trace
+   (spans and counters), which bench_engine.py gates against baselines.
+   =================================================================== */
+
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const { parseArgs } = require('util');
+const { performance } = require('perf_hooks');
+const RoleEngine = require('./engine.js');
+
+const DATA_DIR = path.join(__dirname, 'data');
+const DEFAULTS = {
+    hr: path.join(DATA_DIR, 'commercial_bank_hr_data.csv'),
+    entitlements: path.join(DATA_DIR, 'entitlements.csv'),
+    threshold: '80',
+    'min-group': '2',
+    'candidate-mode': 'standard',
+    'solver-budget': '0',
+    'out-dir': '.'
+};
+const CSV_CHUNK_BYTES = 8 * 1024 * 1024;
+
+const USAGE = `Usage: node engine-cli.js --users PATH [--hr PATH] [--entitlements PATH]
+                          [--threshold PCT] [--min-group N] [--candidate-mode MODE]
+                          [--solver-budget MS] [--out-dir DIR] [--report PATH]
+
+  --users           user list CSV with an Employee ID column (required)
+  --hr              HR master CSV (default: data/commercial_bank_hr_data.csv)
+  --entitlements    entitlement extract CSV (default: data/entitlements.csv)
+  --threshold       commonality threshold in percent, 50-100 (default: ${DEFAULTS.threshold})
+  --min-group       minimum group size (default: ${DEFAULTS['min-group']})
+  --candidate-mode  standard or lattice-<k> (default: ${DEFAULTS['candidate-mode']})
+  --solver-budget   milliseconds per option to improve the greedy cover (default: ${DEFAULTS['solver-budget']})
+  --out-dir         directory for the option JSON files (default: ${DEFAULTS['out-dir']})
+  --report          write per-phase timings, memory and the engine trace to this JSON file`;
+
+// ─── CSV Reading ─────────────────────────────────────────────────
+// Streams the file and calls onRow with one object per record, keyed by
+// the header (as Papa Parse does with header: true, skipEmptyLines: true).
+// Quoted fields may hold commas, doubled quotes and line breaks.
+function parseCsvRecord(line) {
+    if (!line.includes('"')) return line.split(',');
+    const fields = [];
+    let field = '';
+    let quoted = false;
+    for (let i = 0; i < line.length; i++) {
+        const c = line[i];
+        if (quoted) {
+            if (c !== '"') {
+                field += c;
+            } else if (line[i + 1] === '"') {
+                field += '"';
+                i++;
+            } else {
+                quoted = false;
+            }
+        } else if (c === '"') {
+            quoted = true;
+        } else if (c === ',') {
+            fields.push(field);
+            field = '';
+        } else {
+            field += c;
+        }
+    }
+    fields.push(field);
+    return fields;
+}
+
+// An odd number of quotes means a quoted field runs on to the next line
+function hasOpenQuote(line) {
+    let quotes = 0;
+    for (let i = line.indexOf('"'); i >= 0; i = line.indexOf('"', i + 1)) quotes++;
+    return quotes % 2 === 1;
+}
+
+async function readCsv(file, onRow) {
+    let header = null;
+    let partial = '';  // text after the last line break of the chunk so far
+    let record = null;  // lines of a record with an open quoted field
+
+    const onLine = line => {
+        if (line.endsWith('\r')) line = line.slice(0, -1);
+        if (record !== null) line = record + '\n' + line;
+        if (line.includes('"') && hasOpenQuote(line)) {
+            record = line;
+            return;
+        }
+        record = null;
+        if (line === '') return;
+        const fields = parseCsvRecord(line);
+        if (header === null) {
+            header = fields;
+            if (header[0].charCodeAt(0) === 0xFEFF) header[0] = header[0].slice(1);
+            return;
+        }
+        const row = {};
+        for (let i = 0; i < header.length; i++) row[header[i]] = fields[i];
+        onRow(row);
+    };
+
+    for await (const chunk of fs.createReadStream(file, { encoding: 'utf8', highWaterMark: CSV_CHUNK_BYTES })) {
+        const lines = (partial + chunk).split('\n');
+        partial = lines.pop();
+        for (const line of lines) onLine(line);
+    }
+    if (partial !== '' || record !== null) onLine(partial);
+    return header || [];
+}
+
+// ─── Inputs ──────────────────────────────────────────────────────
+async function loadOrgColumns(file) {
+    const builder = RoleEngine.createOrgColumnsBuilder();
+    await readCsv(file, row => builder.add(row));
+    return builder.finish();
+}
+
+async function loadEntitlements(file) {
+    const builder = RoleEngine.createEntitlementIndexBuilder();
+    await readCsv(file, row => builder.add(row));
+    return builder.finish();
+}
+
+// The "Employee ID" column under any spacing, case or separator, and
+// only IDs found in the HR master, as the app's upload does
+async function loadUserIds(file, org) {
+    const rows = [];
+    const header = await readCsv(file, row => rows.push(row));
+    const idCol = header.find(k => k.trim().toLowerCase().replace(/[\s_-]/g, '') === 'employeeid');
+    if (idCol === undefined) throw new Error(`${file}: CSV must contain an "Employee ID" column`);
+    const ids = rows.map(r => (r[idCol] || '').trim()).filter(Boolean);
+    const valid = ids.filter(id => org.rowIndex.has(id));
+    if (valid.length < ids.length) {
+        console.warn(`${ids.length - valid.length} IDs not found in HR data were dropped`);
+    }
+    if (valid.length < 2) throw new Error('Need at least 2 valid employee IDs found in HR data');
+    return valid;
+}
+
+// ─── Output ──────────────────────────────────────────────────────
+async function writeParts(file, parts) {
+    const out = fs.createWriteStream(file, { encoding: 'utf8' });
+    const done = new Promise((resolve, reject) => {
+        out.on('finish', resolve);
+        out.on('error', reject);
+    });
+    for (const part of parts) {
+        if (!out.write(part)) await new Promise(resolve => out.once('drain', resolve));
+    }
+    out.end();
+    await done;
+}
+
+// ─── Pipeline ────────────────────────────────────────────────────
+// Peak resident set size in bytes. ru_maxrss survives fork and exec, so a
+// child of a large process would start at its parent's peak: on Linux,
+// read this process image's own high-water mark instead.
+function peakRss() {
+    try {
+        const match = /^VmHWM:\s+(\d+) kB$/m.exec(fs.readFileSync('/proc/self/status', 'utf8'));
+        if (match) return Number(match[1]) * 1024;
+    } catch (e) {
+        // not Linux
+    }
+    return process.resourceUsage().maxRSS * 1024;
+}
+
+function parseCliArgs(argv) {
+    const { values } = parseArgs({
+        args: argv,
+        options: {
+            users: { type: 'string' },
+            hr: { type: 'string', default: DEFAULTS.hr },
+            entitlements: { type: 'string', default: DEFAULTS.entitlements },
+            threshold: { type: 'string', default: DEFAULTS.threshold },
+            'min-group': { type: 'string', default: DEFAULTS['min-group'] },
+            'candidate-mode': { type: 'string', default: DEFAULTS['candidate-mode'] },
+            'solver-budget': { type: 'string', default: DEFAULTS['solver-budget'] },
+            'out-dir': { type: 'string', default: DEFAULTS['out-dir'] },
+            report: { type: 'string' },
+            help: { type: 'boolean', short: 'h' }
+        }
+    });
+    if (values.help) return null;
+    if (!values.users) throw new Error('--users is required');
+
+    const config = {
+        hr: values.hr,
+        entitlements: values.entitlements,
+        users: values.users,
+        threshold: Number(values.threshold) / 100,
+        minGroup: Number(values['min-group']),
+        candidateMode: values['candidate-mode'],
+        solverBudgetMs: Number(values['solver-budget']),
+        outDir: values['out-dir'],
+        report: values.report || null
+    };
+    if (!(config.threshold >= 0.5 && config.threshold <= 1)) throw new Error('--threshold must be between 50 and 100');
+    if (!Number.isInteger(config.minGroup) || config.minGroup < 2) throw new Error('--min-group must be an integer of at least 2');
+    if (!/^(standard|lattice-\d+)$/.test(config.candidateMode)) throw new Error('--candidate-mode must be standard or lattice-<k>');
+    if (!(config.solverBudgetMs >= 0)) throw new Error('--solver-budget must be a number of milliseconds');
+    return config;
+}
+
+async function run(config) {
+    const trace = RoleEngine.beginTrace('cli');
+    const phases = [];
+
+    // Wall time, then heap and RSS at the end of the phase; peakRssBytes is
+    // the process high-water mark so far
+    async function phase(name, fn) {
+        const span = RoleEngine.startSpan(name);
+        const t0 = performance.now();
+        const result = await fn();
+        const seconds = (performance.now() - t0) / 1000;
+        const memory = process.memoryUsage();
+        const entry = {
+            name,
+            seconds,
+            heapUsedBytes: memory.heapUsed,
+            rssBytes: memory.rss,
+            peakRssBytes: peakRss()
+        };
+        phases.push(entry);
+        RoleEngine.endSpan(span);
+        console.warn(`${name.padEnd(20)} ${seconds.toFixed(3).padStart(9)} s  ` +
+            `${(entry.peakRssBytes / 2 ** 20).toFixed(1).padStart(9)} MiB peak RSS`);
+        return result;
+    }
+
+    const org = await phase('load.hr', () => loadOrgColumns(config.hr));
+    const entIndex = await phase('load.entitlements', () => loadEntitlements(config.entitlements));
+    const targets = await phase('load.users', async () =>
+        RoleEngine.encodeTargets(await loadUserIds(config.users, org), org, entIndex));
+    const strategies = RoleEngine.candidateStrategies(config.candidateMode);
+    const orgIndex = await phase('orgIndex', () => RoleEngine.buildOrgGroupIndex(org, strategies));
+    const raw = await phase('phase1', () => RoleEngine.runPhase1({
+        rowCount: org.rowCount,
+        columns: org.columns,
+        strategies,
+        minGroup: RoleEngine.phase1MinGroup(config.minGroup),
+        orgIndex,
+        targets
+    }));
+
+    const phase1 = { raw, rawKey: 0, targets };
+    const solutions = [];
+    for (let v = 0; v < RoleEngine.variantConfigs.length; v++) {
+        solutions.push(await phase(`variant.${v + 1}`, () => RoleEngine.runVariant({
+            ...phase1,
+            threshold: config.threshold,
+            minGroup: config.minGroup,
+            variantIndex: v,
+            solverBudgetMs: config.solverBudgetMs
+        })));
+    }
+
+    fs.mkdirSync(config.outDir, { recursive: true });
+    const files = await phase('export', async () => {
+        const written = [];
+        for (const sol of solutions) {
+            const file = path.join(config.outDir, `${RoleEngine.exportBaseName(sol)}.json`);
+            await writeParts(file, RoleEngine.optionJsonParts(sol, phase1));
+            written.push(file);
+        }
+        return written;
+    });
+    RoleEngine.endTrace(trace);
+
+    return {
+        config: { ...config, users: targets.ids.length, employees: org.rowCount, holdings: entIndex.rowCount },
+        node: process.version,
+        platform: `${process.platform}-${process.arch}`,
+        phases,
+        options: solutions.map((sol, v) => ({
+            option: sol.optionIndex,
+            name: sol.optionName,
+            roles: sol.totalRoles,
+            usersCovered: sol.totalUsersCovered,
+            ungroupedUsers: sol.ungroupedUsers.length,
+            file: files[v]
+        })),
+        trace
+    };
+}
+
+async function main(argv) {
+    let config;
+    try {
+        config = parseCliArgs(argv);
+    } catch (e) {
+        console.error(`engine-cli: ${e.message} (see --help)`);
+        process.exitCode = 2;
+        return;
+    }
+    if (config === null) {
+        console.log(USAGE);
+        return;
+    }
+
+    try {
+        const report = await run(config);
+        if (config.report) fs.writeFileSync(config.report, JSON.stringify(report, null, 2) + '\n');
+        for (const option of report.options) {
+            console.warn(`Option ${option.option}: ${option.roles} roles, ` +
+                `${option.usersCovered}/${report.config.users} users covered → ${option.file}`);
+        }
+    } catch (e) {
+        console.error(`engine-cli: ${e.message}`);
+        process.exitCode = 1;
+    }
+}
+
+if (require.main === module) main(process.argv.slice(2));
+
+module.exports = { readCsv, parseCsvRecord, run };
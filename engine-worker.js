@@ -0,0 +1,44 @@
+/* ===================================================================
+   RBAC Role Mining Tool — Engine Worker
+   Runs one engine task per message off the main thread:
+     { id, type: 'phase1' | 'variant', payload }
+   and posts back { id, type: 'progress', fraction, text } while working,
+   then { id, type: 'result', result, trace } or { id, type: 'error', message }.
+   trace is the RoleEngine trace of the task (spans and counters).
+   The last Phase 1 result a variant task brought is kept, so later
+   variant tasks for the same rawKey may leave out raw and targets.
+   =================================================================== */
+
+importScripts('engine.js');
+
+let held = null;  // { rawKey, raw, targets }
+
+function withPhase1(task) {
+    if (task.raw) {
+        held = { rawKey: task.rawKey, raw: task.raw, targets: task.targets };
+        return task;
+    }
+    if (!held || held.rawKey !== task.rawKey) throw new Error(`Phase 1 result ${task.rawKey} is not held by this worker`);
+    return { ...task, raw: held.raw, targets: held.targets };
+}
+
+self.onmessage = e => {
+    const { id, type, payload } = e.data;
+    const onProgress = (fraction, text) => self.postMessage({ id, type: 'progress', fraction, text });
+    RoleEngine.beginTrace(type);
+    try {
+        if (type === 'phase1') {
+            const result = RoleEngine.runPhase1(payload, onProgress);
+            const trace = RoleEngine.endTrace();
+            self.postMessage({ id, type: 'result', result, trace }, RoleEngine.transferables(result));
+        } else if (type === 'variant') {
+            const result = RoleEngine.runVariant(withPhase1(payload), onProgress);
+            self.postMessage({ id, type: 'result', result, trace: RoleEngine.endTrace() });
+        } else {
+            throw new Error(`Unknown engine task: ${type}`);
+        }
+    } catch (err) {
+        RoleEngine.endTrace();
+        self.postMessage({ id, type: 'error', message: err && err.message ? err.message : String(err) });
+    }
+};
@@ -0,0 +1,1527 @@
+/* ===================================================================
+   RBAC Role Mining Tool — Engine
+   Strategy grouping, candidate filtering, greedy set cover and scoring.
+   No DOM access: loaded by app.js, by engine-worker.js via importScripts
+   (both see the RoleEngine global) and by engine-cli.js as a CommonJS module.
+   =================================================================== */
+
+(function (root) {
+    'use strict';
+
+    // ─── Grouping Strategies ─────────────────────────────────────────
+    const strategies = [
+        // Single-attribute
+        { name: 'Business Line', columns: ['Business Line'], attrCount: 1 },
+        { name: 'Job Family', columns: ['Job Family'], attrCount: 1 },
+        { name: 'Cost Center', columns: ['Cost Center Name'], attrCount: 1 },
+        { name: 'Region', columns: ['Region'], attrCount: 1 },
+        // Two-attribute
+        { name: 'Business Line + Job Family', columns: ['Business Line', 'Job Family'], attrCount: 2 },
+        { name: 'Business Line + Job Grade', columns: ['Business Line', 'Job Grade / Band'], attrCount: 2 },
+        { name: 'Business Line + Region', columns: ['Business Line', 'Region'], attrCount: 2 },
+        { name: 'Job Family + Job Grade', columns: ['Job Family', 'Job Grade / Band'], attrCount: 2 },
+        { name: 'SNODE L3 + L4', columns: ['SNODE L3', 'SNODE L4'], attrCount: 2 },
+        { name: 'Cost Center + Job Family', columns: ['Cost Center Name', 'Job Family'], attrCount: 2 },
+        // Three-attribute
+        { name: 'SNODE L3 + L4 + L5', columns: ['SNODE L3', 'SNODE L4', 'SNODE L5'], attrCount: 3 },
+        { name: 'Region + Job Family + Job Grade', columns: ['Region', 'Job Family', 'Job Grade / Band'], attrCount: 3 },
+        { name: 'Business Line + Job Family + Job Grade', columns: ['Business Line', 'Job Family', 'Job Grade / Band'], attrCount: 3 },
+    ];
+
+    // ─── Attribute Lattice ───────────────────────────────────────────
+    // Alternative candidate generation: every combination of up to k of
+    // these HR attributes becomes a strategy (231 strategies at k = 3).
+    const latticeAttributes = [
+        { label: 'Business Line', column: 'Business Line' },
+        { label: 'Job Family', column: 'Job Family' },
+        { label: 'Job Code', column: 'Job Code' },
+        { label: 'Job Grade', column: 'Job Grade / Band' },
+        { label: 'Cost Center', column: 'Cost Center Name' },
+        { label: 'Legal Entity', column: 'Legal Entity' },
+        { label: 'Region', column: 'Region' },
+        { label: 'Country', column: 'Country' },
+        { label: 'SNODE L3', column: 'SNODE L3' },
+        { label: 'SNODE L4', column: 'SNODE L4' },
+        { label: 'SNODE L5', column: 'SNODE L5' },
+    ];
+
+    function latticeStrategies(maxAttrs, attributes = latticeAttributes) {
+        const out = [];
+        const combine = (start, picked, size) => {
+            if (picked.length === size) {
+                out.push({
+                    name: picked.map(a => a.label).join(' + '),
+                    columns: picked.map(a => a.column),
+                    attrCount: size
+                });
+                return;
+            }
+            for (let i = start; i < attributes.length; i++) combine(i + 1, [...picked, attributes[i]], size);
+        };
+        for (let size = 1; size <= Math.min(maxAttrs, attributes.length); size++) combine(0, [], size);
+        return out;
+    }
+
+    // Candidate strategies for a #candidate-mode value: the standard 13, or
+    // every combination of up to k lattice attributes ('lattice-k')
+    function candidateStrategies(mode) {
+        const lattice = /^lattice-(\d+)$/.exec(mode);
+        return lattice ? latticeStrategies(parseInt(lattice[1])) : strategies;
+    }
+
+    // HR columns the org encoding keeps: everything either generator can group by
+    const strategyColumns = [...new Set([...strategies.flatMap(s => s.columns), ...latticeAttributes.map(a => a.column)])];
+
+    // ─── Variant Configurations ──────────────────────────────────────
+    const variantConfigs = [
+        {
+            name: 'Recommended (Fewest Roles, Best Precision)',
+            description: 'Optimized to assign all users into the fewest possible roles while minimizing overspill — extra org employees pulled into the role who are not in your target list.',
+            weights: { coverage: 0.35, commonality: 0.20, richness: 0.10, groupSize: 0.05, precision: 0.30 },
+            thresholdAdjust: 0, minGroupAdjust: 0
+        },
+        {
+            name: 'Maximum Precision (Minimal Overspill)',
+            description: 'Prioritizes the tightest possible role criteria so that virtually no unintended employees are scoped in. May produce more roles to achieve precision.',
+            weights: { coverage: 0.20, commonality: 0.15, richness: 0.05, groupSize: 0.05, precision: 0.55 },
+            thresholdAdjust: 0, minGroupAdjust: 0,
+            preferGranular: true
+        },
+        {
+            name: 'Maximum Commonality',
+            description: 'Prioritizes the highest possible entitlement alignment within each role, with moderate overspill control.',
+            weights: { coverage: 0.20, commonality: 0.45, richness: 0.10, groupSize: 0.05, precision: 0.20 },
+            thresholdAdjust: 0.05, minGroupAdjust: 0
+        },
+        {
+            name: 'Broad Coverage',
+            description: 'Focuses on covering every user with minimal gaps, accepting slightly lower commonality and precision to reduce ungrouped users.',
+            weights: { coverage: 0.50, commonality: 0.15, richness: 0.10, groupSize: 0.05, precision: 0.20 },
+            thresholdAdjust: -0.05, minGroupAdjust: 0
+        },
+        {
+            name: 'Simple Grouping',
+            description: 'Favors broad, single-attribute groupings (e.g., Business Line or Job Family alone) for easier organizational mapping. May have higher overspill.',
+            weights: { coverage: 0.35, commonality: 0.20, richness: 0.10, groupSize: 0.15, precision: 0.20 },
+            thresholdAdjust: 0, minGroupAdjust: 0,
+            preferSimple: true
+        }
+    ];
+
+    // ─── Instrumentation ─────────────────────────────────────────────
+    // Between beginTrace and endTrace, engine calls record spans and named
+    // counters. Each span is also a performance.measure, so it shows in the
+    // browser's performance timeline. Times are epoch milliseconds
+    // (timeOrigin + now), so traces from different workers line up. Traces
+    // nest: an inner trace collects until it ends, then the outer resumes.
+    // With no trace open, recording costs a null check.
+    const perf = typeof performance !== 'undefined' ? performance : null;
+    const traceStack = [];
+    let activeTrace = null;
+    let nextMark = 0;  // keeps mark names unique when spans of one name nest
+
+    function clockNow() {
+        return perf && perf.timeOrigin ? perf.timeOrigin + perf.now() : Date.now();
+    }
+
+    // Bytes of JS heap in use, where the runtime reports it
+    function heapUsed() {
+        if (perf && perf.memory) return perf.memory.usedJSHeapSize;
+        if (typeof process !== 'undefined' && process.memoryUsage) return process.memoryUsage().heapUsed;
+        return null;
+    }
+
+    function beginTrace(label) {
+        if (activeTrace) traceStack.push(activeTrace);
+        activeTrace = { label, start: clockNow(), end: null, heapUsed: null, spans: [], counters: {}, series: {} };
+        return activeTrace;
+    }
+
+    // Ends the active trace, or a given outer one (async callers may finish
+    // out of order) without disturbing the active trace
+    function endTrace(trace = activeTrace) {
+        if (trace === activeTrace) {
+            activeTrace = traceStack.length ? traceStack.pop() : null;
+        } else {
+            const i = traceStack.indexOf(trace);
+            if (i >= 0) traceStack.splice(i, 1);
+        }
+        if (trace) {
+            trace.end = clockNow();
+            trace.heapUsed = heapUsed();
+        }
+        return trace;
+    }
+
+    function startSpan(name) {
+        if (!activeTrace) return null;
+        const mark = `${name}#${nextMark++}`;
+        if (perf && perf.mark) perf.mark(mark);
+        return { trace: activeTrace, name, mark, start: clockNow() };
+    }
+
+    function endSpan(span, args) {
+        if (!span) return;
+        const end = clockNow();
+        if (perf && perf.measure) {
+            perf.measure(span.name, span.mark);
+            perf.clearMarks(span.mark);
+            perf.clearMeasures(span.name);
+        }
+        span.trace.spans.push({ name: span.name, start: span.start, duration: end - span.start, heapUsed: heapUsed(), ...args });
+    }
+
+    function traceCount(name, n = 1) {
+        if (activeTrace) activeTrace.counters[name] = (activeTrace.counters[name] || 0) + n;
+    }
+
+    // Appends to a per-trace series, e.g. one value per greedy round
+    function traceSample(name, value) {
+        if (!activeTrace) return;
+        (activeTrace.series[name] || (activeTrace.series[name] = [])).push(value);
+    }
+
+    // ─── Encoding ────────────────────────────────────────────────────
+    // Engine inputs are typed arrays, so they can be transferred to workers
+    // instead of structured-cloning row objects and Sets.
+
+    // Growable Int32Array
+    function intList() {
+        return { data: new Int32Array(1024), length: 0 };
+    }
+
+    function intPush(list, value) {
+        if (list.length === list.data.length) {
+            const grown = new Int32Array(list.data.length * 2);
+            grown.set(list.data);
+            list.data = grown;
+        }
+        list.data[list.length++] = value;
+    }
+
+    // Dictionary-encode the strategy columns of the whole HR master;
+    // incremental, so rows can be added as they are parsed
+    function createOrgColumnsBuilder() {
+        const columns = strategyColumns.map(name => ({ name, index: new Map(), values: [], codes: intList() }));
+        const rowIndex = new Map();
+        let rowCount = 0;
+
+        function add(row) {
+            for (const col of columns) {
+                const v = row[col.name];
+                let code = col.index.get(v);
+                if (code === undefined) {
+                    code = col.values.length;
+                    col.index.set(v, code);
+                    col.values.push(v);
+                }
+                intPush(col.codes, code);
+            }
+            rowIndex.set(row['Employee ID'], rowCount++);
+        }
+
+        function finish() {
+            const encoded = {};
+            for (const col of columns) {
+                encoded[col.name] = { values: col.values, codes: new Uint32Array(col.codes.data.buffer.slice(0, rowCount * 4)) };
+            }
+            return { rowCount, columns: encoded, rowIndex };
+        }
+
+        return { add, finish };
+    }
+
+    function encodeOrgColumns(hrRows) {
+        const builder = createOrgColumnsBuilder();
+        for (const row of hrRows) builder.add(row);
+        return builder.finish();
+    }
+
+    // ─── Entitlement Index ───────────────────────────────────────────
+    // Each distinct entitlement is interned once into dict (integer id →
+    // metadata object); holdings are a CSR user × entitlement matrix: user
+    // u holds ids[offsets[u] .. offsets[u + 1]], in first-seen order.
+
+    // Incremental builder, so rows can be added as they are parsed
+    function createEntitlementIndexBuilder() {
+        const users = new Map();     // Employee ID → user index
+        const entIndex = new Map();  // id|app|appId|BU|name → entitlement id
+        const dict = [];
+        const rowUser = intList();
+        const rowEnt = intList();
+
+        function add(row) {
+            const eid = row['Employee ID'];
+            let u = users.get(eid);
+            if (u === undefined) {
+                u = users.size;
+                users.set(eid, u);
+            }
+            const key = `${row['Entitlement ID']}|${row['Application']}|${row['Application ID']}|${row['Application Business Unit']}|${row['Entitlement Name']}`;
+            let e = entIndex.get(key);
+            if (e === undefined) {
+                e = dict.length;
+                entIndex.set(key, e);
+                dict.push({
+                    entitlementId: row['Entitlement ID'],
+                    application: row['Application'],
+                    applicationId: row['Application ID'],
+                    applicationBU: row['Application Business Unit'],
+                    entitlementName: row['Entitlement Name']
+                });
+            }
+            intPush(rowUser, u);
+            intPush(rowEnt, e);
+        }
+
+        function finish() {
+            const userCount = users.size;
+            const rowCount = rowUser.length;
+            const offsets = new Int32Array(userCount + 1);
+            for (let r = 0; r < rowCount; r++) offsets[rowUser.data[r] + 1]++;
+            for (let u = 0; u < userCount; u++) offsets[u + 1] += offsets[u];
+
+            const fill = offsets.slice(0, userCount);
+            const all = new Int32Array(rowCount);
+            for (let r = 0; r < rowCount; r++) all[fill[rowUser.data[r]]++] = rowEnt.data[r];
+
+            // Drop repeated grants of the same entitlement to a user
+            const lastUser = new Int32Array(dict.length).fill(-1);
+            const ids = new Int32Array(rowCount);
+            let n = 0;
+            for (let u = 0; u < userCount; u++) {
+                const start = offsets[u];
+                offsets[u] = n;
+                for (let j = start; j < offsets[u + 1]; j++) {
+                    const e = all[j];
+                    if (lastUser[e] !== u) {
+                        lastUser[e] = u;
+                        ids[n++] = e;
+                    }
+                }
+            }
+            offsets[userCount] = n;
+            return { users, dict, offsets, ids: ids.slice(0, n), rowCount };
+        }
+
+        return { add, finish };
+    }
+
+    function buildEntitlementIndex(rows) {
+        const builder = createEntitlementIndexBuilder();
+        for (const row of rows) builder.add(row);
+        return builder.finish();
+    }
+
+    // Target users as org row indices plus their holdings, as a CSR matrix
+    // over a dictionary of just the entitlements they hold. refs lists every
+    // uploaded entry (duplicates included) as an index into the distinct
+    // ids, mirroring how the uploaded list is grouped.
+    function encodeTargets(targetIds, org, entIndex) {
+        const ids = [];
+        const idIndex = new Map();
+        const refs = new Int32Array(targetIds.length);
+        targetIds.forEach((id, k) => {
+            let u = idIndex.get(id);
+            if (u === undefined) {
+                u = ids.length;
+                idIndex.set(id, u);
+                ids.push(id);
+            }
+            refs[k] = u;
+        });
+
+        const rows = new Int32Array(ids.length);
+        const local = new Int32Array(entIndex.dict.length).fill(-1);
+        const entDict = [];
+        const entOffsets = new Int32Array(ids.length + 1);
+        const ents = intList();
+        ids.forEach((id, u) => {
+            rows[u] = org.rowIndex.get(id);
+            const user = entIndex.users.get(id);
+            if (user !== undefined) {
+                for (let j = entIndex.offsets[user]; j < entIndex.offsets[user + 1]; j++) {
+                    const e = entIndex.ids[j];
+                    if (local[e] === -1) {
+                        local[e] = entDict.length;
+                        entDict.push(entIndex.dict[e]);
+                    }
+                    intPush(ents, local[e]);
+                }
+            }
+            entOffsets[u + 1] = ents.length;
+        });
+        return { ids, refs, rows, entDict, entOffsets, ents: ents.data.slice(0, ents.length) };
+    }
+
+    // Typed-array buffers anywhere in a message, for postMessage transfer lists
+    function transferables(obj, out = []) {
+        if (ArrayBuffer.isView(obj)) {
+            if (!out.includes(obj.buffer)) out.push(obj.buffer);
+        } else if (obj && typeof obj === 'object' && !(obj instanceof Map)) {
+            for (const v of Object.values(obj)) transferables(v, out);
+        }
+        return out;
+    }
+
+    // Copy every typed array in a message, so the original stays usable after a transfer
+    function cloneTyped(obj) {
+        if (ArrayBuffer.isView(obj)) return obj.slice();
+        if (Array.isArray(obj)) return obj.some(v => v && typeof v === 'object') ? obj.map(cloneTyped) : obj;
+        if (!obj || typeof obj !== 'object' || obj instanceof Map) return obj;
+        const out = {};
+        for (const [k, v] of Object.entries(obj)) out[k] = cloneTyped(v);
+        return out;
+    }
+
+    // ─── Phase 1: Raw candidate pool ─────────────────────────────────
+    // Groups the target users under every strategy and counts entitlements
+    // per group. Org-wide group counts (the org group index below) measure
+    // "overspill" — how many employees in the full HR master match each
+    // criteria but are NOT in the target list.
+    function strategyKeys(strat, columns, rows, count) {
+        // Composite code per row; mixed radix while it fits a double exactly
+        const cols = strat.columns.map(c => columns[c]);
+        const radix = cols.reduce((p, c) => p * Math.max(c.values.length, 1), 1);
+        const keys = new Array(count);
+        for (let i = 0; i < count; i++) {
+            const r = rows ? rows[i] : i;
+            if (radix <= Number.MAX_SAFE_INTEGER) {
+                let k = 0;
+                for (const c of cols) k = k * c.values.length + c.codes[r];
+                keys[i] = k;
+            } else {
+                keys[i] = cols.map(c => c.codes[r]).join(',');
+            }
+        }
+        return keys;
+    }
+
+    // ─── Org Group Index ─────────────────────────────────────────────
+    // Org-wide employee count of every group under every strategy. It only
+    // depends on the HR master and the strategy list, so app.js builds it
+    // once per HR file and caches it; per strategy, keys are the sorted
+    // composite codes from strategyKeys and counts[i] is the size of group
+    // keys[i].
+    const ORG_INDEX_VERSION = 1;
+
+    function orgIndexSignature(strats) {
+        return [`v${ORG_INDEX_VERSION}`, ...strats.map(s => s.columns.join('|'))].join('\n');
+    }
+
+    function buildOrgGroupIndex(org, strats = strategies) {
+        const span = startSpan('orgIndex.build');
+        const groups = strats.map(strat => {
+            const counts = new Map();
+            for (const k of strategyKeys(strat, org.columns, null, org.rowCount)) {
+                counts.set(k, (counts.get(k) || 0) + 1);
+            }
+            const keys = [...counts.keys()];
+            const numeric = typeof keys[0] !== 'string';
+            keys.sort(numeric ? (a, b) => a - b : undefined);
+            return {
+                keys: numeric ? Float64Array.from(keys) : keys,
+                counts: Int32Array.from(keys, k => counts.get(k))
+            };
+        });
+        traceCount('orgIndex.groups', groups.reduce((t, g) => t + g.keys.length, 0));
+        endSpan(span, { strategies: strats.length, rows: org.rowCount });
+        return { signature: orgIndexSignature(strats), rowCount: org.rowCount, groups };
+    }
+
+    // False for an index cached under other strategies or an older layout
+    function isOrgGroupIndexCurrent(index, strats = strategies) {
+        return !!index && index.signature === orgIndexSignature(strats);
+    }
+
+    function orgGroupCount(group, key) {
+        let lo = 0, hi = group.keys.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (group.keys[mid] < key) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo < group.keys.length && group.keys[lo] === key ? group.counts[lo] : 0;
+    }
+
+    // Cuboid-style evaluation over the strategy list. Pass 1 partitions the
+    // uploaded list under each strategy, coarse to fine, keying only users
+    // whose group survived in a strategy with one column fewer (a group can
+    // be no larger than its parent's), and keeps groups of at least
+    // minMembers. Pass 2, fine to coarse, rolls each group's entitlement
+    // counts up from a finer strategy's groups inside it, scanning only the
+    // members those groups do not cover. Each count remembers the earliest
+    // (uploaded position, holding position) it came from, so groups, members
+    // and entitlements keep the first-seen order of a direct scan.
+    function runPhase1(input, onProgress) {
+        const phaseSpan = startSpan('phase1');
+        const { columns, rowCount, targets } = input;
+        const strats = input.strategies || strategies;
+        const minMembers = Math.max(2, input.minGroup || 2);
+        const orgIndex = isOrgGroupIndexCurrent(input.orgIndex, strats)
+            ? input.orgIndex
+            : buildOrgGroupIndex({ columns, rowCount }, strats);
+        const refs = targets.refs;
+        const n = refs.length;
+        const targetRows = Int32Array.from(refs, u => targets.rows[u]);
+        const colSets = strats.map(s => new Set(s.columns));
+        const isSubset = (a, b) => a.size < b.size && [...a].every(c => b.has(c));
+
+        // ── Pass 1: iceberg-pruned partitions, coarse to fine
+        const byWidth = strats.map((_, s) => s).sort((a, b) => colSets[a].size - colSets[b].size || a - b);
+        const parts = new Array(strats.length);
+        byWidth.forEach((s, step) => {
+            if (onProgress) onProgress(step / (2 * strats.length), `Phase 1: Grouping by ${strats[s].name}...`);
+            const span = startSpan(`phase1.group: ${strats[s].name}`);
+            // Only the previous width is needed as a parent from here on
+            for (const p of byWidth.slice(0, step)) {
+                if (colSets[p].size < colSets[s].size - 1) parts[p].groupOf = null;
+            }
+            const parent = byWidth.slice(0, step).find(p =>
+                colSets[p].size === colSets[s].size - 1 && isSubset(colSets[p], colSets[s]));
+            const positions = [];
+            for (let i = 0; i < n; i++) {
+                if (parent === undefined || parts[parent].groupOf[i] >= 0) positions.push(i);
+            }
+            const keys = strategyKeys(strats[s], columns, positions.map(i => targetRows[i]), positions.length);
+            const found = new Map();
+            positions.forEach((i, k) => {
+                let g = found.get(keys[k]);
+                if (!g) found.set(keys[k], g = []);
+                g.push(i);
+            });
+            // holdings: entitlement grants across kept members, the cost of scanning them
+            const part = { keys: [], members: [], groupOf: new Int32Array(n).fill(-1), holdings: 0 };
+            for (const [k, g] of found) {
+                if (g.length < minMembers) continue;
+                for (const i of g) {
+                    part.groupOf[i] = part.members.length;
+                    part.holdings += targets.entOffsets[refs[i] + 1] - targets.entOffsets[refs[i]];
+                }
+                part.keys.push(k);
+                part.members.push(g);
+            }
+            parts[s] = part;
+            traceCount('phase1.keyedUsers', positions.length);
+            traceCount('phase1.groupsKept', part.keys.length);
+            traceCount('phase1.groupsPruned', found.size - part.keys.length);
+            endSpan(span, { keyed: positions.length, groups: part.keys.length });
+        });
+
+        // ── Pass 2: entitlement counts, fine to coarse
+        // Entitlement j of uploaded entry i was seen at seqBase[i] + j
+        const seqBase = new Float64Array(n);
+        for (let i = 1; i < n; i++) {
+            const u = refs[i - 1];
+            seqBase[i] = seqBase[i - 1] + targets.entOffsets[u + 1] - targets.entOffsets[u];
+        }
+        const count = new Int32Array(targets.entDict.length);
+        const firstSeq = new Float64Array(targets.entDict.length).fill(Infinity);
+        const covered = new Int32Array(n).fill(-1);
+        let stamp = 0;
+        const tallies = new Array(strats.length);
+
+        [...byWidth].reverse().forEach((s, step) => {
+            if (onProgress) onProgress(0.5 + step / (2 * strats.length), `Phase 1: Analyzing ${strats[s].name}...`);
+            const span = startSpan(`phase1.count: ${strats[s].name}`);
+            const part = parts[s];
+            let scanned = 0, merged = 0;
+
+            // Roll up from the finer strategy that leaves the least work: its
+            // merged entries plus the holdings of members it does not cover
+            let child, best = part.holdings;
+            for (const c of byWidth) {
+                if (!tallies[c] || !isSubset(colSets[s], colSets[c])) continue;
+                const cost = parts[c].entries + part.holdings - parts[c].holdings;
+                if (cost < best) {
+                    child = c;
+                    best = cost;
+                }
+            }
+            // Every kept child group lies inside a kept group of this strategy
+            const children = part.members.map(() => []);
+            if (child !== undefined) {
+                const groupIndex = new Map(part.keys.map((k, gi) => [k, gi]));
+                const childRows = parts[child].members.map(g => targetRows[g[0]]);
+                strategyKeys(strats[s], columns, childRows, childRows.length)
+                    .forEach((k, cg) => children[groupIndex.get(k)].push(cg));
+            }
+
+            part.entries = 0;
+            tallies[s] = part.members.map((g, gi) => {
+                const seen = [];
+                const mark = stamp++;
+                // Merging (and re-sorting) pays off only when the children's
+                // distinct entitlements are well below the holdings they replace
+                let mergedEntries = 0, mergedHoldings = 0;
+                for (const cg of children[gi]) {
+                    mergedEntries += tallies[child][cg].ents.length;
+                    mergedHoldings += tallies[child][cg].holdings;
+                }
+                const merge = 2 * mergedEntries < mergedHoldings;
+                if (merge) {
+                    merged++;
+                    for (const cg of children[gi]) {
+                        for (const i of parts[child].members[cg]) covered[i] = mark;
+                        const t = tallies[child][cg];
+                        for (let k = 0; k < t.ents.length; k++) {
+                            const e = t.ents[k];
+                            if (count[e] === 0) seen.push(e);
+                            count[e] += t.counts[k];
+                            if (t.firstSeq[k] < firstSeq[e]) firstSeq[e] = t.firstSeq[k];
+                        }
+                    }
+                }
+                let holdings = 0;
+                for (const i of g) {
+                    const u = refs[i];
+                    holdings += targets.entOffsets[u + 1] - targets.entOffsets[u];
+                    if (covered[i] === mark) continue;
+                    scanned += targets.entOffsets[u + 1] - targets.entOffsets[u];
+                    const base = seqBase[i] - targets.entOffsets[u];
+                    for (let j = targets.entOffsets[u]; j < targets.entOffsets[u + 1]; j++) {
+                        const e = targets.ents[j];
+                        if (count[e] === 0) seen.push(e);
+                        count[e]++;
+                        if (base + j < firstSeq[e]) firstSeq[e] = base + j;
+                    }
+                }
+                if (merge) seen.sort((a, b) => firstSeq[a] - firstSeq[b]);
+                const t = {
+                    ents: new Int32Array(seen.length),
+                    counts: new Int32Array(seen.length),
+                    firstSeq: new Float64Array(seen.length),
+                    holdings
+                };
+                for (let k = 0; k < seen.length; k++) {
+                    const e = seen[k];
+                    t.ents[k] = e;
+                    t.counts[k] = count[e];
+                    t.firstSeq[k] = firstSeq[e];
+                    count[e] = 0;
+                    firstSeq[e] = Infinity;
+                }
+                part.entries += seen.length;
+                return t;
+            });
+            traceCount('phase1.holdingsScanned', scanned);
+            traceCount('phase1.groupsRolledUp', merged);
+            endSpan(span, { rolledUpFrom: child === undefined ? null : strats[child].name, holdingsScanned: scanned });
+        });
+
+        // ── Output in strategy order, groups in first-seen order
+        const strategyIdx = [];
+        const groupKeys = [];
+        const orgTotals = [];
+        const memberOffsets = [0];
+        const members = intList();
+        const entOffsets = [0];
+        const ents = intList();
+        const entCounts = intList();
+        strats.forEach((strat, s) => {
+            parts[s].members.forEach((g, gi) => {
+                const r = targetRows[g[0]];
+                strategyIdx.push(s);
+                groupKeys.push(strat.columns.map(c => `${columns[c].values[columns[c].codes[r]]}`).join('|'));
+                orgTotals.push(orgGroupCount(orgIndex.groups[s], parts[s].keys[gi]) || g.length);
+                for (const i of g) intPush(members, refs[i]);
+                memberOffsets.push(members.length);
+                const t = tallies[s][gi];
+                for (let k = 0; k < t.ents.length; k++) {
+                    intPush(ents, t.ents[k]);
+                    intPush(entCounts, t.counts[k]);
+                }
+                entOffsets.push(ents.length);
+            });
+        });
+
+        traceCount('phase1.candidates', groupKeys.length);
+        endSpan(phaseSpan, { strategies: strats.length, targets: n, candidates: groupKeys.length });
+        return {
+            strategies: strats.map(({ name, attrCount }) => ({ name, attrCount })),
+            strategyIdx: Uint16Array.from(strategyIdx),
+            groupKeys,
+            orgTotals: Int32Array.from(orgTotals),
+            memberOffsets: Int32Array.from(memberOffsets),
+            members: members.data.slice(0, members.length),
+            entOffsets: Int32Array.from(entOffsets),
+            ents: ents.data.slice(0, ents.length),
+            entCounts: entCounts.data.slice(0, entCounts.length)
+        };
+    }
+
+    // ─── Filter candidates for a given threshold ─────────────────────
+    // Everything about a group except its shared entitlements is independent
+    // of the threshold, so it is built once per Phase 1 result and shared by
+    // every variant. Each group's entitlements are sorted by count the first
+    // time the group is looked at (descending, then first-seen order, as the
+    // stable commonality sort would leave them), which makes "shared at
+    // threshold t" a prefix found by binary search. Candidate lists are memoized per (threshold,
+    // minGroup); candidates are frozen, so variants keep their bonuses in a
+    // side array instead.
+    function createCandidateIndex(raw, targets) {
+        const groupTotal = raw.groupKeys.length;
+        const descOrder = new Int32Array(raw.ents.length);
+        const descCounts = new Int32Array(raw.ents.length);
+        const sorted = new Uint8Array(groupTotal);
+
+        // Sorted on first use, so looking up one role's details sorts one group
+        function sortGroup(g) {
+            if (sorted[g]) return;
+            sorted[g] = 1;
+            traceCount('candidates.groupsSorted');
+            const lo = raw.entOffsets[g], hi = raw.entOffsets[g + 1];
+            const order = [];
+            for (let j = lo; j < hi; j++) order.push(j);
+            order.sort((a, b) => raw.entCounts[b] - raw.entCounts[a] || a - b);
+            for (let k = 0; k < order.length; k++) {
+                descOrder[lo + k] = order[k];
+                descCounts[lo + k] = raw.entCounts[order[k]];
+            }
+        }
+
+        // Threshold-independent parts, each built on first use: entitlement
+        // objects and outliers only for groups whose details are read
+        const bases = new Array(groupTotal).fill(null);
+        const entObjCache = new Array(groupTotal).fill(null);
+        const outlierCache = new Array(groupTotal).fill(null);
+        const userOutlierCache = new Array(groupTotal).fill(null);
+        const byThreshold = new Map();                     // threshold -> Array(groupTotal) of candidates
+        const lists = new Map();                           // `${threshold}|${minGroup}` -> candidates
+        const groupCount = new Int32Array(targets.entDict.length);
+
+        function groupBase(g) {
+            if (bases[g]) return bases[g];
+            const strat = raw.strategies[raw.strategyIdx[g]];
+            const groupKey = raw.groupKeys[g];
+            const criteriaValues = groupKey.split('|');
+            const criteria = {};
+            strat.name.split(' + ').forEach((label, idx) => {
+                criteria[label.trim()] = criteriaValues[idx] ? criteriaValues[idx].trim() : '';
+            });
+            bases[g] = {
+                strat, groupKey, criteria,
+                memberCount: raw.memberOffsets[g + 1] - raw.memberOffsets[g],
+                memberIds: new Set(raw.members.subarray(raw.memberOffsets[g], raw.memberOffsets[g + 1])),  // target user indices
+                roleName: criteriaValues.map(v => v.trim()).join(' - ')
+            };
+            return bases[g];
+        }
+
+        // k-th entitlement object in descending commonality order; only the
+        // shared prefix and the outlier tail are ever asked for
+        function groupEntObj(g, k) {
+            if (!entObjCache[g]) entObjCache[g] = [];
+            if (entObjCache[g][k]) return entObjCache[g][k];
+            sortGroup(g);
+            const j = descOrder[raw.entOffsets[g] + k];
+            const count = raw.entCounts[j];
+            const memberCount = raw.memberOffsets[g + 1] - raw.memberOffsets[g];
+            traceCount('candidates.entitlementObjects');
+            entObjCache[g][k] = Object.freeze({
+                ...targets.entDict[raw.ents[j]],
+                commonality: count / memberCount,
+                userCount: count,
+                totalUsers: memberCount
+            });
+            return entObjCache[g][k];
+        }
+
+        // Outliers are the low end of the ascending (count, first-seen) order
+        function groupOutliers(g) {
+            if (outlierCache[g]) return outlierCache[g];
+            sortGroup(g);
+            const lo = raw.entOffsets[g], hi = raw.entOffsets[g + 1];
+            const memberCount = raw.memberOffsets[g + 1] - raw.memberOffsets[g];
+            const outlierEnts = [];
+            for (let k = hi - lo - 1; k >= 0 && descCounts[lo + k] / memberCount < 0.2; k--) {
+                let start = k;
+                while (start > 0 && descCounts[lo + start - 1] === descCounts[lo + k]) start--;
+                for (let t = start; t <= k; t++) outlierEnts.push(groupEntObj(g, t));
+                k = start;
+            }
+            outlierCache[g] = Object.freeze(outlierEnts);
+            return outlierCache[g];
+        }
+
+        function groupUserOutliers(g) {
+            if (userOutlierCache[g]) return userOutlierCache[g];
+            const lo = raw.entOffsets[g], hi = raw.entOffsets[g + 1];
+            for (let j = lo; j < hi; j++) groupCount[raw.ents[j]] = raw.entCounts[j];
+            const userOutliers = {};
+            for (const u of raw.members.subarray(raw.memberOffsets[g], raw.memberOffsets[g + 1])) {
+                const uniqueToUser = [];
+                for (let j = targets.entOffsets[u]; j < targets.entOffsets[u + 1]; j++) {
+                    const e = targets.ents[j];
+                    if (groupCount[e] === 1) uniqueToUser.push(targets.entDict[e]);
+                }
+                if (uniqueToUser.length > 0) userOutliers[targets.ids[u]] = uniqueToUser;
+            }
+            for (let j = lo; j < hi; j++) groupCount[raw.ents[j]] = 0;
+            userOutlierCache[g] = Object.freeze(userOutliers);
+            return userOutlierCache[g];
+        }
+
+        // Number of entitlements with commonality >= threshold
+        function sharedCount(g, threshold) {
+            sortGroup(g);
+            const lo = raw.entOffsets[g];
+            const memberCount = raw.memberOffsets[g + 1] - raw.memberOffsets[g];
+            let a = 0, b = raw.entOffsets[g + 1] - lo;
+            while (a < b) {
+                const mid = (a + b) >>> 1;
+                if (descCounts[lo + mid] / memberCount >= threshold) a = mid + 1;
+                else b = mid;
+            }
+            return a;
+        }
+
+        // Entitlement lists are getters, so only the roles a variant selects
+        // (and copies) ever build them; sharedCount serves the set cover. The
+        // outlier getters are not enumerable: copies of a role leave them out,
+        // and roleOutliers fetches them when a role's details are shown.
+        function candidateAt(g, threshold) {
+            const shared = sharedCount(g, threshold);
+            if (shared === 0) return null;
+            const base = groupBase(g);
+            const { strat, memberCount } = base;
+
+            // Summed in first-seen order, like the per-variant filter this replaces
+            let sum = 0;
+            for (let j = raw.entOffsets[g]; j < raw.entOffsets[g + 1]; j++) {
+                const commonality = raw.entCounts[j] / memberCount;
+                if (commonality >= threshold) sum += commonality;
+            }
+            const orgTotal = raw.orgTotals[g];
+            let sharedEnts = null;
+
+            const candidate = {
+                id: `${strat.name}::${base.groupKey}`,
+                strategyName: strat.name,
+                attrCount: strat.attrCount,
+                groupKey: base.groupKey,
+                groupIndex: g,
+                memberIds: base.memberIds,
+                memberCount,
+                criteria: base.criteria,
+                roleName: base.roleName,
+                get sharedEntitlements() {
+                    if (!sharedEnts) {
+                        sharedEnts = [];
+                        for (let k = 0; k < shared; k++) sharedEnts.push(groupEntObj(g, k));
+                        Object.freeze(sharedEnts);
+                    }
+                    return sharedEnts;
+                },
+                sharedCount: shared,
+                avgCommonality: sum / shared,
+                orgTotal,
+                overspill: orgTotal - memberCount,
+                precision: memberCount / orgTotal
+            };
+            return Object.freeze(Object.defineProperties(candidate, {
+                outlierEntitlements: { get: () => groupOutliers(g) },
+                userOutliers: { get: () => groupUserOutliers(g) }
+            }));
+        }
+
+        return {
+            outlierEntitlements: groupOutliers,
+            userOutliers: groupUserOutliers,
+            candidates(threshold, minGroup) {
+                const key = `${threshold}|${minGroup}`;
+                if (lists.has(key)) return lists.get(key);
+                if (!byThreshold.has(threshold)) byThreshold.set(threshold, new Array(groupTotal));
+                const atThreshold = byThreshold.get(threshold);
+                const list = [];
+                for (let g = 0; g < groupTotal; g++) {
+                    if (raw.memberOffsets[g + 1] - raw.memberOffsets[g] < minGroup) continue;
+                    if (atThreshold[g] === undefined) atThreshold[g] = candidateAt(g, threshold);
+                    if (atThreshold[g]) list.push(atThreshold[g]);
+                }
+                lists.set(key, list);
+                return list;
+            }
+        };
+    }
+
+    // One index per Phase 1 result: keyed by task.rawKey when the caller
+    // supplies one (workers receive a fresh copy of raw per message), else by
+    // the raw object itself.
+    let candidateIndexCache = null;
+
+    function candidateIndexFor(task) {
+        const key = task.rawKey !== undefined ? task.rawKey : task.raw;
+        if (!candidateIndexCache || candidateIndexCache.key !== key) {
+            candidateIndexCache = { key, index: createCandidateIndex(task.raw, task.targets) };
+        }
+        return candidateIndexCache.index;
+    }
+
+    function filterCandidatesForThreshold(raw, targets, threshold, minGroup) {
+        return candidateIndexFor({ raw, targets }).candidates(threshold, minGroup);
+    }
+
+    // Low-commonality entitlements and per-user exceptions for one solution
+    // role (by its groupIndex), from the Phase 1 result ({ raw, rawKey,
+    // targets }) it was solved against. Built per group on first request.
+    function roleOutliers(phase1, groupIndex) {
+        const index = candidateIndexFor(phase1);
+        return {
+            outlierEntitlements: index.outlierEntitlements(groupIndex),
+            userOutliers: index.userOutliers(groupIndex)
+        };
+    }
+
+    // ─── Greedy Set Cover ────────────────────────────────────────────
+    // Lazy greedy (CELF): a candidate's newly-covered count only shrinks as
+    // users get covered, so its last computed count bounds its score. Each
+    // round pops candidates in bound order and recounts only those popped,
+    // via popcount(members AND uncovered) over Uint32Array bitsets. Scores use
+    // the same expression and ties still go to the earliest candidate, so the
+    // selected roles match a full rescan exactly.
+    function popcount32(x) {
+        x -= (x >>> 1) & 0x55555555;
+        x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+        return (((x + (x >>> 4)) & 0x0F0F0F0F) * 0x01010101) >>> 24;
+    }
+
+    // Max-heap of { key, idx } ordered by key, then lowest idx first
+    function heapAbove(a, b) {
+        return a.key > b.key || (a.key === b.key && a.idx < b.idx);
+    }
+
+    function heapSiftDown(heap, i) {
+        const n = heap.length;
+        for (;;) {
+            const l = 2 * i + 1, r = l + 1;
+            let top = i;
+            if (l < n && heapAbove(heap[l], heap[top])) top = l;
+            if (r < n && heapAbove(heap[r], heap[top])) top = r;
+            if (top === i) return;
+            [heap[i], heap[top]] = [heap[top], heap[i]];
+            i = top;
+        }
+    }
+
+    function heapPush(heap, item) {
+        heap.push(item);
+        let i = heap.length - 1;
+        while (i > 0) {
+            const parent = (i - 1) >> 1;
+            if (!heapAbove(heap[i], heap[parent])) return;
+            [heap[i], heap[parent]] = [heap[parent], heap[i]];
+            i = parent;
+        }
+    }
+
+    function heapPop(heap) {
+        const top = heap[0];
+        const last = heap.pop();
+        if (heap.length > 0) {
+            heap[0] = last;
+            heapSiftDown(heap, 0);
+        }
+        return top;
+    }
+
+    // bonuses, if given, is aligned with candidates (variant-specific score offsets)
+    function greedySetCover(candidates, allUserIds, weights, minGroup, bonuses) {
+        const uncovered = new Set(allUserIds);
+        const solution = [];
+
+        // Bitsets over the target users
+        const userIndex = new Map();
+        for (const id of allUserIds) userIndex.set(id, userIndex.size);
+        const words = (userIndex.size + 31) >>> 5;
+        const uncoveredBits = new Uint32Array(words);
+        for (let i = 0; i < userIndex.size; i++) uncoveredBits[i >>> 5] |= 1 << (i & 31);
+
+        const pool = candidates.map((candidate, idx) => {
+            const bits = new Uint32Array(words);
+            for (const mid of candidate.memberIds) {
+                const u = userIndex.get(mid);
+                if (u !== undefined) bits[u >>> 5] |= 1 << (u & 31);
+            }
+            // Nonzero words only, so counting skips empty stretches of the bitset
+            const wordIdx = [];
+            for (let w = 0; w < words; w++) if (bits[w] !== 0) wordIdx.push(w);
+            let count = 0;
+            for (const w of wordIdx) count += popcount32(bits[w]);
+            return {
+                candidate, idx, bits, wordIdx: Uint32Array.from(wordIdx), count, key: 0, fresh: false, used: false,
+                commonalityTerm: weights.commonality * candidate.avgCommonality,
+                richnessTerm: weights.richness * Math.min(candidate.sharedCount / 50, 1),
+                groupSizeTerm: weights.groupSize * Math.min(candidate.memberCount / allUserIds.size, 1),
+                precisionTerm: (weights.precision || 0) * (candidate.precision || 0),
+                bonus: bonuses ? bonuses[idx] : 0
+            };
+        });
+
+        const scoreOf = (entry, newlyCoveredCount) =>
+            weights.coverage * (newlyCoveredCount / uncovered.size) +
+            entry.commonalityTerm +
+            entry.richnessTerm +
+            entry.groupSizeTerm +
+            entry.precisionTerm +
+            entry.bonus;
+
+        // Entries double as heap items: key is the score bound, fresh marks a
+        // score recounted this round
+        let live = pool;
+        const heap = [];
+        let rounds = 0, setDeletes = 0;
+        while (uncovered.size > 0) {
+            const minNew = Math.min(minGroup, uncovered.size);
+            live = live.filter(e => e.count > 0 && !e.used);
+
+            // Cached counts are upper bounds; recount lazily in bound order
+            heap.length = 0;
+            for (const e of live) {
+                if (e.count < minNew) continue;
+                e.key = scoreOf(e, e.count);
+                e.fresh = false;
+                heap.push(e);
+            }
+            for (let i = (heap.length >> 1) - 1; i >= 0; i--) heapSiftDown(heap, i);
+
+            let best = null;
+            let evaluated = 0;
+            while (heap.length > 0) {
+                const e = heapPop(heap);
+                if (e.fresh) {
+                    best = e;
+                    break;
+                }
+                evaluated++;
+                let newlyCoveredCount = 0;
+                for (const w of e.wordIdx) newlyCoveredCount += popcount32(e.bits[w] & uncoveredBits[w]);
+                e.count = newlyCoveredCount;
+                if (newlyCoveredCount < minNew) continue;
+                e.key = scoreOf(e, newlyCoveredCount);
+                e.fresh = true;
+                heapPush(heap, e);
+            }
+
+            rounds++;
+            traceSample('greedy.evaluatedPerRound', evaluated);
+            if (!best) break;
+            const bestCandidate = best.candidate;
+
+            best.used = true;
+
+            // Remove covered users from uncovered set
+            for (const mid of bestCandidate.memberIds) {
+                if (uncovered.delete(mid)) setDeletes++;
+            }
+            for (const w of best.wordIdx) uncoveredBits[w] &= ~best.bits[w];
+
+            solution.push(bestCandidate);
+        }
+
+        traceCount('greedy.rounds', rounds);
+        traceCount('greedy.setDeletes', setDeletes);
+        traceCount('greedy.bitsetWords', pool.reduce((t, e) => t + e.wordIdx.length, 0));
+        return summarizeCover(solution, uncovered, allUserIds);
+    }
+
+    // Solution totals for the roles chosen and the users left uncovered
+    function summarizeCover(solution, uncovered, allUserIds) {
+        const ungroupedUsers = Array.from(uncovered);
+        const totalCovered = allUserIds.size - uncovered.size;
+
+        const avgPrecision = solution.length > 0
+            ? solution.reduce((s, r) => s + (r.precision || 0), 0) / solution.length
+            : 0;
+        const totalOverspill = solution.reduce((s, r) => s + (r.overspill || 0), 0);
+
+        return {
+            roles: solution,
+            ungroupedUsers,
+            totalRoles: solution.length,
+            totalUsersCovered: totalCovered,
+            totalUsers: allUserIds.size,
+            coveragePercent: allUserIds.size > 0 ? totalCovered / allUserIds.size : 0,
+            avgCommonality: solution.length > 0
+                ? solution.reduce((s, r) => s + r.avgCommonality, 0) / solution.length
+                : 0,
+            avgPrecision,
+            totalOverspill,
+            totalSharedEntitlements: solution.reduce((s, r) => s + r.sharedEntitlements.length, 0),
+            strategiesUsed: [...new Set(solution.map(r => r.strategyName))]
+        };
+    }
+
+    // ─── Anytime Set Cover ───────────────────────────────────────────
+    // Improves on the greedy cover of the same users until budgetMs runs
+    // out or the cover is proven optimal, as a weighted set cover in the
+    // variant's own terms. A role's quality is its greedy score without the
+    // coverage term; a role costs the variant's coverage weight, plus, for
+    // each user it covers, how far its quality falls short of the best
+    // candidate's. So a cover pays for every role it adds and for every
+    // user it leaves in a weaker role than necessary, and each variant keeps
+    // its own trade-off. (Counting roles alone collapses every variant to
+    // the few broadest groups.) The greedy cover is the incumbent: a cover
+    // replaces it only if it costs less and has no more roles.
+    //
+    // Subgradient optimization of the Lagrangian relaxation gives a lower
+    // bound on the cost, and its reduced costs drive a repair heuristic.
+    // Once the multipliers settle, the rest of the budget goes to large-
+    // neighbourhood search: drop a few roles, re-cover greedily by cost per
+    // newly covered user, prune redundant roles.
+    const SOLVER_PROGRESS_MS = 250;
+
+    // Small deterministic PRNG, so a run is repeatable given the same budget use
+    function mulberry32(seed) {
+        return () => {
+            seed = (seed + 0x6D2B79F5) | 0;
+            let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+            t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+            return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+        };
+    }
+
+    function improveSetCover(candidates, greedy, allUserIds, weights, bonuses, budgetMs, onProgress) {
+        const started = Date.now();
+        const deadline = started + budgetMs;
+        const ungrouped = new Set(greedy.ungroupedUsers);
+        const userIndex = new Map();
+        for (const id of allUserIds) if (!ungrouped.has(id)) userIndex.set(id, userIndex.size);
+        const m = userIndex.size;
+
+        // Columns: candidates covering any of the m users, as CSR over user indices
+        const colCandidate = [];
+        const colOffsets = [0];
+        const colUsers = intList();
+        const colOf = new Int32Array(candidates.length).fill(-1);
+        candidates.forEach((c, idx) => {
+            const before = colUsers.length;
+            for (const mid of c.memberIds) {
+                const u = userIndex.get(mid);
+                if (u !== undefined) intPush(colUsers, u);
+            }
+            if (colUsers.length === before) return;
+            colOf[idx] = colCandidate.length;
+            colCandidate.push(idx);
+            colOffsets.push(colUsers.length);
+        });
+        const n = colCandidate.length;
+        const colOff = Int32Array.from(colOffsets);
+        const colU = colUsers.data;
+
+        // Rows: columns covering each user
+        const rowOff = new Int32Array(m + 1);
+        for (let k = 0; k < colOff[n]; k++) rowOff[colU[k] + 1]++;
+        for (let u = 0; u < m; u++) rowOff[u + 1] += rowOff[u];
+        const rowJ = new Int32Array(colOff[n]);
+        const fill = rowOff.slice(0, m);
+        for (let j = 0; j < n; j++) {
+            for (let k = colOff[j]; k < colOff[j + 1]; k++) rowJ[fill[colU[k]]++] = j;
+        }
+
+        const quality = new Float64Array(n);
+        for (let j = 0; j < n; j++) {
+            const c = candidates[colCandidate[j]];
+            quality[j] = weights.commonality * c.avgCommonality +
+                weights.richness * Math.min(c.sharedCount / 50, 1) +
+                weights.groupSize * Math.min(c.memberCount / allUserIds.size, 1) +
+                (weights.precision || 0) * (c.precision || 0) +
+                (bonuses ? bonuses[colCandidate[j]] : 0);
+        }
+        const bestQuality = quality.reduce((a, q) => Math.max(a, q), 0);
+        const cost = new Float64Array(n);
+        for (let j = 0; j < n; j++) {
+            cost[j] = weights.coverage + (colOff[j + 1] - colOff[j]) * (bestQuality - quality[j]);
+        }
+        const maxRoles = greedy.roles.length;
+
+        // Working state: chosen flags and per-user cover counts
+        const chosen = new Uint8Array(n);
+        const cov = new Int32Array(m);
+        function add(j) {
+            chosen[j] = 1;
+            for (let k = colOff[j]; k < colOff[j + 1]; k++) cov[colU[k]]++;
+        }
+        function remove(j) {
+            chosen[j] = 0;
+            for (let k = colOff[j]; k < colOff[j + 1]; k++) cov[colU[k]]--;
+        }
+        function load(cols) {
+            chosen.fill(0);
+            cov.fill(0);
+            for (const j of cols) add(j);
+        }
+        // Drop roles whose users are all covered twice, highest rank first
+        function prune(rank) {
+            const cols = [];
+            for (let j = 0; j < n; j++) if (chosen[j]) cols.push(j);
+            cols.sort((a, b) => rank[b] - rank[a] || a - b);
+            for (const j of cols) {
+                let redundant = true;
+                for (let k = colOff[j]; k < colOff[j + 1] && redundant; k++) redundant = cov[colU[k]] >= 2;
+                if (redundant) remove(j);
+            }
+        }
+        // Cover the uncovered users, lowest price per newly covered user first.
+        // Returns false, with the cover left incomplete, at the deadline or
+        // when no column covers a missing user.
+        const mark = new Int32Array(n);
+        let stamp = 0;
+        function repair(price) {
+            stamp++;
+            const pool = [];
+            let missing = 0;
+            for (let u = 0; u < m; u++) {
+                if (cov[u] > 0) continue;
+                missing++;
+                for (let k = rowOff[u]; k < rowOff[u + 1]; k++) {
+                    const j = rowJ[k];
+                    if (mark[j] !== stamp) {
+                        mark[j] = stamp;
+                        pool.push(j);
+                    }
+                }
+            }
+            while (missing > 0) {
+                if (Date.now() >= deadline) return false;
+                let pick = -1, pickRatio = Infinity;
+                for (const j of pool) {
+                    if (chosen[j]) continue;
+                    let fresh = 0;
+                    for (let k = colOff[j]; k < colOff[j + 1]; k++) if (cov[colU[k]] === 0) fresh++;
+                    if (fresh > 0 && price[j] / fresh < pickRatio) {
+                        pick = j;
+                        pickRatio = price[j] / fresh;
+                    }
+                }
+                if (pick === -1) return false;
+                for (let k = colOff[pick]; k < colOff[pick + 1]; k++) if (cov[colU[k]] === 0) missing--;
+                add(pick);
+            }
+            return true;
+        }
+        // A cover is { cols, total }
+        function snapshot() {
+            const cols = [];
+            let total = 0;
+            for (let j = 0; j < n; j++) if (chosen[j]) { cols.push(j); total += cost[j]; }
+            return { cols, total };
+        }
+
+        const candidateIdx = new Map(candidates.map((c, idx) => [c, idx]));
+        load(greedy.roles.map(c => colOf[candidateIdx.get(c)]));
+        const greedyCover = snapshot();
+        prune(cost);
+        let best = snapshot();
+        let lowerBound = 0;
+        let iterations = 0;
+        let lastProgress = started;
+        // The bound ignores the role limit, so it stays a valid lower bound
+        const closed = () => best.total - lowerBound <= 1e-9 * Math.max(1, best.total);
+        const gapOf = () => best.total > 0 ? Math.max(0, best.total - lowerBound) / best.total : 0;
+        const accepts = cover => cover.cols.length <= maxRoles;
+        const report = () => {
+            const now = Date.now();
+            if (!onProgress || now - lastProgress < SOLVER_PROGRESS_MS) return;
+            lastProgress = now;
+            onProgress(Math.min((now - started) / budgetMs, 1),
+                `Improving: ${best.cols.length} roles, cost gap ${(gapOf() * 100).toFixed(1)}%`);
+        };
+
+        // Subgradient optimization of the Lagrangian bound
+        const lambda = new Float64Array(m);
+        for (let u = 0; u < m; u++) {
+            let cheapest = Infinity;
+            for (let k = rowOff[u]; k < rowOff[u + 1]; k++) {
+                const j = rowJ[k];
+                cheapest = Math.min(cheapest, cost[j] / (colOff[j + 1] - colOff[j]));
+            }
+            lambda[u] = cheapest;
+        }
+        const reduced = new Float64Array(n);
+        const g = new Float64Array(m);
+        let step = 2;
+        let stale = 0;
+        while (n > 0 && !closed() && Date.now() < deadline && step > 0.005) {
+            iterations++;
+            traceCount('solver.subgradientIterations');
+            let bound = 0;
+            for (let u = 0; u < m; u++) bound += lambda[u];
+            g.fill(1);
+            for (let j = 0; j < n; j++) {
+                let r = cost[j];
+                for (let k = colOff[j]; k < colOff[j + 1]; k++) r -= lambda[colU[k]];
+                reduced[j] = r;
+                if (r < 0) {
+                    bound += r;
+                    for (let k = colOff[j]; k < colOff[j + 1]; k++) g[colU[k]]--;
+                }
+            }
+            if (bound > lowerBound) {
+                lowerBound = bound;
+                stale = 0;
+            } else if (++stale >= 20) {
+                step /= 2;
+                stale = 0;
+            }
+
+            // Lagrangian heuristic: the relaxed solution, repaired at reduced cost
+            if (iterations % 10 === 1) {
+                chosen.fill(0);
+                cov.fill(0);
+                for (let j = 0; j < n; j++) if (reduced[j] < 0) add(j);
+                if (repair(reduced.map(r => Math.max(r, 1e-9)))) {
+                    prune(cost);
+                    const cover = snapshot();
+                    if (cover.total < best.total && accepts(cover)) best = cover;
+                } else {
+                    load(best.cols);
+                }
+            }
+
+            let norm = 0;
+            for (let u = 0; u < m; u++) norm += g[u] * g[u];
+            if (norm === 0) break;  // the relaxed solution covers every user once: the bound is tight
+            const t = step * (best.total - bound) / norm;
+            for (let u = 0; u < m; u++) lambda[u] = Math.max(0, lambda[u] + t * g[u]);
+            report();
+        }
+
+        // Large-neighbourhood search around the current cover
+        const random = mulberry32(1);
+        let current = best;
+        while (n > 0 && !closed() && Date.now() < deadline) {
+            iterations++;
+            traceCount('solver.searchIterations');
+            load(current.cols);
+            const drop = Math.min(current.cols.length, 2 + Math.floor(random() * 3));
+            for (let d = 0; d < drop; d++) {
+                const live = [];
+                for (let j = 0; j < n; j++) if (chosen[j]) live.push(j);
+                remove(live[Math.floor(random() * live.length)]);
+            }
+            if (!repair(cost)) {
+                load(current.cols);
+                continue;
+            }
+            prune(cost);
+            const cover = snapshot();
+            if (!accepts(cover)) continue;
+            if (cover.total <= current.total) current = cover;
+            if (cover.total < best.total) best = cover;
+            report();
+        }
+
+        let solution = greedy;
+        if (best.total < greedyCover.total - 1e-9 && accepts(best)) {
+            const cols = best.cols.slice().sort((a, b) =>
+                (colOff[b + 1] - colOff[b]) - (colOff[a + 1] - colOff[a]) || colCandidate[a] - colCandidate[b]);
+            solution = summarizeCover(cols.map(j => candidates[colCandidate[j]]), ungrouped, allUserIds);
+        }
+        solution.solver = {
+            budgetMs,
+            elapsedMs: Date.now() - started,
+            iterations,
+            roles: solution.roles.length,
+            greedyRoles: greedy.roles.length,
+            greedyCost: greedyCover.total,
+            cost: best.total,
+            lowerBound: Math.min(lowerBound, best.total),
+            gap: gapOf(),
+            optimal: closed()
+        };
+        return solution;
+    }
+
+    // ─── Solution Scoring ────────────────────────────────────────────
+    function scoreSolution(solution) {
+        const normalizedRoleCount = solution.totalUsers > 0 ? solution.totalRoles / solution.totalUsers : 1;
+        return (
+            solution.coveragePercent * 30 +
+            (1 - Math.min(normalizedRoleCount, 1)) * 25 +
+            solution.avgCommonality * 15 +
+            (solution.avgPrecision || 0) * 20 +
+            Math.min(solution.totalSharedEntitlements / (Math.max(solution.totalRoles, 1) * 40), 1) * 10
+        );
+    }
+
+    // ─── Phase 2+3: Solve one variant ────────────────────────────────
+    function variantMinGroup(config, minGroup) {
+        return Math.max(2, minGroup + config.minGroupAdjust);
+    }
+
+    // Smallest group any variant keeps: Phase 1 can prune everything below it
+    function phase1MinGroup(minGroup) {
+        return Math.min(...variantConfigs.map(c => variantMinGroup(c, minGroup)));
+    }
+
+    // task.solverBudgetMs > 0 spends up to that long improving the greedy
+    // cover (see improveSetCover); the result then carries a solver report
+    function runVariant(task, onProgress) {
+        const { raw, targets, threshold, minGroup, variantIndex, solverBudgetMs = 0 } = task;
+        const config = variantConfigs[variantIndex];
+        const adjThreshold = Math.max(0.50, Math.min(1.0, threshold + config.thresholdAdjust));
+        const adjMinGroup = variantMinGroup(config, minGroup);
+
+        // Candidates are shared with every variant at the same threshold and minimum group size
+        if (onProgress) onProgress(0, 'Filtering candidates');
+        let span = startSpan('variant.filter');
+        const candidates = candidateIndexFor(task).candidates(adjThreshold, adjMinGroup);
+        traceCount('variant.candidates', candidates.length);
+        endSpan(span, { threshold: adjThreshold, minGroup: adjMinGroup, candidates: candidates.length });
+
+        // Granularity/simplicity bonuses
+        const bonuses = new Float64Array(candidates.length);
+        candidates.forEach((c, i) => {
+            if (config.preferGranular) {
+                bonuses[i] = c.attrCount * 0.10;
+            } else if (config.preferSimple) {
+                bonuses[i] = (1 / c.attrCount) * 0.15;
+            }
+        });
+
+        if (onProgress) onProgress(0.5, 'Selecting roles');
+        const allUserIds = new Set(targets.ids.keys());
+        span = startSpan('variant.greedy');
+        let solution = greedySetCover(candidates, allUserIds, config.weights, adjMinGroup, bonuses);
+        endSpan(span, { roles: solution.roles.length });
+        if (solverBudgetMs > 0) {
+            span = startSpan('variant.improve');
+            solution = improveSetCover(candidates, solution, allUserIds, config.weights, bonuses, solverBudgetMs,
+                onProgress && ((fraction, text) => onProgress(0.5 + fraction * 0.5, text)));
+            endSpan(span, { roles: solution.roles.length, gap: solution.solver.gap });
+        }
+
+        // Back from user indices to Employee IDs, on copies of the shared candidates
+        solution.roles = solution.roles.map(role => ({
+            ...role,
+            memberIds: Array.from(role.memberIds, u => targets.ids[u])
+        }));
+        solution.ungroupedUsers = solution.ungroupedUsers.map(u => targets.ids[u]);
+
+        solution.optionIndex = variantIndex + 1;
+        solution.optionName = config.name;
+        solution.optionDescription = config.description;
+        solution.weights = config.weights;
+        solution.compositeScore = scoreSolution(solution);
+        if (onProgress) onProgress(1, 'Done');
+        return solution;
+    }
+
+    // ─── Export Documents ────────────────────────────────────────────
+    // The JSON and JSON Lines option exports, shared by the app's downloads
+    // and engine-cli.js. Outliers come from the Phase 1 result the solution
+    // was solved against (see roleOutliers). The generators yield a role at
+    // a time, so callers can write each part out and yield between them.
+    function exportBaseName(sol) {
+        return `rbac_option${sol.optionIndex}_${sol.optionName.replace(/[^a-zA-Z0-9]/g, '_')}`;
+    }
+
+    function exportSummary(sol) {
+        return {
+            totalRoles: sol.totalRoles,
+            totalUsersCovered: sol.totalUsersCovered,
+            totalUsers: sol.totalUsers,
+            coveragePercent: Math.round(sol.coveragePercent * 100),
+            avgCommonality: Math.round(sol.avgCommonality * 100),
+            avgPrecision: Math.round((sol.avgPrecision || 0) * 100),
+            totalOverspill: sol.totalOverspill || 0,
+            strategiesUsed: sol.strategiesUsed
+        };
+    }
+
+    function exportRole(role, phase1) {
+        const { outlierEntitlements, userOutliers } = roleOutliers(phase1, role.groupIndex);
+        return {
+            roleName: role.roleName,
+            strategy: role.strategyName,
+            criteria: role.criteria,
+            memberCount: role.memberCount,
+            orgTotalMatch: role.orgTotal || role.memberCount,
+            overspill: role.overspill || 0,
+            precision: Math.round((role.precision || 1) * 100),
+            members: Array.from(role.memberIds),
+            avgCommonality: Math.round(role.avgCommonality * 100),
+            sharedEntitlements: role.sharedEntitlements,
+            outlierEntitlements,
+            userOutliers
+        };
+    }
+
+    // Same text as JSON.stringify(exportDocument, null, 2)
+    function* optionJsonParts(sol, phase1) {
+        const head = JSON.stringify({
+            option: sol.optionIndex,
+            name: sol.optionName,
+            description: sol.optionDescription,
+            summary: exportSummary(sol)
+        }, null, 2);
+        yield head.slice(0, -2) + ',\n  "roles": [';
+        for (let r = 0; r < sol.roles.length; r++) {
+            yield (r > 0 ? ',\n    ' : '\n    ') +
+                JSON.stringify(exportRole(sol.roles[r], phase1), null, 2).replace(/\n/g, '\n    ');
+        }
+        yield (sol.roles.length > 0 ? '\n  ],' : '],') +
+            '\n  "ungroupedUsers": ' + JSON.stringify(sol.ungroupedUsers, null, 2).replace(/\n/g, '\n  ') + '\n}';
+    }
+
+    // JSON Lines for provisioning tools: an "option" record, then one
+    // "role" record per role, then an "ungrouped" record. Field names
+    // follow the JSON export.
+    function* optionJsonlParts(sol, phase1) {
+        yield JSON.stringify({
+            type: 'option',
+            option: sol.optionIndex,
+            name: sol.optionName,
+            description: sol.optionDescription,
+            summary: exportSummary(sol)
+        }) + '\n';
+        for (const role of sol.roles) {
+            yield JSON.stringify({ type: 'role', option: sol.optionIndex, ...exportRole(role, phase1) }) + '\n';
+        }
+        yield JSON.stringify({ type: 'ungrouped', option: sol.optionIndex, users: sol.ungroupedUsers }) + '\n';
+    }
+
+    const RoleEngine = {
+        strategies,
+        strategyColumns,
+        latticeAttributes,
+        latticeStrategies,
+        candidateStrategies,
+        variantConfigs,
+        createOrgColumnsBuilder,
+        encodeOrgColumns,
+        createEntitlementIndexBuilder,
+        buildEntitlementIndex,
+        encodeTargets,
+        transferables,
+        cloneTyped,
+        buildOrgGroupIndex,
+        isOrgGroupIndexCurrent,
+        runPhase1,
+        createCandidateIndex,
+        filterCandidatesForThreshold,
+        beginTrace,
+        endTrace,
+        startSpan,
+        endSpan,
+        traceCount,
+        roleOutliers,
+        exportBaseName,
+        exportSummary,
+        exportRole,
+        optionJsonParts,
+        optionJsonlParts,
+        greedySetCover,
+        improveSetCover,
+        scoreSolution,
+        phase1MinGroup,
+        runVariant
+    };
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = RoleEngine;
+    } else {
+        root.RoleEngine = RoleEngine;
+    }
+})(typeof self !== 'undefined' ? self : this);
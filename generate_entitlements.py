@@ -0,0 +1,263 @@
+"""
+Synthesize entitlements.csv (the user → entitlement extract app.js loads) for an HR master.
+
+- Entitlement catalog derived from ORG_STRUCTURE: enterprise-wide apps, plus
+  per Business Line, Division (SNODE L3), Department (L4), Team (L5),
+  Job Family, Cost Center and Job Grade bundles
+- Each employee receives the bundles matching their HR attributes, every
+  entitlement granted with a per-level probability (so commonality < 100%)
+- Poisson noise: a few random entitlements per employee from the whole catalog
+- Vectorized with NumPy and processed in chunks of employees, so 1M employees
+  (~100M assignment rows) stream out in minutes with bounded memory
+- Randomness is drawn per fixed-size block of employees, keyed on (seed,
+  block), so the output depends only on the HR master, seed and noise, never
+  on --chunk-size
+
+Usage: python generate_entitlements.py [--hr PATH] [--out PATH] [--seed S] [--noise MEAN]
+"""
+import argparse
+import csv
+import io
+import os
+import time
+
+import numpy as np
+
+from regenerate_hr_data import BLOCK_SIZE, DEFAULT_SEED, GRADES, ORG_STRUCTURE, flatten_org_paths
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_HR_PATH = os.path.join(DATA_DIR, "commercial_bank_hr_data.csv")
+DEFAULT_OUT_PATH = os.path.join(DATA_DIR, "entitlements.csv")
+
+# Column order of the entitlement extract (matches loadEntitlementData in app.js)
+COLUMNS = ["Employee ID", "Entitlement ID", "Application", "Application ID",
+           "Application Business Unit", "Entitlement Name"]
+
+ENTERPRISE_BU = "Enterprise Technology"
+
+# Apps every employee gets regardless of org position
+ENTERPRISE_APPS = ["Microsoft 365", "ServiceNow", "Workday", "Cisco AnyConnect VPN",
+                   "Okta SSO", "Concur Expenses", "Confluence", "Bloomberg Terminal"]
+
+# Actions that make up entitlement names: "<resource> - <action>"
+ACTIONS = ["Read", "Write", "Approve", "Submit", "Review", "Export", "Admin", "Reconcile",
+           "Report", "Configure", "Upload", "Download", "Amend", "Cancel", "Authorize",
+           "Release", "Query", "Maintain", "Audit", "Override"]
+
+# Bundle levels: (HR column, application name pattern, bundle size range, grant probability)
+LEVELS = [
+    ("Business Line", "{} Portal", (10, 16), 0.95),
+    ("SNODE L3", "{} Workbench", (10, 16), 0.90),
+    ("SNODE L4", "{} System", (10, 16), 0.85),
+    ("SNODE L5", "{} Workspace", (10, 16), 0.80),
+    ("Job Family", "{} Toolkit", (8, 14), 0.85),
+    ("Cost Center Name", "{} Ledger", (5, 9), 0.80),
+    ("Job Grade / Band", "{} Approvals", (3, 7), 0.90),
+]
+ENTERPRISE_BUNDLE = ((2, 4), 0.97)
+
+DEFAULT_NOISE = 3.0
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+# ─── Catalog ───
+
+def org_level_values():
+    """Map each bundle level's HR column to {value: owning business line}."""
+    owners = {column: {} for column, _, _, _ in LEVELS}
+    for bl_name, bl_data in ORG_STRUCTURE.items():
+        owners["Business Line"].setdefault(bl_name, bl_name)
+        for division, department, team, _ in flatten_org_paths(bl_name, bl_data["divisions"]):
+            owners["SNODE L3"].setdefault(division, bl_name)
+            owners["SNODE L4"].setdefault(department, bl_name)
+            owners["SNODE L5"].setdefault(team, bl_name)
+        for jf in bl_data["job_families"]:
+            owners["Job Family"].setdefault(jf, bl_name)
+        for _, cc_name in bl_data["cost_centers"]:
+            owners["Cost Center Name"].setdefault(cc_name, bl_name)
+    for grade in GRADES:
+        owners["Job Grade / Band"][grade] = ENTERPRISE_BU
+    return owners
+
+
+def build_catalog(seed=DEFAULT_SEED):
+    """Build the entitlement catalog and per-level bundles.
+
+    Returns (entitlements, bundles): entitlements is a list of
+    (entitlement_id, application, application_id, business_unit, name) tuples
+    indexed by entitlement number; bundles is a list of dicts with the HR
+    column, grant probability, a value → bundle code lookup and the bundles in
+    CSR form (offsets into ent_ids).
+    """
+    rng = np.random.default_rng([seed, 0])
+    entitlements = []
+    app_ids = {}
+
+    def add_bundle(resource, app, bu, size_range):
+        app_id = app_ids.setdefault(app, f"APP{len(app_ids) + 1:04d}")
+        k = int(rng.integers(size_range[0], size_range[1] + 1))
+        ids = []
+        for action_idx in np.sort(rng.choice(len(ACTIONS), size=min(k, len(ACTIONS)), replace=False)):
+            ids.append(len(entitlements))
+            entitlements.append((f"ENT{len(entitlements) + 1:06d}", app, app_id, bu,
+                                 f"{resource} - {ACTIONS[action_idx]}"))
+        return ids
+
+    def pack(column, prob, lookup, id_lists):
+        sizes = np.array([len(ids) for ids in id_lists], dtype=np.int64)
+        offsets = np.zeros(len(id_lists) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        ent_ids = np.array([e for ids in id_lists for e in ids], dtype=np.int64)
+        return {"column": column, "prob": prob, "lookup": lookup,
+                "sizes": sizes, "offsets": offsets, "ent_ids": ent_ids}
+
+    bundles = []
+    size_range, prob = ENTERPRISE_BUNDLE
+    bundles.append(pack(None, prob, {None: 0},
+                        [[e for app in ENTERPRISE_APPS for e in add_bundle(app, app, ENTERPRISE_BU, size_range)]]))
+
+    owners = org_level_values()
+    for column, app_pattern, size_range, prob in LEVELS:
+        lookup = {}
+        id_lists = []
+        for value, bu in owners[column].items():
+            lookup[value] = len(id_lists)
+            id_lists.append(add_bundle(value, app_pattern.format(value), bu, size_range))
+        bundles.append(pack(column, prob, lookup, id_lists))
+
+    return entitlements, bundles
+
+
+def encode_entitlement_suffixes(entitlements):
+    """Pre-encode ',<entitlement columns>\\r\\n' per entitlement so rows are written by concatenation."""
+    suffixes = np.empty(len(entitlements), dtype=object)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for i, ent in enumerate(entitlements):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(ent)
+        suffixes[i] = ("," + buf.getvalue()).encode("utf-8")
+    return suffixes
+
+
+# ─── Assignment ───
+
+def expand_bundles(codes, bundle):
+    """Vectorized CSR expansion: (employee row, entitlement) pairs for every bundle member."""
+    emp = np.nonzero(codes >= 0)[0]
+    c = codes[emp]
+    counts = bundle["sizes"][c]
+    rows = np.repeat(emp, counts)
+    run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    pos = np.repeat(bundle["offsets"][c], counts) + (np.arange(rows.size) - run_starts)
+    return rows, bundle["ent_ids"][pos]
+
+
+def assign_chunk(hr_columns, m, bundles, n_ents, rng, noise=DEFAULT_NOISE):
+    """Draw assignments for m employees; returns (employee rows, entitlement numbers) sorted and deduplicated."""
+    parts = []
+    for bundle in bundles:
+        if bundle["column"] is None:
+            codes = np.zeros(m, dtype=np.int64)
+        else:
+            lookup = bundle["lookup"]
+            codes = np.fromiter((lookup.get(v, -1) for v in hr_columns[bundle["column"]]),
+                                dtype=np.int64, count=m)
+        rows, ents = expand_bundles(codes, bundle)
+        keep = rng.random(rows.size) < bundle["prob"]
+        parts.append(rows[keep] * n_ents + ents[keep])
+
+    if noise > 0:
+        counts = rng.poisson(noise, m)
+        rows = np.repeat(np.arange(m, dtype=np.int64), counts)
+        parts.append(rows * n_ents + rng.integers(0, n_ents, rows.size))
+
+    keys = np.concatenate(parts)
+    keys.sort()
+    if keys.size:
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys // n_ents, keys % n_ents
+
+
+def iter_hr_chunks(hr_path, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the HR master, yielding (employee IDs, {column: values}) per chunk.
+
+    chunk_size is rounded up to whole BLOCK_SIZE blocks, so every chunk but
+    the last starts and ends on a block boundary.
+    """
+    chunk_size = max(1, -(-chunk_size // BLOCK_SIZE)) * BLOCK_SIZE
+    with open(hr_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        id_idx = header.index("Employee ID")
+        col_idx = {c: header.index(c) for c in columns}
+        ids = []
+        values = {c: [] for c in columns}
+        for row in reader:
+            if not row:
+                continue
+            ids.append(row[id_idx])
+            for c, idx in col_idx.items():
+                values[c].append(row[idx])
+            if len(ids) >= chunk_size:
+                yield ids, values
+                ids = []
+                values = {c: [] for c in columns}
+        if ids:
+            yield ids, values
+
+
+def write_entitlements(hr_path, out_path, seed=DEFAULT_SEED, noise=DEFAULT_NOISE,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+    """Synthesize and write the extract. Returns (employees, assignment rows, catalog size)."""
+    entitlements, bundles = build_catalog(seed)
+    suffixes = encode_entitlement_suffixes(entitlements)
+    n_ents = len(entitlements)
+    columns = [b["column"] for b in bundles if b["column"] is not None]
+
+    employees = 0
+    rows_written = 0
+    with open(out_path, 'wb') as out:
+        out.write((",".join(COLUMNS) + "\r\n").encode("utf-8"))
+        for ids, values in iter_hr_chunks(hr_path, columns, chunk_size):
+            prefixes = np.array([eid.encode("utf-8") for eid in ids], dtype=object)
+            # One generator per block of employees, keyed on its absolute position
+            for lo in range(0, len(ids), BLOCK_SIZE):
+                hi = min(len(ids), lo + BLOCK_SIZE)
+                rng = np.random.default_rng([seed, 1, (employees + lo) // BLOCK_SIZE])
+                block_values = {c: v[lo:hi] for c, v in values.items()}
+                emp_rows, ents = assign_chunk(block_values, hi - lo, bundles, n_ents, rng, noise)
+                out.write(b"".join((prefixes[lo + emp_rows] + suffixes[ents]).tolist()))
+                rows_written += emp_rows.size
+            employees += len(ids)
+    return employees, rows_written, n_ents
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Synthesize the entitlement extract for an HR master.")
+    parser.add_argument("--hr", default=DEFAULT_HR_PATH, help="input HR master CSV (default: data/commercial_bank_hr_data.csv)")
+    parser.add_argument("--out", default=DEFAULT_OUT_PATH, help="output CSV path (default: data/entitlements.csv)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--noise", type=float, default=DEFAULT_NOISE,
+                        help=f"mean random off-role entitlements per employee (default: {DEFAULT_NOISE})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"employees read per chunk, rounded up to whole blocks of {BLOCK_SIZE} "
+                             f"(default: {DEFAULT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Synthesizing entitlements for {args.hr}...")
+    t0 = time.perf_counter()
+    employees, rows, n_ents = write_entitlements(args.hr, args.out, args.seed, args.noise, args.chunk_size)
+    elapsed = time.perf_counter() - t0
+    print(f"Written {rows} assignments for {employees} employees to {args.out}")
+    print(f"Catalog: {n_ents} entitlements")
+    print(f"Avg entitlements per employee: {rows / max(employees, 1):.1f}")
+    print(f"Elapsed: {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
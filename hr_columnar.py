@@ -0,0 +1,149 @@
+"""
+Dictionary-encoded columnar HR master (.hrcol), and a memory-mapped reader.
+
+Layout (little-endian):
+- 8-byte magic, then the uint64 length of a UTF-8 JSON metadata block
+- metadata: row count plus, per column, its kind, dtype, byte offset and
+  (for "dict" columns) the string dictionary its codes index into
+- one contiguous code array per column, each aligned to 64 bytes (column
+  offsets are relative to the first 64-byte boundary after the metadata)
+
+Column kinds:
+- "dict": codes into the column's dictionary (uint8/uint16/uint32 by size)
+- "int": the integer value itself (Job Code)
+- "employee_id": letter index × 900000 + number - 100000, as in regenerate_hr_data
+
+Usage:
+    with HRColumnar("data/commercial_bank_hr_data.hrcol") as hr:
+        bl = hr.codes("Business Line")          # zero-copy numpy view of the file
+        counts = hr.value_counts("Business Line")
+"""
+import json
+import mmap
+
+import numpy as np
+
+MAGIC = b"HRCOL\x00\x01\x00"
+ALIGN = 64
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def code_dtype(dictionary_size):
+    """Smallest unsigned dtype that can index a dictionary of this size."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if dictionary_size <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def create(path, rows, schema):
+    """Write the header of an .hrcol file for a known row count and preallocate its columns.
+
+    schema is a list of column dicts with "name", "kind" and, for "dict"
+    columns, "dictionary"; "employee_id" columns also carry "letters".
+    Returns the columns with dtype and absolute offset, for write_block.
+    """
+    columns = []
+    size = 0  # column offsets are relative to the first aligned byte after the metadata
+    for col in schema:
+        dtype = code_dtype(len(col["dictionary"])) if col["kind"] == "dict" else np.dtype(np.uint32)
+        columns.append(dict(col, dtype=dtype.str, offset=size))
+        size = _aligned(size + rows * dtype.itemsize)
+    meta = json.dumps({"rows": rows, "columns": columns}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(meta))
+    with open(path, "wb") as f:
+        f.write(MAGIC + len(meta).to_bytes(8, "little") + meta)
+        f.truncate(data_start + size)
+    return [dict(col, offset=data_start + col["offset"]) for col in columns]
+
+
+def write_block(path, columns, start, codes):
+    """Write rows start.. of every column in place; codes holds one array per column.
+
+    Blocks land at fixed offsets, so they can be written in any order and
+    from any process.
+    """
+    with open(path, "r+b") as f:
+        for col, values in zip(columns, codes):
+            dtype = np.dtype(col["dtype"])
+            f.seek(col["offset"] + start * dtype.itemsize)
+            f.write(np.asarray(values, dtype=dtype).tobytes())
+
+
+class HRColumnar:
+    """Read-only, memory-mapped view of an .hrcol file.
+
+    codes(name) returns a numpy array backed directly by the mapping, so
+    opening a file and aggregating a column never copies or parses it;
+    such views must be released before close().
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an .hrcol file")
+        meta_len = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], "little")
+        meta = json.loads(self._mmap[len(MAGIC) + 8:len(MAGIC) + 8 + meta_len].decode("utf-8"))
+        data_start = _aligned(len(MAGIC) + 8 + meta_len)
+        self.rows = meta["rows"]
+        self._columns = {col["name"]: dict(col, offset=data_start + col["offset"]) for col in meta["columns"]}
+        self.columns = [col["name"] for col in meta["columns"]]
+        self._decoded = {}
+
+    def kind(self, name):
+        return self._columns[name]["kind"]
+
+    def dictionary(self, name):
+        """The column's string dictionary (codes index into it); None for non-dict columns."""
+        return self._columns[name].get("dictionary")
+
+    def codes(self, name):
+        """Zero-copy array of the column's codes (or integer values)."""
+        col = self._columns[name]
+        return np.frombuffer(self._mmap, dtype=np.dtype(col["dtype"]), count=self.rows, offset=col["offset"])
+
+    def values(self, name, rows=slice(None)):
+        """Decode a column (or a slice/index array of it) to an object array of strings."""
+        col = self._columns[name]
+        codes = self.codes(name)[rows]
+        if col["kind"] == "dict":
+            if name not in self._decoded:
+                self._decoded[name] = np.array(col["dictionary"], dtype=object)
+            return self._decoded[name][codes]
+        if col["kind"] == "employee_id":
+            letters = col["letters"]
+            return np.array([f"{letters[c // 900000]}{100000 + c % 900000}" for c in codes.tolist()], dtype=object)
+        return codes.astype(str).astype(object)
+
+    def value_counts(self, name):
+        """{value: count} for a dict column, via bincount over the codes."""
+        dictionary = self.dictionary(name)
+        counts = np.bincount(self.codes(name), minlength=len(dictionary))
+        return {dictionary[k]: int(counts[k]) for k in np.nonzero(counts)[0].tolist()}
+
+    def row(self, i):
+        """Row i as a {column: string} dict, like a csv.DictReader row."""
+        return {name: str(self.values(name, [i])[0]) for name in self.columns}
+
+    def close(self):
+        """Unmap and close the file.
+
+        Arrays returned by codes() (and slices of them) are views of the
+        mapping: release them, or copy what must outlive the reader, before
+        closing. While one is alive this raises BufferError and leaves the
+        reader open.
+        """
+        self._decoded.clear()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
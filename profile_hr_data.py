@@ -0,0 +1,327 @@
+"""
+Profile an HR master against the grouping strategies in engine.js, to size a
+role-mining run before starting it: the standard 13, or with --candidate-mode
+lattice-<k> every combination of up to k lattice attributes, as the engine's
+#candidate-mode enumerates them.
+
+Per strategy:
+- distinct groups and the group-size histogram (power-of-two buckets)
+- for each target list size: the expected number of Phase 1 candidates (groups
+  with at least 2 target members), of candidates that pass the minimum group
+  size, and of candidate member slots (the greedy set cover scans these)
+
+Expectations assume the target list is a uniform sample of the org, so a
+group of s employees contributes hypergeometric(N, s, t) target members.
+
+Streams the CSV row by row with one counter per strategy, so memory follows
+the number of groups rather than employees. A strategy with more than
+--max-exact-groups distinct groups falls back to a HyperLogLog estimate of
+its group count (no histogram or expectations). An .hrcol file is profiled
+from its code arrays instead.
+
+The strategy lists mirror engine.js; tests/test_profile_strategies.py checks
+them against RoleEngine.candidateStrategies.
+
+Usage: python profile_hr_data.py [--hr PATH] [--out PATH] [--target-sizes T ...] [--min-group M]
+                                 [--candidate-mode MODE]
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_HR_PATH = os.path.join(DATA_DIR, "commercial_bank_hr_data.csv")
+
+# Mirrors `strategies` in engine.js: (name, HR columns joined into the group key)
+STRATEGIES = [
+    # Single-attribute
+    ("Business Line", ["Business Line"]),
+    ("Job Family", ["Job Family"]),
+    ("Cost Center", ["Cost Center Name"]),
+    ("Region", ["Region"]),
+    # Two-attribute
+    ("Business Line + Job Family", ["Business Line", "Job Family"]),
+    ("Business Line + Job Grade", ["Business Line", "Job Grade / Band"]),
+    ("Business Line + Region", ["Business Line", "Region"]),
+    ("Job Family + Job Grade", ["Job Family", "Job Grade / Band"]),
+    ("SNODE L3 + L4", ["SNODE L3", "SNODE L4"]),
+    ("Cost Center + Job Family", ["Cost Center Name", "Job Family"]),
+    # Three-attribute
+    ("SNODE L3 + L4 + L5", ["SNODE L3", "SNODE L4", "SNODE L5"]),
+    ("Region + Job Family + Job Grade", ["Region", "Job Family", "Job Grade / Band"]),
+    ("Business Line + Job Family + Job Grade", ["Business Line", "Job Family", "Job Grade / Band"]),
+]
+
+# Mirrors `latticeAttributes` in engine.js: (label, HR column)
+LATTICE_ATTRIBUTES = [
+    ("Business Line", "Business Line"),
+    ("Job Family", "Job Family"),
+    ("Job Code", "Job Code"),
+    ("Job Grade", "Job Grade / Band"),
+    ("Cost Center", "Cost Center Name"),
+    ("Legal Entity", "Legal Entity"),
+    ("Region", "Region"),
+    ("Country", "Country"),
+    ("SNODE L3", "SNODE L3"),
+    ("SNODE L4", "SNODE L4"),
+    ("SNODE L5", "SNODE L5"),
+]
+
+DEFAULT_CANDIDATE_MODE = "standard"
+DEFAULT_TARGET_SIZES = [50, 1000, 10000]
+DEFAULT_MIN_GROUP = 2
+DEFAULT_MAX_EXACT_GROUPS = 1_000_000
+HLL_PRECISION = 14
+
+
+def lattice_strategies(max_attrs, attributes=LATTICE_ATTRIBUTES):
+    """Every combination of up to max_attrs attributes, in engine.js latticeStrategies order."""
+    return [(" + ".join(label for label, _ in combo), [column for _, column in combo])
+            for size in range(1, min(max_attrs, len(attributes)) + 1)
+            for combo in itertools.combinations(attributes, size)]
+
+
+def candidate_strategies(mode=DEFAULT_CANDIDATE_MODE):
+    """The strategies for a #candidate-mode value: STRATEGIES, or lattice_strategies(k) for 'lattice-k'."""
+    if mode == "standard":
+        return STRATEGIES
+    lattice = re.fullmatch(r"lattice-(\d+)", mode)
+    if lattice is None:
+        raise ValueError(f"candidate mode must be standard or lattice-<k>, not {mode!r}")
+    return lattice_strategies(int(lattice.group(1)))
+
+
+# ─── Sketches ───
+
+class HyperLogLog:
+    """Distinct-count sketch: 2**precision one-byte registers, ~1.04 / sqrt(2**precision) relative error."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, key):
+        h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+        idx = h & (self.m - 1)
+        rest = h >> self.p
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)  # linear counting for small cardinalities
+        return raw
+
+
+class GroupCounter:
+    """Exact group sizes for one strategy, switching to a HyperLogLog past max_groups."""
+
+    def __init__(self, max_groups=DEFAULT_MAX_EXACT_GROUPS):
+        self.max_groups = max_groups
+        self.counts = Counter()
+        self.sketch = None
+
+    def add(self, key):
+        if self.sketch is not None:
+            self.sketch.add(key)
+            return
+        self.counts[key] += 1
+        if len(self.counts) > self.max_groups:
+            self.sketch = HyperLogLog()
+            for seen in self.counts:
+                self.sketch.add(seen)
+            self.counts = None
+
+    def size_counts(self):
+        """{group size: number of groups}; None once sketched."""
+        return None if self.counts is None else Counter(self.counts.values())
+
+
+# ─── Expectations ───
+
+def _log_comb(n, k):
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def hypergeom_small_pmf(population, group, sample, upto):
+    """P(X = j) for j in 0..upto-1, X ~ hypergeometric(population, group, sample)."""
+    total = _log_comb(population, sample)
+    return [math.exp(_log_comb(group, j) + _log_comb(population - group, sample - j) - total)
+            if j <= group and sample - j <= population - group else 0.0
+            for j in range(upto)]
+
+
+def expected_candidates(size_counts, population, target_size, min_group):
+    """Expected (candidates, candidates of >= min_group, member slots) for a uniform target sample."""
+    t = min(target_size, population)
+    upto = max(2, min_group)
+    candidates = passing = slots = 0.0
+    for size, groups in size_counts.items():
+        pmf = hypergeom_small_pmf(population, size, t, upto)
+        mean = t * size / population
+        candidates += groups * (1 - pmf[0] - pmf[1])
+        passing += groups * (1 - sum(pmf[:upto]))
+        slots += groups * (mean - pmf[1])
+    return candidates, passing, slots
+
+
+def size_histogram(size_counts):
+    """{"1": groups, "2-3": groups, "4-7": groups, ...} over power-of-two size buckets."""
+    buckets = Counter()
+    for size, groups in size_counts.items():
+        buckets[size.bit_length() - 1] += groups
+    return {(f"{1 << b}" if b == 0 else f"{1 << b}-{(2 << b) - 1}"): buckets[b] for b in sorted(buckets)}
+
+
+# ─── Scanning ───
+
+def scan_csv(hr_path, max_groups=DEFAULT_MAX_EXACT_GROUPS, strategies=STRATEGIES):
+    """Stream the HR master; returns (employees, {strategy: GroupCounter})."""
+    counters = {name: GroupCounter(max_groups) for name, _ in strategies}
+    employees = 0
+    with open(hr_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        key_idx = [(counters[name], [header.index(c) for c in columns]) for name, columns in strategies]
+        for row in reader:
+            if not row:
+                continue
+            employees += 1
+            for counter, idx in key_idx:
+                counter.add("|".join([row[i] for i in idx]))
+    return employees, counters
+
+
+def scan_hrcol(hr_path, strategies=STRATEGIES):
+    """Group sizes straight from an .hrcol file's code arrays; returns (employees, {strategy: size Counter})."""
+    import numpy as np
+    from hr_columnar import HRColumnar
+
+    sizes = {}
+    with HRColumnar(hr_path) as hr:
+        # Dense codes per column: dictionary codes, or ranks of the values (Job Code)
+        dense = {}
+        for c in dict.fromkeys(c for _, columns in strategies for c in columns):
+            if hr.kind(c) == "dict":
+                dense[c] = (hr.codes(c).astype(np.int64), len(hr.dictionary(c)))
+            else:
+                values, inverse = np.unique(hr.codes(c), return_inverse=True)
+                dense[c] = (inverse.astype(np.int64), len(values))
+        for name, columns in strategies:
+            key = np.zeros(hr.rows, dtype=np.int64)
+            span = 1
+            for c in columns:
+                codes, size = dense[c]
+                if span * size >= 1 << 62:  # re-densify before the mixed-radix key overflows
+                    _, key = np.unique(key, return_inverse=True)
+                    span = int(key.max()) + 1 if hr.rows else 1
+                key = key * size + codes
+                span *= size
+            _, counts = np.unique(key, return_counts=True)
+            group_sizes, groups = np.unique(counts, return_counts=True)
+            sizes[name] = Counter(dict(zip(group_sizes.tolist(), groups.tolist())))
+        employees = hr.rows
+    return employees, sizes
+
+
+def profile(hr_path, target_sizes=DEFAULT_TARGET_SIZES, min_group=DEFAULT_MIN_GROUP,
+            max_groups=DEFAULT_MAX_EXACT_GROUPS, candidate_mode=DEFAULT_CANDIDATE_MODE):
+    """Build the JSON-ready profile report for an HR master (CSV or .hrcol)."""
+    t0 = time.perf_counter()
+    strategy_list = candidate_strategies(candidate_mode)
+    if hr_path.endswith(".hrcol"):
+        employees, size_counts = scan_hrcol(hr_path, strategy_list)
+        sketches = {}
+    else:
+        employees, counters = scan_csv(hr_path, max_groups, strategy_list)
+        size_counts = {name: c.size_counts() for name, c in counters.items()}
+        sketches = {name: c.sketch for name, c in counters.items() if c.sketch is not None}
+
+    strategies = []
+    totals = {t: {"expected_candidates": 0.0, "expected_candidates_min_group": 0.0,
+                  "expected_member_slots": 0.0} for t in target_sizes}
+    for name, columns in strategy_list:
+        entry = {"name": name, "attr_count": len(columns), "columns": columns}
+        sizes = size_counts[name]
+        if sizes is None:
+            entry.update(exact=False, distinct_groups=round(sketches[name].estimate()))
+            strategies.append(entry)
+            continue
+        entry.update(exact=True,
+                     distinct_groups=sum(sizes.values()),
+                     largest_group=max(sizes, default=0),
+                     singleton_groups=sizes.get(1, 0),
+                     group_size_histogram=size_histogram(sizes),
+                     targets=[])
+        for t in target_sizes:
+            candidates, passing, slots = expected_candidates(sizes, employees, t, min_group) if employees else (0, 0, 0)
+            entry["targets"].append({"target_size": t,
+                                     "expected_candidates": round(candidates, 1),
+                                     "expected_candidates_min_group": round(passing, 1),
+                                     "expected_member_slots": round(slots, 1)})
+            totals[t]["expected_candidates"] += candidates
+            totals[t]["expected_candidates_min_group"] += passing
+            totals[t]["expected_member_slots"] += slots
+        strategies.append(entry)
+
+    return {
+        "source": os.path.abspath(hr_path),
+        "employees": employees,
+        "min_group": min_group,
+        "candidate_mode": candidate_mode,
+        "strategies": strategies,
+        "totals": [{"target_size": t, **{k: round(v, 1) for k, v in totals[t].items()}} for t in target_sizes],
+        "elapsed_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile an HR master against the engine.js grouping strategies.")
+    parser.add_argument("--hr", default=DEFAULT_HR_PATH,
+                        help="HR master CSV or .hrcol file (default: data/commercial_bank_hr_data.csv)")
+    parser.add_argument("--out", default=None, help="JSON report path (default: stdout)")
+    parser.add_argument("--target-sizes", type=int, nargs="+", default=DEFAULT_TARGET_SIZES,
+                        help=f"target list sizes to estimate candidates for (default: {DEFAULT_TARGET_SIZES})")
+    parser.add_argument("--min-group", type=int, default=DEFAULT_MIN_GROUP,
+                        help=f"minimum group size slider value (default: {DEFAULT_MIN_GROUP})")
+    parser.add_argument("--candidate-mode", default=DEFAULT_CANDIDATE_MODE,
+                        help=f"standard or lattice-<k>, as the engine's candidate mode (default: {DEFAULT_CANDIDATE_MODE})")
+    parser.add_argument("--max-exact-groups", type=int, default=DEFAULT_MAX_EXACT_GROUPS,
+                        help=f"distinct groups per strategy before switching to a HyperLogLog estimate "
+                             f"(default: {DEFAULT_MAX_EXACT_GROUPS})")
+    args = parser.parse_args(argv)
+    if args.min_group < 2 or min(args.target_sizes) < 1:
+        parser.error("--min-group must be at least 2 and target sizes positive")
+    if not re.fullmatch(r"standard|lattice-\d+", args.candidate_mode):
+        parser.error("--candidate-mode must be standard or lattice-<k>")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = profile(args.hr, args.target_sizes, args.min_group, args.max_exact_groups, args.candidate_mode)
+    text = json.dumps(report, indent=2)
+    if args.out is None:
+        print(text)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"Profiled {report['employees']} employees in {report['elapsed_seconds']}s; report written to {args.out}",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
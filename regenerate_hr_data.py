@@ -5,12 +5,33 @@ Regenerate commercial_bank_hr_data.csv with:
 - Remove Job Grade/Band from Job Title
 - More granular Job Titles, Job Families, Cost Centers
 - SNODE filled to L12 for all, some to L15
+
+- Optionally written as a dictionary-encoded columnar file (.hrcol, see hr_columnar.py)
+
+Usage: python regenerate_hr_data.py [--count N] [--out PATH] [--seed S] [--workers W] [--backend python|numpy]
+                                    [--format csv|hrcol]
 """
+import argparse
+import bisect
 import csv
+import hashlib
+import io
+import os
 import random
+import shutil
+import struct
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
 
-random.seed(42)
+try:
+    import numpy as np
+    import hr_columnar
+except ImportError:  # only needed for --backend numpy and --format hrcol
+    np = hr_columnar = None
 
 # ─── Constants ───────────────────────────────────────────────────
 
@@ -855,62 +876,92 @@ def flatten_org_paths(bl_name, divisions):
     return paths
 
 
-def generate_deeper_snodes(sub_team_name, depth):
-    """Generate SNODE L7+ labels based on the sub-team context."""
-    # L7: Function area
-    functions = ["Execution", "Analysis", "Support", "Operations", "Strategy", "Advisory",
-                 "Processing", "Monitoring", "Reporting", "Development", "Testing", "Review",
-                 "Origination", "Structuring", "Distribution", "Coverage", "Governance"]
-    # L8: Sub-function
-    sub_functions = ["Front-Line", "Back-Office", "Middle-Office", "Client-Facing", "Internal",
-                     "Quantitative", "Qualitative", "Manual", "Automated", "Standard", "Complex",
-                     "Primary", "Secondary", "Inbound", "Outbound", "Regulatory", "Commercial"]
-    # L9: Specialty
-    specialties = ["Core Process", "Exception Handling", "Escalation", "Quality Assurance",
-                   "Reconciliation", "Validation", "Enrichment", "Transformation", "Delivery",
-                   "Investigation", "Resolution", "Documentation", "Certification", "Integration"]
-    # L10: Sub-Specialty
-    sub_specialties = ["Tier 1", "Tier 2", "Tier 3", "Priority", "Standard", "Expedited",
-                       "Batch", "Real-Time", "Scheduled", "On-Demand", "Periodic", "Ad-Hoc"]
-    # L11: Unit
-    units = ["Unit A", "Unit B", "Unit C", "Unit Alpha", "Unit Beta", "Unit Gamma",
-             "Team Lead Unit", "Senior Unit", "Junior Unit", "Specialist Unit"]
-    # L12: Desk
-    desks = ["Desk 1", "Desk 2", "Desk 3", "Morning Shift", "Afternoon Shift", "EMEA Hours",
-             "NA Hours", "APAC Hours", "Global Desk", "Regional Desk"]
-    # L13-L15 (only for some)
-    pods = ["Pod Alpha", "Pod Beta", "Pod Gamma", "Pod Delta", "Pod Epsilon"]
-    seats = ["Seat 1", "Seat 2", "Seat 3", "Seat 4"]
-    micro = ["Workstream A", "Workstream B", "Workstream C"]
-
-    random.seed(hash(sub_team_name) + depth)  # deterministic per sub-team
-    result = []
-    if depth >= 7: result.append(random.choice(functions))
-    if depth >= 8: result.append(random.choice(sub_functions))
-    if depth >= 9: result.append(random.choice(specialties))
-    if depth >= 10: result.append(random.choice(sub_specialties))
-    if depth >= 11: result.append(random.choice(units))
-    if depth >= 12: result.append(random.choice(desks))
-    if depth >= 13: result.append(random.choice(pods))
-    if depth >= 14: result.append(random.choice(seats))
-    if depth >= 15: result.append(random.choice(micro))
-    return result
+# SNODE L7+ label pools, in level order
+# L7: Function area
+SNODE_FUNCTIONS = ["Execution", "Analysis", "Support", "Operations", "Strategy", "Advisory",
+                   "Processing", "Monitoring", "Reporting", "Development", "Testing", "Review",
+                   "Origination", "Structuring", "Distribution", "Coverage", "Governance"]
+# L8: Sub-function
+SNODE_SUB_FUNCTIONS = ["Front-Line", "Back-Office", "Middle-Office", "Client-Facing", "Internal",
+                       "Quantitative", "Qualitative", "Manual", "Automated", "Standard", "Complex",
+                       "Primary", "Secondary", "Inbound", "Outbound", "Regulatory", "Commercial"]
+# L9: Specialty
+SNODE_SPECIALTIES = ["Core Process", "Exception Handling", "Escalation", "Quality Assurance",
+                     "Reconciliation", "Validation", "Enrichment", "Transformation", "Delivery",
+                     "Investigation", "Resolution", "Documentation", "Certification", "Integration"]
+# L10: Sub-Specialty
+SNODE_SUB_SPECIALTIES = ["Tier 1", "Tier 2", "Tier 3", "Priority", "Standard", "Expedited",
+                         "Batch", "Real-Time", "Scheduled", "On-Demand", "Periodic", "Ad-Hoc"]
+# L11: Unit
+SNODE_UNITS = ["Unit A", "Unit B", "Unit C", "Unit Alpha", "Unit Beta", "Unit Gamma",
+               "Team Lead Unit", "Senior Unit", "Junior Unit", "Specialist Unit"]
+# L12: Desk
+SNODE_DESKS = ["Desk 1", "Desk 2", "Desk 3", "Morning Shift", "Afternoon Shift", "EMEA Hours",
+               "NA Hours", "APAC Hours", "Global Desk", "Regional Desk"]
+# L13-L15 (only for some)
+SNODE_PODS = ["Pod Alpha", "Pod Beta", "Pod Gamma", "Pod Delta", "Pod Epsilon"]
+SNODE_SEATS = ["Seat 1", "Seat 2", "Seat 3", "Seat 4"]
+SNODE_MICRO = ["Workstream A", "Workstream B", "Workstream C"]
+
+SNODE_DEEPER_LEVELS = [SNODE_FUNCTIONS, SNODE_SUB_FUNCTIONS, SNODE_SPECIALTIES, SNODE_SUB_SPECIALTIES,
+                       SNODE_UNITS, SNODE_DESKS, SNODE_PODS, SNODE_SEATS, SNODE_MICRO]
+
+
+def generate_deeper_snodes(rng, depth):
+    """Generate SNODE L7+ labels for one employee from its CounterRandom."""
+    return [rng.choice(f"snode_l{7 + k}", labels) for k, labels in enumerate(SNODE_DEEPER_LEVELS[:max(depth - 6, 0)])]
 
 
 # ─── Main Generation ───
 
-def generate_employees(n=1000):
-    employees = []
-    used_ids = set()
-    manager_names = []
+DEFAULT_SEED = 42
+DEFAULT_OUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commercial_bank_hr_data.csv")
+
+# Column order of the HR master
+COLUMNS = [
+    "Employee First Name", "Employee Last Name", "Employee ID",
+    "Employment Type", "Employment Status", "Hire Date", "Contract End Date",
+    "Legal Entity", "Job Title", "Job Code", "Job Family", "Job Grade / Band",
+    "Manager Name", "Region", "Sub-Region / Country", "Country",
+    "Employee Location (City)", "Office / Site Code",
+    "Cost Center", "Cost Center Name", "Business Line",
+] + [f"SNODE L{lvl}" for lvl in range(1, 16)]
+
+
+# Rows are written in fixed-size blocks: the unit of sharding and of Employee
+# ID deduplication. Row contents never depend on how blocks are split up.
+BLOCK_SIZE = 10_000
+
+# Employee IDs are a letter plus a six-digit number: 24 × 900k possible IDs
+EMPLOYEE_ID_LETTERS = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+EMPLOYEE_ID_SPACE = len(EMPLOYEE_ID_LETTERS) * 900000
+
+# Weight business lines roughly
+BL_WEIGHTS = {
+    "Corporate & Institutional Banking": 0.15,
+    "Global Markets": 0.12,
+    "Wealth & Private Banking": 0.10,
+    "Risk Management": 0.12,
+    "Technology & Operations": 0.20,
+    "Finance & Accounting": 0.10,
+    "Compliance": 0.06,
+    "Legal": 0.05,
+    "Human Resources": 0.06,
+    "Internal Audit": 0.04,
+}
+BL_NAMES = list(ORG_STRUCTURE.keys())
+BL_CUM_WEIGHTS = list(accumulate(BL_WEIGHTS[b] for b in BL_NAMES))
+
+TITLE_SUFFIXES = ["Specialist", "Lead", "Coordinator", "Officer", "Advisor",
+                  "Consultant", "Manager", "Strategist", "Analyst", "Engineer",
+                  "Architect", "Administrator", "Examiner", "Controller", "Associate"]
 
-    # Pre-generate some manager names
-    for _ in range(100):
-        fn = random.choice(FIRST_NAMES)
-        ln = random.choice(LAST_NAMES)
-        manager_names.append(f"{fn} {ln}")
+HIRE_DATE_START = datetime(2000, 1, 1)
+HIRE_DATE_END = datetime(2025, 6, 1)
 
-    # Pre-build paths per business line
+
+def build_bl_paths():
+    """Pre-build SNODE paths, cost centers and job families per business line."""
     bl_paths = {}
     for bl_name, bl_data in ORG_STRUCTURE.items():
         paths = flatten_org_paths(bl_name, bl_data["divisions"])
@@ -919,208 +970,892 @@ def generate_employees(n=1000):
             "cost_centers": bl_data["cost_centers"],
             "job_families": bl_data["job_families"],
         }
+    return bl_paths
 
-    bl_names = list(ORG_STRUCTURE.keys())
-    # Weight business lines roughly
-    bl_weights = {
-        "Corporate & Institutional Banking": 0.15,
-        "Global Markets": 0.12,
-        "Wealth & Private Banking": 0.10,
-        "Risk Management": 0.12,
-        "Technology & Operations": 0.20,
-        "Finance & Accounting": 0.10,
-        "Compliance": 0.06,
-        "Legal": 0.05,
-        "Human Resources": 0.06,
-        "Internal Audit": 0.04,
-    }
 
-    for i in range(n):
-        # Pick business line
-        bl = random.choices(bl_names, weights=[bl_weights[b] for b in bl_names], k=1)[0]
-        bl_info = bl_paths[bl]
-
-        # Pick org path
-        path = random.choice(bl_info["paths"])
-        division, department, team, sub_team = path
-
-        # Pick cost center (weighted toward related ones)
-        cc_code, cc_name = random.choice(bl_info["cost_centers"])
-
-        # Pick job family
-        jf = random.choice(bl_info["job_families"])
-
-        # Pick grade
-        grade = random.choice(GRADES)
-
-        # Generate job title (grade is NOT in the title per requirements)
-        # Use sub-team + function-specific title
-        title_specialties = [sub_team, team, department]
-        title_base = random.choice(title_specialties[:2])  # Prefer more specific
-        job_title = f"{title_base} Specialist"
-        # Vary title suffixes
-        title_suffixes = ["Specialist", "Lead", "Coordinator", "Officer", "Advisor",
-                         "Consultant", "Manager", "Strategist", "Analyst", "Engineer",
-                         "Architect", "Administrator", "Examiner", "Controller", "Associate"]
-        job_title = f"{title_base} {random.choice(title_suffixes)}"
-
-        # Generate Employee ID
-        while True:
-            eid = f"{random.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{random.randint(100000, 999999)}"
-            if eid not in used_ids:
-                used_ids.add(eid)
-                break
-
-        # Name
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-
-        # Region & Location
-        region = random.choice(list(REGIONS.keys()))
-        region_data = REGIONS[region]
-        sub_region = random.choice(list(region_data["sub_regions"].keys()))
-        sr_data = region_data["sub_regions"][sub_region]
-        country = random.choice(list(sr_data["countries"].keys()))
-        city, site_code = random.choice(sr_data["countries"][country])
-
-        # Legal entity
-        legal_entity = LEGAL_ENTITIES[region]
-
-        # Hire date (between 2000 and 2025)
-        start = datetime(2000, 1, 1)
-        end = datetime(2025, 6, 1)
-        hire_date = start + timedelta(days=random.randint(0, (end - start).days))
-
-        # Manager
-        manager = random.choice(manager_names)
-
-        # SNODE depth: L12 minimum, some go to L13 (30%), L14 (15%), L15 (5%)
-        r = random.random()
-        if r < 0.05:
-            snode_depth = 15
-        elif r < 0.20:
-            snode_depth = 14
-        elif r < 0.50:
-            snode_depth = 13
-        else:
-            snode_depth = 12
-
-        # Build SNODE levels
-        # L1 = Commercial Bank (always)
-        # L2 = Business Line
-        # L3 = Division
-        # L4 = Department
-        # L5 = Team
-        # L6 = Sub-Team
-        # L7-L15 = generated deeper nodes
-        deeper = generate_deeper_snodes(f"{bl}|{sub_team}|{i}", snode_depth)
-
-        snodes = [
-            "Commercial Bank",   # L1
-            bl,                  # L2
-            division,            # L3
-            department,          # L4
-            team,                # L5
-            sub_team,            # L6
-        ]
-        snodes.extend(deeper)  # L7+
-
-        # Pad to 15
-        while len(snodes) < 15:
-            snodes.append("")
-
-        employee = {
-            "Employee First Name": first_name,
-            "Employee Last Name": last_name,
-            "Employee ID": eid,
-            "Employment Type": "Full-Time",
-            "Employment Status": "Active",
-            "Hire Date": hire_date.strftime("%m/%d/%Y"),
-            "Contract End Date": "",
-            "Legal Entity": legal_entity,
-            "Job Title": job_title,
-            "Job Code": str(random.randint(100000, 999999)),
-            "Job Family": jf,
-            "Job Grade / Band": grade,
-            "Manager Name": manager,
-            "Region": region,
-            "Sub-Region / Country": sub_region,
-            "Country": country,
-            "Employee Location (City)": city,
-            "Office / Site Code": site_code,
-            "Cost Center": cc_code,
-            "Cost Center Name": cc_name,
-            "Business Line": bl,
-        }
+# Fields an employee row draws, in digest order: each owns one 64-bit word of
+# the row's CounterRandom digest. Append new fields at the end; SHAKE output is
+# prefix-stable, so existing fields keep their values.
+ROW_FIELDS = ("bl", "path", "cost_center", "job_family", "grade", "title_base", "title_suffix",
+              "first_name", "last_name", "region", "sub_region", "country", "city", "hire_date",
+              "manager", "snode_depth", "job_code") + tuple(f"snode_l{7 + k}" for k in range(len(SNODE_DEEPER_LEVELS)))
 
-        # Add SNODE columns
-        for lvl in range(1, 16):
-            employee[f"SNODE L{lvl}"] = snodes[lvl - 1]
 
-        employees.append(employee)
+@lru_cache(maxsize=None)
+def _field_layout(fields):
+    """Word index per field name, and the struct that unpacks that many words."""
+    return {field: k for k, field in enumerate(fields)}, struct.Struct(f"<{len(fields)}Q")
 
-    return employees
 
+class CounterRandom:
+    """Counter-based draws for one employee index.
 
-if __name__ == "__main__":
-    import os
-    print("Generating 1000 employees...")
-    employees = generate_employees(1000)
-
-    # Column order
-    columns = [
-        "Employee First Name", "Employee Last Name", "Employee ID",
-        "Employment Type", "Employment Status", "Hire Date", "Contract End Date",
-        "Legal Entity", "Job Title", "Job Code", "Job Family", "Job Grade / Band",
-        "Manager Name", "Region", "Sub-Region / Country", "Country",
-        "Employee Location (City)", "Office / Site Code",
-        "Cost Center", "Cost Center Name", "Business Line",
+    One SHAKE-128 digest of (seed, index) is cut into a 64-bit word per name in
+    fields, so a row never depends on the rows before it, on the process, or on
+    PYTHONHASHSEED, and costs one hash however many fields it draws.
+    """
+
+    __slots__ = ("_slots", "_words")
+
+    def __init__(self, seed, index, fields=ROW_FIELDS):
+        self._slots, words = _field_layout(fields)
+        self._words = words.unpack(hashlib.shake_128(f"{seed}|{index}".encode()).digest(words.size))
+
+    def bits(self, field):
+        return self._words[self._slots[field]]
+
+    def random(self, field):
+        return (self._words[self._slots[field]] >> 11) * (1.0 / (1 << 53))
+
+    def randint(self, field, a, b):
+        return a + self._words[self._slots[field]] % (b - a + 1)
+
+    def choice(self, field, seq):
+        return seq[self._words[self._slots[field]] % len(seq)]
+
+    def weighted_choice(self, field, seq, cum_weights):
+        return seq[bisect.bisect(cum_weights, self.random(field) * cum_weights[-1])]
+
+
+def generate_manager_names(seed, count=100):
+    rngs = [CounterRandom(seed, f"manager|{k}") for k in range(count)]
+    return [f"{rng.choice('first_name', FIRST_NAMES)} {rng.choice('last_name', LAST_NAMES)}" for rng in rngs]
+
+
+def block_count(n):
+    return (n + BLOCK_SIZE - 1) // BLOCK_SIZE
+
+
+# ─── Employee IDs ───
+# Row i's ID is a keyed Feistel permutation of i over the ID space, so IDs are
+# unique without a used-ID set and map back to their row index. The network
+# permutes 26-bit values; results outside the ID space are cycle-walked (fed
+# back through) until they land inside it, about 3 passes on average.
+
+FEISTEL_HALF_BITS = 13
+FEISTEL_HALF_MASK = (1 << FEISTEL_HALF_BITS) - 1
+FEISTEL_ROUNDS = 6
+MASK64 = (1 << 64) - 1
+
+
+@lru_cache(maxsize=8)
+def _feistel_keys(seed):
+    rounds = tuple(f"round{k}" for k in range(FEISTEL_ROUNDS))
+    rng = CounterRandom(seed, "employee_ids", rounds)
+    return tuple(rng.bits(name) for name in rounds)
+
+
+def _mix64(z):
+    """SplitMix64 finalizer; works on Python ints and numpy uint64 arrays alike."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def _feistel(x, keys):
+    left, right = x >> FEISTEL_HALF_BITS, x & FEISTEL_HALF_MASK
+    for k in keys:
+        left, right = right, left ^ (_mix64(right ^ k) & FEISTEL_HALF_MASK)
+    return (left << FEISTEL_HALF_BITS) | right
+
+
+@lru_cache(maxsize=8)
+def _feistel_round_tables(seed):
+    """Each round function evaluated at every half value, so an array round is one gather."""
+    halves = np.arange(FEISTEL_HALF_MASK + 1, dtype=np.uint64)
+    return [(_mix64(halves ^ np.uint64(k)) & FEISTEL_HALF_MASK).astype(np.int64) for k in _feistel_keys(seed)]
+
+
+def _feistel_arrays(x, tables):
+    """_feistel over an int64 array, via _feistel_round_tables."""
+    left, right = x >> FEISTEL_HALF_BITS, x & FEISTEL_HALF_MASK
+    for table in tables:
+        left, right = right, left ^ table[right]
+    return (left << FEISTEL_HALF_BITS) | right
+
+
+def _feistel_inverse(x, keys):
+    left, right = x >> FEISTEL_HALF_BITS, x & FEISTEL_HALF_MASK
+    for k in reversed(keys):
+        left, right = right ^ (_mix64(left ^ k) & FEISTEL_HALF_MASK), left
+    return (left << FEISTEL_HALF_BITS) | right
+
+
+def _check_id_index(i):
+    if not 0 <= i < EMPLOYEE_ID_SPACE:
+        raise ValueError(f"employee index {i} outside the ID space (0..{EMPLOYEE_ID_SPACE - 1})")
+
+
+def employee_id_code(i, seed=DEFAULT_SEED):
+    """ID code (letter index × 900000 + number - 100000) of row i; a bijection on the ID space."""
+    _check_id_index(i)
+    keys = _feistel_keys(seed)
+    x = _feistel(i, keys)
+    while x >= EMPLOYEE_ID_SPACE:
+        x = _feistel(x, keys)
+    return x
+
+
+def employee_id(i, seed=DEFAULT_SEED):
+    """Employee ID of row i."""
+    code = employee_id_code(i, seed)
+    return f"{EMPLOYEE_ID_LETTERS[code // 900000]}{100000 + code % 900000}"
+
+
+def employee_index(eid, seed=DEFAULT_SEED):
+    """Row index whose Employee ID is eid (the inverse of employee_id)."""
+    letter, number = eid[:1], eid[1:]
+    if letter not in EMPLOYEE_ID_LETTERS or len(number) != 6 or not number.isdigit() or number[0] == "0":
+        raise ValueError(f"not an Employee ID: {eid!r}")
+    keys = _feistel_keys(seed)
+    x = _feistel_inverse(EMPLOYEE_ID_LETTERS.index(letter) * 900000 + int(number) - 100000, keys)
+    while x >= EMPLOYEE_ID_SPACE:
+        x = _feistel_inverse(x, keys)
+    return x
+
+
+def employee_id_codes(indices, seed=DEFAULT_SEED):
+    """Vectorized employee_id_code over an integer array of row indices."""
+    if indices.size:
+        _check_id_index(int(indices.min()))
+        _check_id_index(int(indices.max()))
+    tables = _feistel_round_tables(seed)
+    x = _feistel_arrays(indices.astype(np.int64), tables)
+    walk = np.nonzero(x >= EMPLOYEE_ID_SPACE)[0]
+    while walk.size:
+        x[walk] = _feistel_arrays(x[walk], tables)
+        walk = walk[x[walk] >= EMPLOYEE_ID_SPACE]
+    return x
+
+
+# ─── Rows ───
+
+def generate_employee(i, seed=DEFAULT_SEED, manager_names=None, bl_paths=None):
+    """Generate employee row i directly, without generating the rows before it."""
+    rng = CounterRandom(seed, i)
+    if manager_names is None:
+        manager_names = generate_manager_names(seed)
+    if bl_paths is None:
+        bl_paths = build_bl_paths()
+    # Pick business line
+    bl = rng.weighted_choice("bl", BL_NAMES, BL_CUM_WEIGHTS)
+    bl_info = bl_paths[bl]
+
+    # Pick org path
+    path = rng.choice("path", bl_info["paths"])
+    division, department, team, sub_team = path
+
+    # Pick cost center (weighted toward related ones)
+    cc_code, cc_name = rng.choice("cost_center", bl_info["cost_centers"])
+
+    # Pick job family
+    jf = rng.choice("job_family", bl_info["job_families"])
+
+    # Pick grade
+    grade = rng.choice("grade", GRADES)
+
+    # Generate job title (grade is NOT in the title per requirements)
+    # Use sub-team + function-specific title
+    title_specialties = [sub_team, team, department]
+    title_base = rng.choice("title_base", title_specialties[:2])  # Prefer more specific
+    # Vary title suffixes
+    job_title = f"{title_base} {rng.choice('title_suffix', TITLE_SUFFIXES)}"
+
+    # Generate Employee ID
+    eid = employee_id(i, seed)
+
+    # Name
+    first_name = rng.choice("first_name", FIRST_NAMES)
+    last_name = rng.choice("last_name", LAST_NAMES)
+
+    # Region & Location
+    region = rng.choice("region", list(REGIONS.keys()))
+    region_data = REGIONS[region]
+    sub_region = rng.choice("sub_region", list(region_data["sub_regions"].keys()))
+    sr_data = region_data["sub_regions"][sub_region]
+    country = rng.choice("country", list(sr_data["countries"].keys()))
+    city, site_code = rng.choice("city", sr_data["countries"][country])
+
+    # Legal entity
+    legal_entity = LEGAL_ENTITIES[region]
+
+    # Hire date (between 2000 and 2025)
+    hire_date = HIRE_DATE_START + timedelta(days=rng.randint("hire_date", 0, (HIRE_DATE_END - HIRE_DATE_START).days))
+
+    # Manager
+    manager = rng.choice("manager", manager_names)
+
+    # SNODE depth: L12 minimum, some go to L13 (30%), L14 (15%), L15 (5%)
+    r = rng.random("snode_depth")
+    if r < 0.05:
+        snode_depth = 15
+    elif r < 0.20:
+        snode_depth = 14
+    elif r < 0.50:
+        snode_depth = 13
+    else:
+        snode_depth = 12
+
+    # Build SNODE levels
+    # L1 = Commercial Bank (always)
+    # L2 = Business Line
+    # L3 = Division
+    # L4 = Department
+    # L5 = Team
+    # L6 = Sub-Team
+    # L7-L15 = generated deeper nodes
+    deeper = generate_deeper_snodes(rng, snode_depth)
+
+    snodes = [
+        "Commercial Bank",   # L1
+        bl,                  # L2
+        division,            # L3
+        department,          # L4
+        team,                # L5
+        sub_team,            # L6
     ]
+    snodes.extend(deeper)  # L7+
+
+    # Pad to 15
+    while len(snodes) < 15:
+        snodes.append("")
+
+    employee = {
+        "Employee First Name": first_name,
+        "Employee Last Name": last_name,
+        "Employee ID": eid,
+        "Employment Type": "Full-Time",
+        "Employment Status": "Active",
+        "Hire Date": hire_date.strftime("%m/%d/%Y"),
+        "Contract End Date": "",
+        "Legal Entity": legal_entity,
+        "Job Title": job_title,
+        "Job Code": str(rng.randint("job_code", 100000, 999999)),
+        "Job Family": jf,
+        "Job Grade / Band": grade,
+        "Manager Name": manager,
+        "Region": region,
+        "Sub-Region / Country": sub_region,
+        "Country": country,
+        "Employee Location (City)": city,
+        "Office / Site Code": site_code,
+        "Cost Center": cc_code,
+        "Cost Center Name": cc_name,
+        "Business Line": bl,
+    }
+
+    # Add SNODE columns
     for lvl in range(1, 16):
-        columns.append(f"SNODE L{lvl}")
-
-    out_path = r"C:\Users\augyp\OneDrive\Desktop\RBAC Claude Project\data\commercial_bank_hr_data_v2.csv"
-    temp_path = out_path
-    with open(temp_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(employees)
-
-    print(f"Written {len(employees)} employees to {out_path}")
-    print(f"Columns: {len(columns)}")
-
-    # Quick stats
-    bls = {}
-    jfs = {}
-    ccs = {}
-    titles = set()
-    snode_depths = []
-    for e in employees:
-        bl = e["Business Line"]
-        bls[bl] = bls.get(bl, 0) + 1
-        jf = e["Job Family"]
-        jfs[jf] = jfs.get(jf, 0) + 1
-        cc = e["Cost Center Name"]
-        ccs[cc] = ccs.get(cc, 0) + 1
-        titles.add(e["Job Title"])
+        employee[f"SNODE L{lvl}"] = snodes[lvl - 1]
+
+    return employee
+
+
+def iter_employee_block(block, n, seed=DEFAULT_SEED, manager_names=None, bl_paths=None):
+    """Yield the rows of one block of the n-employee index range."""
+    if manager_names is None:
+        manager_names = generate_manager_names(seed)
+    if bl_paths is None:
+        bl_paths = build_bl_paths()
+    for i in range(block * BLOCK_SIZE, min(n, (block + 1) * BLOCK_SIZE)):
+        yield generate_employee(i, seed, manager_names, bl_paths)
+
+
+def iter_employees(n=1000, seed=DEFAULT_SEED):
+    """Yield n employee rows one at a time, so callers never hold the full list."""
+    if seed is None:
+        seed = random.randrange(2**32)
+    manager_names = generate_manager_names(seed)
+    bl_paths = build_bl_paths()
+    for block in range(block_count(n)):
+        yield from iter_employee_block(block, n, seed, manager_names, bl_paths)
+
+
+def generate_employees(n=1000, seed=DEFAULT_SEED):
+    """Return all n employees as a list (small datasets only; see iter_employees)."""
+    return list(iter_employees(n, seed))
+
+
+# ─── NumPy Backend ───
+# Draws each attribute for a whole block as an integer code array from a
+# numpy.random.Generator; codes only become bytes when the block is written,
+# via lookup tables of pre-joined, UTF-8 encoded CSV segments. Same (seed, n)
+# always gives the same file, but not the same rows as the python backend. The
+# generator is keyed on (seed, block), so random access is per block rather
+# than per row.
+
+BACKENDS = ("python", "numpy")
+
+
+def _csv_field(value):
+    if ',' in value or '"' in value or '\r' in value or '\n' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _encoded(values, end=","):
+    """Object array of values as UTF-8 bytes, each followed by the separator end."""
+    out = np.empty(len(values), dtype=object)
+    out[:] = [(v + end).encode("utf-8") for v in values]
+    return out
+
+
+def _segments(*parts, end=","):
+    """Encoded comma-joined CSV fields, one per row of the zipped parts."""
+    return _encoded([",".join(_csv_field(v) for v in row) for row in zip(*parts)], end)
+
+
+def _product_segments(*lists, end=","):
+    """Encoded comma-joined CSV fields over the cartesian product of lists (last varies fastest)."""
+    rows = None
+    for values in lists:
+        quoted = [_csv_field(v) for v in values]
+        rows = quoted if rows is None else [f"{row},{v}" for row in rows for v in quoted]
+    return _encoded(rows, end)
+
+
+def _digits(values, width):
+    """Non-negative integers below 10**width as zero-padded ASCII, one uint8 row per value."""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+
+
+def _byte_rows(*cells):
+    """Rows of uint8 matrices, laid side by side and followed by a comma, as an array of bytes."""
+    comma = np.full((len(cells[0]), 1), ord(","), dtype=np.uint8)
+    rows = np.hstack(cells + (comma,))
+    return rows.view(f"S{rows.shape[1]}").ravel()
+
+
+def _offsets(counts):
+    offsets = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    return offsets
+
+
+@lru_cache(maxsize=None)
+def _numpy_tables():
+    """Flattened attribute tables, per-parent offsets for nested draws, and CSV segment tables."""
+    bl_names = list(ORG_STRUCTURE.keys())
+    bl_paths = build_bl_paths()
+    weights = np.array([BL_WEIGHTS[b] for b in bl_names])
+    t = {"bl_names": bl_names, "bl_p": weights / weights.sum()}
+
+    paths, ccs, jfs = [], [], []
+    path_counts, cc_counts, jf_counts = [], [], []
+    for bl in bl_names:
+        info = bl_paths[bl]
+        paths.extend((bl,) + path for path in info["paths"])
+        ccs.extend(info["cost_centers"])
+        jfs.extend(info["job_families"])
+        path_counts.append(len(info["paths"]))
+        cc_counts.append(len(info["cost_centers"]))
+        jf_counts.append(len(info["job_families"]))
+
+    regions = list(REGIONS.keys())
+    cities = []  # (region code, sub-region, country, city, site code)
+    sr_counts, country_counts, city_counts = [], [], []
+    for r, region in enumerate(regions):
+        srs = REGIONS[region]["sub_regions"]
+        sr_counts.append(len(srs))
+        for sub_region, sr_data in srs.items():
+            country_counts.append(len(sr_data["countries"]))
+            for country, city_list in sr_data["countries"].items():
+                city_counts.append(len(city_list))
+                cities.extend((r, sub_region, country, city, site) for city, site in city_list)
+
+    for key, counts in (("path", path_counts), ("cc", cc_counts), ("jf", jf_counts),
+                        ("sr", sr_counts), ("country", country_counts), ("city", city_counts)):
+        t[f"{key}_counts"] = np.array(counts, dtype=np.int64)
+        t[f"{key}_offsets"] = _offsets(t[f"{key}_counts"])
+
+    # Raw labels, for stats and columnar output
+    t["paths"] = paths
+    t["jf_labels"] = jfs
+    t["cc_codes"] = [c[0] for c in ccs]
+    t["cc_labels"] = [c[1] for c in ccs]
+    t["titles"] = [f"{base} {suffix}" for p in paths for base in (p[4], p[3]) for suffix in TITLE_SUFFIXES]
+
+    # CSV segments, in COLUMNS order, each ending in the separator that follows it
+    span = (HIRE_DATE_END - HIRE_DATE_START).days
+    hire_dates = [(HIRE_DATE_START + timedelta(days=d)).strftime("%m/%d/%Y") for d in range(span + 1)]
+    t["seg_name"] = _product_segments(FIRST_NAMES, LAST_NAMES)
+    t["seg_hire_entity"] = _product_segments(["Full-Time"], ["Active"], hire_dates, [""],
+                                             [LEGAL_ENTITIES[r] for r in regions])
+    t["seg_title"] = _segments(t["titles"])
+    t["seg_family_grade"] = _product_segments(jfs, GRADES)
+    # Location is joined with the (seed-dependent) manager name in _manager_location_segments
+    t["locations"] = [[regions[c[0]], c[1], c[2], c[3], c[4]] for c in cities]
+    # Cost center + business line + SNODE L1-L6, per (path, cost center of the path's business line)
+    t["max_cc"] = max(cc_counts)
+    cc_org = [""] * (len(paths) * t["max_cc"])
+    path_bl = np.repeat(np.arange(len(bl_names)), path_counts)
+    for k, p in enumerate(paths):
+        b = int(path_bl[k])
+        for j in range(cc_counts[b]):
+            cc_code, cc_name = ccs[t["cc_offsets"][b] + j]
+            cc_org[k * t["max_cc"] + j] = ",".join(_csv_field(v) for v in (cc_code, cc_name, p[0], "Commercial Bank") + p)
+    t["seg_cc_org"] = _encoded(cc_org)
+    # SNODE L7-L10, and L11-L15 with "" for levels below the employee's depth
+    deeper = SNODE_DEEPER_LEVELS
+    t["snode_sizes"] = [len(labels) for labels in deeper[:6]] + [len(labels) + 1 for labels in deeper[6:]]
+    t["seg_snode_head"] = _product_segments(*deeper[:4])
+    t["seg_snode_tail"] = _product_segments(*deeper[4:6], *(labels + [""] for labels in deeper[6:]), end="\r\n")
+    return t
+
+
+@lru_cache(maxsize=8)
+def _manager_location_segments(seed):
+    """Manager Name + Region..Office / Site Code segments, indexed manager * n_cities + city."""
+    locations = _numpy_tables()["locations"]
+    return _encoded([",".join(_csv_field(v) for v in [manager] + loc)
+                     for manager in generate_manager_names(seed) for loc in locations])
+
+
+def _mixed_index(codes, sizes):
+    """Flatten per-level codes into one index into a cartesian-product table."""
+    idx = codes[0]
+    for code, size in zip(codes[1:], sizes[1:]):
+        idx = idx * size + code
+    return idx
+
+
+def _nested_draw(rng, parent, offsets, counts):
+    """Uniform child index for each parent code, in the flattened child table."""
+    return offsets[parent] + rng.integers(0, counts[parent])
+
+
+def draw_employee_block(block, n, seed=DEFAULT_SEED):
+    """Draw one block's attributes as integer code arrays into the _numpy_tables() tables."""
+    if np is None:
+        raise RuntimeError("the numpy backend requires NumPy (pip install numpy)")
+    t = _numpy_tables()
+    m = max(0, min(n, (block + 1) * BLOCK_SIZE) - block * BLOCK_SIZE)
+    rng = np.random.default_rng([seed, block])
+    c = {}
+
+    c["bl"] = rng.choice(len(t["bl_names"]), size=m, p=t["bl_p"])
+    c["path"] = _nested_draw(rng, c["bl"], t["path_offsets"], t["path_counts"])
+    c["cc"] = _nested_draw(rng, c["bl"], t["cc_offsets"], t["cc_counts"])
+    c["jf"] = _nested_draw(rng, c["bl"], t["jf_offsets"], t["jf_counts"])
+    c["grade"] = rng.integers(0, len(GRADES), m)
+    n_suffixes = len(TITLE_SUFFIXES)
+    c["title"] = (c["path"] * 2 + rng.integers(0, 2, m)) * n_suffixes + rng.integers(0, n_suffixes, m)
+
+    c["id"] = employee_id_codes(np.arange(block * BLOCK_SIZE, block * BLOCK_SIZE + m), seed)
+
+    c["name"] = rng.integers(0, len(FIRST_NAMES), m) * len(LAST_NAMES) + rng.integers(0, len(LAST_NAMES), m)
+    c["region"] = rng.integers(0, len(REGIONS), m)
+    sub_region = _nested_draw(rng, c["region"], t["sr_offsets"], t["sr_counts"])
+    country = _nested_draw(rng, sub_region, t["country_offsets"], t["country_counts"])
+    c["city"] = _nested_draw(rng, country, t["city_offsets"], t["city_counts"])
+    c["hire"] = rng.integers(0, (HIRE_DATE_END - HIRE_DATE_START).days + 1, m)
+    c["manager"] = rng.integers(0, 100, m)
+    c["job_code"] = rng.integers(100000, 1000000, m)
+
+    r = rng.random(m)
+    c["depth"] = 12 + (r < 0.50).astype(np.int64) + (r < 0.20) + (r < 0.05)
+    c["deeper"] = []
+    for k, labels in enumerate(SNODE_DEEPER_LEVELS):
+        codes = rng.integers(0, len(labels), m)
+        codes[c["depth"] < 7 + k] = len(labels)  # blank
+        c["deeper"].append(codes)
+    return c
+
+
+def render_numpy_block(c, seed=DEFAULT_SEED):
+    """Assemble drawn codes into the block's CSV as UTF-8 bytes, each row ending in \\r\\n.
+
+    Every segment carries its trailing separator, so the block is a single
+    join over a row-major (rows × segments) array of the looked-up segments.
+    """
+    t = _numpy_tables()
+    d = c["deeper"]
+    sizes = t["snode_sizes"]
+    n_cities = len(t["locations"])
+    ids = c["id"]
+    letters = np.frombuffer(EMPLOYEE_ID_LETTERS.encode(), dtype=np.uint8)
+    fields = [
+        t["seg_name"][c["name"]],
+        _byte_rows(letters[ids // 900000, None], _digits(100000 + ids % 900000, 6)),
+        t["seg_hire_entity"][c["hire"] * len(REGIONS) + c["region"]],
+        t["seg_title"][c["title"]],
+        _byte_rows(_digits(c["job_code"], 6)),
+        t["seg_family_grade"][c["jf"] * len(GRADES) + c["grade"]],
+        _manager_location_segments(seed)[c["manager"] * n_cities + c["city"]],
+        t["seg_cc_org"][c["path"] * t["max_cc"] + c["cc"] - t["cc_offsets"][c["bl"]]],
+        t["seg_snode_head"][_mixed_index(d[:4], sizes[:4])],
+        t["seg_snode_tail"][_mixed_index(d[4:], sizes[4:])],
+    ]
+    rows = np.empty((len(ids), len(fields)), dtype=object)
+    for k, segments in enumerate(fields):
+        rows[:, k] = segments
+    return b"".join(rows.ravel().tolist())
+
+
+# ─── Output & Stats ───
+
+class HRStats:
+    """Summary counts accumulated row by row while the CSV is being written."""
+
+    def __init__(self):
+        self.total = 0
+        self.bls = Counter()
+        self.jfs = Counter()
+        self.ccs = Counter()
+        self.titles = set()
+        self.snode_depths = Counter()
+
+    def update(self, e):
+        self.total += 1
+        self.bls[e["Business Line"]] += 1
+        self.jfs[e["Job Family"]] += 1
+        self.ccs[e["Cost Center Name"]] += 1
+        self.titles.add(e["Job Title"])
         # Measure SNODE depth
         depth = 0
         for lvl in range(1, 16):
             if e[f"SNODE L{lvl}"]:
                 depth = lvl
-        snode_depths.append(depth)
-
-    print(f"\nBusiness Lines ({len(bls)}):")
-    for bl, cnt in sorted(bls.items(), key=lambda x: -x[1]):
-        print(f"  {bl}: {cnt}")
-    print(f"\nJob Families ({len(jfs)}):")
-    for jf, cnt in sorted(jfs.items(), key=lambda x: -x[1]):
-        print(f"  {jf}: {cnt}")
-    print(f"\nCost Centers ({len(ccs)}):")
-    for cc, cnt in sorted(ccs.items(), key=lambda x: -x[1]):
-        print(f"  {cc}: {cnt}")
-    print(f"\nUnique Job Titles: {len(titles)}")
-    print(f"\nSNODE Depth Distribution:")
-    from collections import Counter
-    for depth, cnt in sorted(Counter(snode_depths).items()):
-        print(f"  L{depth}: {cnt} employees ({cnt/10:.1f}%)")
+        self.snode_depths[depth] += 1
+
+    def update_codes(self, c):
+        """Bulk update from one block of draw_employee_block codes."""
+        t = _numpy_tables()
+        self.total += len(c["depth"])
+        for counter, labels, codes in ((self.bls, t["bl_names"], c["bl"]),
+                                       (self.jfs, t["jf_labels"], c["jf"]),
+                                       (self.ccs, t["cc_labels"], c["cc"]),
+                                       (self.snode_depths, range(16), c["depth"])):
+            counts = np.bincount(codes, minlength=len(labels))
+            for k in np.nonzero(counts)[0].tolist():
+                counter[labels[k]] += int(counts[k])
+        seen = np.flatnonzero(np.bincount(c["title"], minlength=len(t["titles"])))
+        self.titles.update(t["titles"][k] for k in seen.tolist())
+
+    def merge(self, other):
+        self.total += other.total
+        self.bls.update(other.bls)
+        self.jfs.update(other.jfs)
+        self.ccs.update(other.ccs)
+        self.titles.update(other.titles)
+        self.snode_depths.update(other.snode_depths)
+
+    def report(self):
+        print(f"\nBusiness Lines ({len(self.bls)}):")
+        for bl, cnt in self.bls.most_common():
+            print(f"  {bl}: {cnt}")
+        print(f"\nJob Families ({len(self.jfs)}):")
+        for jf, cnt in self.jfs.most_common():
+            print(f"  {jf}: {cnt}")
+        print(f"\nCost Centers ({len(self.ccs)}):")
+        for cc, cnt in self.ccs.most_common():
+            print(f"  {cc}: {cnt}")
+        print(f"\nUnique Job Titles: {len(self.titles)}")
+        print(f"\nSNODE Depth Distribution:")
+        for depth, cnt in sorted(self.snode_depths.items()):
+            print(f"  L{depth}: {cnt} employees ({cnt / max(self.total, 1) * 100:.1f}%)")
+
+
+def render_block(block, n, seed=DEFAULT_SEED, backend="python", stats=None):
+    """Return one block as (UTF-8 CSV bytes, row count), updating stats if given."""
+    if backend == "numpy":
+        codes = draw_employee_block(block, n, seed)
+        if stats is not None:
+            stats.update_codes(codes)
+        return render_numpy_block(codes, seed), len(codes["id"])
+
+    buf = io.StringIO(newline='')
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    rows = 0
+    for row in iter_employee_block(block, n, seed):
+        writer.writerow(row)
+        rows += 1
+        if stats is not None:
+            stats.update(row)
+    return buf.getvalue().encode("utf-8"), rows
+
+
+def generate_serial(n, out_path, seed=DEFAULT_SEED, backend="python"):
+    """Generate n employees block by block in this process. Returns (row count, HRStats)."""
+    stats = HRStats()
+    count = 0
+    with open(out_path, 'w', newline='', encoding='utf-8') as out:
+        csv.DictWriter(out, fieldnames=COLUMNS).writeheader()
+        out.flush()
+        for block in range(block_count(n)):
+            data, rows = render_block(block, n, seed, backend, stats)
+            out.buffer.write(data)
+            count += rows
+    return count, stats
+
+
+# ─── Parallel (sharded) Generation ───
+
+def _write_block_shard(job):
+    """Worker: write one block as a headerless CSV shard; returns (stats, row count)."""
+    block, n, seed, backend, shard_path = job
+    stats = HRStats()
+    data, rows = render_block(block, n, seed, backend, stats)
+    with open(shard_path, 'wb') as f:
+        f.write(data)
+    return stats, rows
+
+
+def merge_shards(shard_paths, out_path):
+    """Concatenate headerless shards, in block order, under one header."""
+    with open(out_path, 'w', newline='', encoding='utf-8') as out:
+        csv.DictWriter(out, fieldnames=COLUMNS).writeheader()
+        out.flush()
+        for shard_path in shard_paths:
+            with open(shard_path, 'rb') as f:
+                shutil.copyfileobj(f, out.buffer)
+
+
+def generate_parallel(n, out_path, seed=DEFAULT_SEED, workers=None, backend="python"):
+    """Generate n employees across a process pool and merge into out_path.
+
+    The output is byte-identical to generate_serial(n, out_path, seed, backend)
+    for any worker count. Returns (row count, HRStats).
+    """
+    shard_dir = tempfile.mkdtemp(prefix="hr_shards_", dir=os.path.dirname(os.path.abspath(out_path)))
+    try:
+        jobs = [(block, n, seed, backend, os.path.join(shard_dir, f"block_{block:06d}.csv"))
+                for block in range(block_count(n))]
+        stats = HRStats()
+        count = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_stats, rows in pool.map(_write_block_shard, jobs):
+                stats.merge(shard_stats)
+                count += rows
+        merge_shards([job[-1] for job in jobs], out_path)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return count, stats
+
+
+# ─── Columnar (.hrcol) Output ───
+# Every text column is stored as small-integer codes into a per-column
+# dictionary of all the values the generator can emit; Employee ID and Job
+# Code are stored as integers. Blocks are encoded independently and written in
+# place at fixed offsets, so workers write straight into the output file.
+
+FORMATS = ("csv", "hrcol")
+INT_COLUMNS = {"Employee ID": "employee_id", "Job Code": "int"}
+
+
+@lru_cache(maxsize=8)
+def hrcol_dictionaries(seed=DEFAULT_SEED):
+    """{column: list of distinct values} for every dictionary-encoded column."""
+    paths = [path for bl in BL_NAMES for path in flatten_org_paths(bl, ORG_STRUCTURE[bl]["divisions"])]
+    locations = [(region, sub_region, country, city, site)
+                 for region, region_data in REGIONS.items()
+                 for sub_region, sr_data in region_data["sub_regions"].items()
+                 for country, city_list in sr_data["countries"].items()
+                 for city, site in city_list]
+    cost_centers = [cc for bl in BL_NAMES for cc in ORG_STRUCTURE[bl]["cost_centers"]]
+    span = (HIRE_DATE_END - HIRE_DATE_START).days
+    domains = {
+        "Employee First Name": FIRST_NAMES,
+        "Employee Last Name": LAST_NAMES,
+        "Employment Type": ["Full-Time"],
+        "Employment Status": ["Active"],
+        "Hire Date": [(HIRE_DATE_START + timedelta(days=d)).strftime("%m/%d/%Y") for d in range(span + 1)],
+        "Contract End Date": [""],
+        "Legal Entity": [LEGAL_ENTITIES[r] for r in REGIONS],
+        "Job Title": [f"{base} {suffix}" for p in paths for base in (p[3], p[2]) for suffix in TITLE_SUFFIXES],
+        "Job Family": [jf for bl in BL_NAMES for jf in ORG_STRUCTURE[bl]["job_families"]],
+        "Job Grade / Band": GRADES,
+        "Manager Name": generate_manager_names(seed),
+        "Region": [loc[0] for loc in locations],
+        "Sub-Region / Country": [loc[1] for loc in locations],
+        "Country": [loc[2] for loc in locations],
+        "Employee Location (City)": [loc[3] for loc in locations],
+        "Office / Site Code": [loc[4] for loc in locations],
+        "Cost Center": [cc[0] for cc in cost_centers],
+        "Cost Center Name": [cc[1] for cc in cost_centers],
+        "Business Line": BL_NAMES,
+        "SNODE L1": ["Commercial Bank"],
+        "SNODE L2": BL_NAMES,
+    }
+    for k in range(4):
+        domains[f"SNODE L{3 + k}"] = [p[k] for p in paths]
+    for k, labels in enumerate(SNODE_DEEPER_LEVELS):
+        domains[f"SNODE L{7 + k}"] = labels + [""]
+    return {name: list(dict.fromkeys(values)) for name, values in domains.items()}
+
+
+def hrcol_schema(seed=DEFAULT_SEED):
+    """Column list for hr_columnar.create, in COLUMNS order."""
+    dictionaries = hrcol_dictionaries(seed)
+    schema = []
+    for name in COLUMNS:
+        kind = INT_COLUMNS.get(name, "dict")
+        col = {"name": name, "kind": kind}
+        if kind == "dict":
+            col["dictionary"] = dictionaries[name]
+        elif kind == "employee_id":
+            col["letters"] = EMPLOYEE_ID_LETTERS
+        schema.append(col)
+    return schema
+
+
+@lru_cache(maxsize=8)
+def _hrcol_code_maps(seed):
+    """Per dict column: (draw_employee_block code key, array mapping its codes to dictionary codes)."""
+    t = _numpy_tables()
+    dictionaries = hrcol_dictionaries(seed)
+    regions = list(REGIONS.keys())
+    sources = {
+        "Employee First Name": ("first", FIRST_NAMES),
+        "Employee Last Name": ("last", LAST_NAMES),
+        "Employment Type": ("const", ["Full-Time"]),
+        "Employment Status": ("const", ["Active"]),
+        "Hire Date": ("hire", dictionaries["Hire Date"]),
+        "Contract End Date": ("const", [""]),
+        "Legal Entity": ("region", [LEGAL_ENTITIES[r] for r in regions]),
+        "Job Title": ("title", t["titles"]),
+        "Job Family": ("jf", t["jf_labels"]),
+        "Job Grade / Band": ("grade", GRADES),
+        "Manager Name": ("manager", generate_manager_names(seed)),
+        "Region": ("region", regions),
+        "Sub-Region / Country": ("city", [loc[1] for loc in t["locations"]]),
+        "Country": ("city", [loc[2] for loc in t["locations"]]),
+        "Employee Location (City)": ("city", [loc[3] for loc in t["locations"]]),
+        "Office / Site Code": ("city", [loc[4] for loc in t["locations"]]),
+        "Cost Center": ("cc", t["cc_codes"]),
+        "Cost Center Name": ("cc", t["cc_labels"]),
+        "Business Line": ("bl", t["bl_names"]),
+        "SNODE L1": ("const", ["Commercial Bank"]),
+        "SNODE L2": ("bl", t["bl_names"]),
+    }
+    for k in range(4):
+        sources[f"SNODE L{3 + k}"] = ("path", [p[1 + k] for p in t["paths"]])
+    for k, labels in enumerate(SNODE_DEEPER_LEVELS):
+        sources[f"SNODE L{7 + k}"] = (k, labels + [""])
+    maps = {}
+    for name, (key, labels) in sources.items():
+        index = {value: code for code, value in enumerate(dictionaries[name])}
+        maps[name] = (key, np.array([index[v] for v in labels], dtype=np.int64))
+    return maps
+
+
+def encode_numpy_block(c, seed=DEFAULT_SEED):
+    """Map one block of draw_employee_block codes to .hrcol column arrays, in COLUMNS order."""
+    maps = _hrcol_code_maps(seed)
+    n_last = len(LAST_NAMES)
+    keyed = dict(c, first=c["name"] // n_last, last=c["name"] % n_last, const=np.zeros(len(c["depth"]), dtype=np.int64))
+    out = []
+    for name in COLUMNS:
+        if name == "Employee ID":
+            out.append(c["id"])
+        elif name == "Job Code":
+            out.append(c["job_code"])
+        else:
+            key, mapping = maps[name]
+            out.append(mapping[c["deeper"][key] if isinstance(key, int) else keyed[key]])
+    return out
+
+
+def encode_rows(rows, seed=DEFAULT_SEED):
+    """Encode row dicts to .hrcol column arrays, in COLUMNS order."""
+    dictionaries = hrcol_dictionaries(seed)
+    letters = {letter: k * 900000 for k, letter in enumerate(EMPLOYEE_ID_LETTERS)}
+    out = []
+    for name in COLUMNS:
+        values = [row[name] for row in rows]
+        if name == "Employee ID":
+            out.append([letters[v[0]] + int(v[1:]) - 100000 for v in values])
+        elif name == "Job Code":
+            out.append(list(map(int, values)))
+        else:
+            index = {value: code for code, value in enumerate(dictionaries[name])}
+            out.append([index[v] for v in values])
+    return out
+
+
+def encode_block(block, n, seed=DEFAULT_SEED, backend="python", stats=None):
+    """Return one block as .hrcol column arrays, updating stats if given."""
+    if backend == "numpy":
+        codes = draw_employee_block(block, n, seed)
+        if stats is not None:
+            stats.update_codes(codes)
+        return encode_numpy_block(codes, seed)
+
+    rows = list(iter_employee_block(block, n, seed))
+    if stats is not None:
+        for row in rows:
+            stats.update(row)
+    return encode_rows(rows, seed)
+
+
+def _write_hrcol_block(job):
+    """Worker: encode one block and write it in place; returns (stats, row count)."""
+    block, n, seed, backend, out_path, columns = job
+    stats = HRStats()
+    codes = encode_block(block, n, seed, backend, stats)
+    hr_columnar.write_block(out_path, columns, block * BLOCK_SIZE, codes)
+    return stats, stats.total
+
+
+def generate_hrcol(n, out_path, seed=DEFAULT_SEED, workers=1, backend="python"):
+    """Generate n employees into a .hrcol file at out_path. Returns (row count, HRStats).
+
+    Holds the same rows as the CSV for the same (seed, n, backend), and is
+    identical for any worker count.
+    """
+    if hr_columnar is None:
+        raise RuntimeError("the hrcol format requires NumPy (pip install numpy)")
+    # Workers only need each column's dtype and offset, not its dictionary
+    columns = [{"dtype": col["dtype"], "offset": col["offset"]}
+               for col in hr_columnar.create(out_path, n, hrcol_schema(seed))]
+    jobs = [(block, n, seed, backend, out_path, columns) for block in range(block_count(n))]
+    stats = HRStats()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_stats, _ in pool.map(_write_hrcol_block, jobs):
+                stats.merge(shard_stats)
+    else:
+        for job in jobs:
+            stats.merge(_write_hrcol_block(job)[0])
+    return stats.total, stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the synthetic commercial bank HR master CSV.")
+    parser.add_argument("--count", type=int, default=1000, help="number of employees to generate (default: 1000)")
+    parser.add_argument("--out", default=None,
+                        help="output path (default: data/commercial_bank_hr_data.csv, or .hrcol with --format hrcol)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; output is identical for any value (default: 1, no pool)")
+    parser.add_argument("--backend", choices=BACKENDS, default="python",
+                        help="row generator: per-row python draws or column-wise numpy arrays (default: python)")
+    parser.add_argument("--format", choices=FORMATS, default="csv",
+                        help="csv text, or hrcol: dictionary-encoded columns readable via hr_columnar (default: csv)")
+    args = parser.parse_args(argv)
+    if args.out is None:
+        args.out = DEFAULT_OUT_PATH if args.format == "csv" else os.path.splitext(DEFAULT_OUT_PATH)[0] + ".hrcol"
+    if not 0 <= args.count <= EMPLOYEE_ID_SPACE:
+        parser.error(f"--count must be between 0 and {EMPLOYEE_ID_SPACE} (the Employee ID space)")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Generating {args.count} employees...")
+
+    if args.format == "hrcol":
+        written, stats = generate_hrcol(args.count, args.out, args.seed, args.workers, args.backend)
+    elif args.workers > 1:
+        written, stats = generate_parallel(args.count, args.out, args.seed, args.workers, args.backend)
+    else:
+        written, stats = generate_serial(args.count, args.out, args.seed, args.backend)
+
+    print(f"Written {written} employees to {args.out}")
+    print(f"Columns: {len(COLUMNS)}")
+    stats.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,808 @@
+"""
+Batch role mining with NumPy: the engine.js pipeline (as engine-cli.js runs
+it) for nightly server-side runs over the full HR master and entitlement
+extract, without Node or a browser.
+
+- HR master (CSV or .hrcol) + entitlement extract + user list → one JSON file
+  per option, byte for byte the documents the app's "Export JSON" downloads
+- The 13 grouping strategies (profile_hr_data.STRATEGIES), org-wide overspill
+  and precision, threshold filtering, the five weighted variants, greedy set
+  cover and scoreSolution, with the same tie-breaking and floating-point
+  evaluation order as engine.js, so the same roles come out
+
+Layout: HR attributes are integer codes, combined per strategy into one
+int64 key per employee (mixed radix, re-densified when the product of the
+dictionary sizes would overflow), so grouping the org and the targets is one
+np.unique each. Holdings are a CSR user × entitlement matrix over just the
+entitlements the targets hold, expanded once into (uploaded entry,
+entitlement) pairs; a strategy's per-group entitlement counts are a bincount
+over group × entitlement cells, a few million cells at a time. Only counts
+that can pass a variant's threshold are kept. The greedy cover keeps each
+candidate's newly-coverable user count and, when a role is picked, takes one
+off every other candidate holding each newly covered user (a user is in at
+most one group per strategy), instead of intersecting bitsets every round.
+
+Usage: python role_engine.py --users PATH [--hr PATH] [--entitlements PATH] [--threshold PCT]
+                             [--min-group N] [--out-dir DIR] [--report PATH]
+"""
+import argparse
+import csv
+import json
+import math
+import operator
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+import numpy as np
+
+from profile_hr_data import STRATEGIES
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_HR_PATH = os.path.join(DATA_DIR, "commercial_bank_hr_data.csv")
+DEFAULT_ENTITLEMENTS_PATH = os.path.join(DATA_DIR, "entitlements.csv")
+DEFAULT_THRESHOLD = 80
+DEFAULT_MIN_GROUP = 2
+
+# Mirrors `variantConfigs` in engine.js
+VARIANT_CONFIGS = [
+    {
+        "name": "Recommended (Fewest Roles, Best Precision)",
+        "description": "Optimized to assign all users into the fewest possible roles while minimizing overspill — extra org employees pulled into the role who are not in your target list.",
+        "weights": {"coverage": 0.35, "commonality": 0.20, "richness": 0.10, "groupSize": 0.05, "precision": 0.30},
+        "thresholdAdjust": 0, "minGroupAdjust": 0,
+    },
+    {
+        "name": "Maximum Precision (Minimal Overspill)",
+        "description": "Prioritizes the tightest possible role criteria so that virtually no unintended employees are scoped in. May produce more roles to achieve precision.",
+        "weights": {"coverage": 0.20, "commonality": 0.15, "richness": 0.05, "groupSize": 0.05, "precision": 0.55},
+        "thresholdAdjust": 0, "minGroupAdjust": 0,
+        "preferGranular": True,
+    },
+    {
+        "name": "Maximum Commonality",
+        "description": "Prioritizes the highest possible entitlement alignment within each role, with moderate overspill control.",
+        "weights": {"coverage": 0.20, "commonality": 0.45, "richness": 0.10, "groupSize": 0.05, "precision": 0.20},
+        "thresholdAdjust": 0.05, "minGroupAdjust": 0,
+    },
+    {
+        "name": "Broad Coverage",
+        "description": "Focuses on covering every user with minimal gaps, accepting slightly lower commonality and precision to reduce ungrouped users.",
+        "weights": {"coverage": 0.50, "commonality": 0.15, "richness": 0.10, "groupSize": 0.05, "precision": 0.20},
+        "thresholdAdjust": -0.05, "minGroupAdjust": 0,
+    },
+    {
+        "name": "Simple Grouping",
+        "description": "Favors broad, single-attribute groupings (e.g., Business Line or Job Family alone) for easier organizational mapping. May have higher overspill.",
+        "weights": {"coverage": 0.35, "commonality": 0.20, "richness": 0.10, "groupSize": 0.15, "precision": 0.20},
+        "thresholdAdjust": 0, "minGroupAdjust": 0,
+        "preferSimple": True,
+    },
+]
+
+STRATEGY_COLUMNS = list(dict.fromkeys(c for _, columns in STRATEGIES for c in columns))
+# (export field, extract column) of an entitlement, in export order
+ENTITLEMENT_FIELDS = [
+    ("entitlementId", "Entitlement ID"),
+    ("application", "Application"),
+    ("applicationId", "Application ID"),
+    ("applicationBU", "Application Business Unit"),
+    ("entitlementName", "Entitlement Name"),
+]
+OUTLIER_COMMONALITY = 0.2
+# Group × entitlement cells counted per bincount (int64 each)
+CHUNK_CELLS = 1 << 22
+
+
+# ─── Inputs ───
+
+@contextmanager
+def _open_csv(path):
+    """(header, csv.reader) of a CSV file, a UTF-8 BOM dropped; see _padded for the rows."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        yield next(reader, []), reader
+
+
+def _padded(row, width):
+    """A row with fewer than width fields, padded with empty ones; None for a blank line."""
+    return row + [''] * (width - len(row)) if row else None
+
+
+def _column_index(header, name, path):
+    try:
+        return header.index(name)
+    except ValueError:
+        raise ValueError(f'{path}: CSV must contain a "{name}" column') from None
+
+
+class Org:
+    """The HR master's strategy columns as integer codes: columns[name] = (codes, values)."""
+
+    def __init__(self, rows, columns, row_index):
+        self.rows = rows
+        self.columns = columns
+        self.row_index = row_index  # Employee ID → row (the last row wins, as in engine.js)
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith(".hrcol"):
+            return cls._load_hrcol(path)
+        lookups = [{} for _ in STRATEGY_COLUMNS]
+        codes = [[] for _ in STRATEGY_COLUMNS]
+        row_index = {}
+        n = 0
+        with _open_csv(path) as (header, reader):
+            id_col = _column_index(header, "Employee ID", path)
+            idx = [_column_index(header, c, path) for c in STRATEGY_COLUMNS]
+            width = len(header)
+            for row in reader:
+                if len(row) < width:
+                    row = _padded(row, width)
+                    if row is None:
+                        continue
+                for i, lookup, out in zip(idx, lookups, codes):
+                    v = row[i]
+                    code = lookup.get(v)
+                    if code is None:
+                        code = lookup[v] = len(lookup)
+                    out.append(code)
+                row_index[row[id_col]] = n
+                n += 1
+        columns = {c: (np.array(out, dtype=np.int64), list(lookup))
+                   for c, lookup, out in zip(STRATEGY_COLUMNS, lookups, codes)}
+        return cls(n, columns, row_index)
+
+    @classmethod
+    def _load_hrcol(cls, path):
+        from hr_columnar import HRColumnar
+
+        with HRColumnar(path) as hr:
+            columns = {c: (hr.codes(c).astype(np.int64), list(hr.dictionary(c))) for c in STRATEGY_COLUMNS}
+            ids = hr.values("Employee ID").tolist()
+            rows = hr.rows
+        return cls(rows, columns, {eid: r for r, eid in enumerate(ids)})
+
+    def strategy_keys(self, columns):
+        """One int64 key per employee; equal keys ⇔ equal values in every column."""
+        key = np.zeros(self.rows, dtype=np.int64)
+        radix = 1
+        for c in columns:
+            codes, values = self.columns[c]
+            size = max(len(values), 1)
+            if radix * size >= 1 << 62:
+                _, key = np.unique(key, return_inverse=True)
+                radix = int(key.max(initial=0)) + 1
+            key = key * size + codes
+            radix *= size
+        return key
+
+
+def load_user_ids(path, org):
+    """Uploaded Employee IDs found in the HR master, in file order (duplicates kept); returns (ids, dropped)."""
+    with _open_csv(path) as (header, reader):
+        id_col = next((i for i, k in enumerate(header)
+                       if re.sub(r"[\s_-]", "", k.strip().lower()) == "employeeid"), None)
+        if id_col is None:
+            raise ValueError(f'{path}: CSV must contain an "Employee ID" column')
+        ids = [v for v in (row[id_col].strip() for row in reader if len(row) > id_col) if v]
+    valid = [v for v in ids if v in org.row_index]
+    if len(valid) < 2:
+        raise ValueError("Need at least 2 valid employee IDs found in HR data")
+    return valid, len(ids) - len(valid)
+
+
+class Targets:
+    """The distinct target users (first-seen order), the uploaded list as refs into them, and their holdings.
+
+    Holdings are CSR: user u holds ents[offsets[u]:offsets[u + 1]], indices into
+    entitlements, in extract order with repeated grants dropped.
+    """
+
+    def __init__(self, user_ids, org):
+        self.ids = list(dict.fromkeys(user_ids))
+        index = {eid: u for u, eid in enumerate(self.ids)}
+        self.refs = np.array([index[eid] for eid in user_ids], dtype=np.int64)
+        self.rows = np.array([org.row_index[eid] for eid in self.ids], dtype=np.int64)
+        self.entitlements = []
+        self.offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        self.ents = np.zeros(0, dtype=np.int64)
+
+    def load_holdings(self, path):
+        """Read the entitlement extract, keeping the target users' rows only."""
+        user_index = {eid: u for u, eid in enumerate(self.ids)}.get
+        ent_index = {}
+        users, ents = [], []
+        with _open_csv(path) as (header, reader):
+            id_col = _column_index(header, "Employee ID", path)
+            fields = operator.itemgetter(*(_column_index(header, c, path) for _, c in ENTITLEMENT_FIELDS))
+            width = len(header)
+            for row in reader:
+                if len(row) < width:
+                    row = _padded(row, width)
+                    if row is None:
+                        continue
+                u = user_index(row[id_col])
+                if u is None:
+                    continue
+                values = fields(row)
+                e = ent_index.get(values)
+                if e is None:
+                    e = ent_index[values] = len(self.entitlements)
+                    self.entitlements.append(dict(zip((f for f, _ in ENTITLEMENT_FIELDS), values)))
+                users.append(u)
+                ents.append(e)
+
+        users = np.array(users, dtype=np.int64)
+        ents = np.array(ents, dtype=np.int64)
+        # First grant of each (user, entitlement), then grouped by user in extract order
+        _, first = np.unique(users * max(len(self.entitlements), 1) + ents, return_index=True)
+        first.sort()
+        order = first[np.argsort(users[first], kind="stable")]
+        self.ents = ents[order]
+        self.offsets[1:] = np.cumsum(np.bincount(users[order], minlength=len(self.ids)))
+
+
+# ─── Phase 1: Raw candidate pool ───
+
+def _ranges(starts, lens):
+    """Concatenated aranges: starts[i], starts[i] + 1, ..., starts[i] + lens[i] - 1 for every i."""
+    ends = np.cumsum(lens)
+    return np.repeat(starts - (ends - lens), lens) + np.arange(ends[-1] if len(ends) else 0)
+
+
+class Phase1:
+    """Every strategy's groups of at least min_members uploaded entries, with entitlement counts.
+
+    Groups are numbered in strategy order, then first-seen order. Of each
+    group's counts only those with commonality ≥ min_commonality are kept
+    (the lowest threshold a variant will ask for); a selected role's full
+    counts, outliers included, are recounted by role().
+    """
+
+    def __init__(self, org, targets, min_members, min_commonality):
+        self.targets = targets
+        refs = targets.refs
+        n = len(refs)
+        ref_rows = targets.rows[refs]
+        entitlement_count = len(targets.entitlements)
+
+        # (uploaded entry, entitlement) pairs in scan order: entry i's holdings start at pair_offsets[i]
+        lens = np.diff(targets.offsets)[refs]
+        self.pair_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lens, out=self.pair_offsets[1:])
+        self.pair_ents = targets.ents[_ranges(targets.offsets[refs], lens)]
+        # Only the first uploaded entry of a user counts towards the distinct members
+        is_first = np.zeros(n, dtype=bool)
+        is_first[np.unique(refs, return_index=True)[1]] = True
+
+        self.strategy_idx, self.group_keys, self.org_totals, self.member_counts = [], [], [], []
+        self.member_offsets, self.members = [0], []  # uploaded entries, in upload order
+        self.user_offsets, self.users = [0], []      # distinct users, in first-seen order
+        self.user_group = np.full((len(STRATEGIES), len(targets.ids)), -1, dtype=np.int64)
+        empty = np.zeros(0, dtype=np.int64)
+        kept_group, kept_count, kept_first = [empty], [empty], [empty]
+
+        for s, (_, columns) in enumerate(STRATEGIES):
+            org_keys = org.strategy_keys(columns)
+            ref_keys = org_keys[ref_rows]
+            org_keys, org_counts = np.unique(org_keys, return_counts=True)
+            keys, first, inverse, counts = np.unique(ref_keys, return_index=True, return_inverse=True,
+                                                     return_counts=True)
+            kept = np.flatnonzero(counts >= min_members)
+            kept = kept[np.argsort(first[kept])]
+            local = np.full(len(keys), -1, dtype=np.int64)
+            local[kept] = np.arange(len(kept))
+            ref_group = local[inverse]
+            base = len(self.group_keys)
+
+            for k in kept.tolist():
+                r = ref_rows[first[k]]
+                self.group_keys.append("|".join(org.columns[c][1][org.columns[c][0][r]] for c in columns))
+            self.strategy_idx += [s] * len(kept)
+            self.org_totals += org_counts[np.searchsorted(org_keys, keys[kept])].tolist()
+            self.member_counts += counts[kept].tolist()
+            member_refs = np.argsort(ref_group, kind="stable")
+            member_refs = member_refs[ref_group[member_refs] >= 0]
+            self.members.append(member_refs)
+            self.member_offsets += (self.member_offsets[-1] + np.cumsum(counts[kept])).tolist()
+            first_refs = member_refs[is_first[member_refs]]
+            self.users.append(refs[first_refs])
+            self.user_offsets += (self.user_offsets[-1]
+                                  + np.cumsum(np.bincount(ref_group[first_refs], minlength=len(kept)))).tolist()
+            in_group = ref_group >= 0
+            self.user_group[s, refs[in_group]] = base + ref_group[in_group]
+
+            # Entitlement counts per group, a block of groups at a time; the
+            # members' pairs in group order make each block one slice
+            member_lens = lens[member_refs]
+            group_pairs = _ranges(self.pair_offsets[member_refs], member_lens)
+            # group × entitlement cell of each pair
+            pair_cells = np.repeat(ref_group[member_refs] * entitlement_count, member_lens)
+            pair_cells += self.pair_ents[group_pairs]
+            member_pairs = np.concatenate(([0], np.cumsum(member_lens)))
+            group_offsets = member_pairs[np.concatenate(([0], np.cumsum(counts[kept])))]
+            member_counts = counts[kept]
+            step = max(1, CHUNK_CELLS // max(entitlement_count, 1))
+            for lo in range(0, len(kept), step):
+                hi = min(lo + step, len(kept))
+                block = slice(group_offsets[lo], group_offsets[hi])
+                pairs = group_pairs[block]
+                cells = pair_cells[block] - lo * entitlement_count if lo else pair_cells[block]
+                cell_counts = np.bincount(cells, minlength=(hi - lo) * entitlement_count)
+                nz = np.flatnonzero(cell_counts)
+                group = lo + nz // entitlement_count
+                nz = nz[cell_counts[nz] / member_counts[group] >= min_commonality]
+                # Earliest pair of each kept cell: its first-seen position in a direct scan
+                cell_entry = np.full(len(cell_counts), -1, dtype=np.int64)
+                cell_entry[nz] = np.arange(len(nz))
+                entry = cell_entry[cells]
+                hit = entry >= 0
+                first_seen = np.full(len(nz), len(self.pair_ents), dtype=np.int64)
+                np.minimum.at(first_seen, entry[hit], pairs[hit])
+                kept_group.append(base + lo + nz // entitlement_count)
+                kept_count.append(cell_counts[nz])
+                kept_first.append(first_seen)
+
+        self.members = np.concatenate(self.members)
+        self.users = np.concatenate(self.users)
+        self.member_counts = np.array(self.member_counts, dtype=np.int64)
+        self.user_counts = np.diff(self.user_offsets)
+        self.org_totals = np.array(self.org_totals, dtype=np.int64)
+        self.org_totals = np.where(self.org_totals > 0, self.org_totals, self.member_counts)
+
+        # Kept counts grouped by group, each group's in first-seen order
+        group = np.concatenate(kept_group)
+        first_seen = np.concatenate(kept_first)
+        order = np.lexsort((first_seen, group))
+        self.entry_group = group[order]
+        self.entry_commonality = np.concatenate(kept_count)[order] / self.member_counts[self.entry_group]
+        self.entry_offsets = np.zeros(len(self.group_keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.entry_group, minlength=len(self.group_keys)), out=self.entry_offsets[1:])
+        self._at_threshold = {}
+        self._roles = {}
+
+    def shared(self, threshold):
+        """(shared entitlement count, average shared commonality) of every group at a threshold."""
+        if threshold not in self._at_threshold:
+            shared = self.entry_commonality >= threshold
+            counts = np.bincount(self.entry_group[shared], minlength=len(self.group_keys))
+            # Summed one position at a time, in first-seen order, as engine.js adds them up
+            values = np.where(shared, self.entry_commonality, 0.0)
+            lens = np.diff(self.entry_offsets)
+            sums = np.zeros(len(self.group_keys))
+            groups = np.flatnonzero(lens)
+            for k in range(int(lens.max(initial=0))):
+                groups = groups[lens[groups] > k]
+                sums[groups] += values[self.entry_offsets[groups] + k]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._at_threshold[threshold] = (counts, sums / counts)
+        return self._at_threshold[threshold]
+
+    def role(self, g):
+        """Group g's full counts: (held entitlements by first-seen, counts, its pairs' entitlements and users)."""
+        if g not in self._roles:
+            refs = self.members[self.member_offsets[g]:self.member_offsets[g + 1]]
+            lens = self.pair_offsets[refs + 1] - self.pair_offsets[refs]
+            ents = self.pair_ents[_ranges(self.pair_offsets[refs], lens)]
+            counts = np.bincount(ents, minlength=len(self.targets.entitlements))
+            first_seen = np.full(len(counts), len(ents), dtype=np.int64)
+            np.minimum.at(first_seen, ents, np.arange(len(ents)))
+            held = np.flatnonzero(counts)
+            held = held[np.argsort(first_seen[held], kind="stable")]
+            self._roles[g] = (held, counts, ents, np.repeat(self.targets.refs[refs], lens))
+        return self._roles[g]
+
+    def criteria(self, g):
+        name = STRATEGIES[self.strategy_idx[g]][0]
+        values = self.group_keys[g].split("|")
+        return {label.strip(): values[i].strip() if i < len(values) else ""
+                for i, label in enumerate(name.split(" + "))}
+
+    def _ent_object(self, e, count, member_count):
+        return {**self.targets.entitlements[e], "commonality": count / member_count,
+                "userCount": count, "totalUsers": member_count}
+
+    def shared_entitlements(self, g, threshold):
+        held, counts, _, _ = self.role(g)
+        mc = int(self.member_counts[g])
+        ordered = held[np.argsort(-counts[held], kind="stable")]
+        return [self._ent_object(e, int(counts[e]), mc) for e in ordered.tolist() if counts[e] / mc >= threshold]
+
+    def outlier_entitlements(self, g):
+        held, counts, _, _ = self.role(g)
+        mc = int(self.member_counts[g])
+        ordered = held[np.argsort(counts[held], kind="stable")]
+        return [self._ent_object(e, int(counts[e]), mc) for e in ordered.tolist()
+                if counts[e] / mc < OUTLIER_COMMONALITY]
+
+    def user_outliers(self, g):
+        """Per member, the entitlements no other member of the group holds."""
+        _, counts, ents, owners = self.role(g)
+        unique = counts[ents] == 1
+        out = {}
+        for u, e in zip(owners[unique].tolist(), ents[unique].tolist()):
+            out.setdefault(self.targets.ids[u], []).append(self.targets.entitlements[e])
+        return out
+
+
+def phase1_min_group(min_group):
+    return min(variant_min_group(config, min_group) for config in VARIANT_CONFIGS)
+
+
+def variant_min_group(config, min_group):
+    return max(2, min_group + config["minGroupAdjust"])
+
+
+def variant_threshold(config, threshold):
+    return max(0.50, min(1.0, threshold + config["thresholdAdjust"]))
+
+
+# ─── Greedy Set Cover ───
+
+def _js_sum(values):
+    """Left-to-right float sum (sum() may compensate rounding; engine.js does not)."""
+    total = 0
+    for v in values:
+        total += v
+    return total
+
+
+def greedy_set_cover(phase1, candidates, shared, avg_commonality, weights, min_group, bonuses):
+    """Candidate groups picked in order, and the users left uncovered (a boolean mask).
+
+    Each round takes the highest score, the earliest candidate on ties, among
+    candidates that would newly cover at least min(min_group, uncovered) users.
+    """
+    user_total = len(phase1.targets.ids)
+    # group → candidate index; the extra last entry (-1) is what a user_group of -1 looks up
+    position = np.full(len(phase1.group_keys) + 1, -1, dtype=np.int64)
+    position[candidates] = np.arange(len(candidates))
+    # user → candidate index under each strategy (-1: none), for the coverage updates
+    candidate_of_user = position[phase1.user_group]
+    new_count = phase1.user_counts[candidates].copy()
+    member_counts = phase1.member_counts[candidates]
+    precision = member_counts / phase1.org_totals[candidates]
+    commonality_term = weights["commonality"] * avg_commonality
+    richness_term = weights["richness"] * np.minimum(shared / 50, 1)
+    group_size_term = weights["groupSize"] * np.minimum(member_counts / user_total, 1)
+    precision_term = weights.get("precision", 0) * precision
+
+    uncovered = np.ones(user_total, dtype=bool)
+    remaining = user_total
+    used = np.zeros(len(candidates), dtype=bool)
+    solution = []
+    while remaining > 0:
+        live = ~used & (new_count >= min(min_group, remaining)) & (new_count > 0)
+        if not live.any():
+            break
+        score = (weights["coverage"] * (new_count / remaining) + commonality_term + richness_term
+                 + group_size_term + precision_term + bonuses)
+        best = int(np.argmax(np.where(live, score, -np.inf)))
+        used[best] = True
+        g = int(candidates[best])
+        users = phase1.users[phase1.user_offsets[g]:phase1.user_offsets[g + 1]]
+        newly = users[uncovered[users]]
+        uncovered[newly] = False
+        remaining -= len(newly)
+        for strategy_candidates in candidate_of_user:
+            hit = strategy_candidates[newly]
+            np.subtract.at(new_count, hit[hit >= 0], 1)
+        solution.append(best)
+    return solution, uncovered
+
+
+def score_solution(solution):
+    """Composite score of a solution, as scoreSolution in engine.js."""
+    normalized_role_count = solution["totalRoles"] / solution["totalUsers"] if solution["totalUsers"] > 0 else 1
+    return (
+        solution["coveragePercent"] * 30
+        + (1 - min(normalized_role_count, 1)) * 25
+        + solution["avgCommonality"] * 15
+        + (solution["avgPrecision"] or 0) * 20
+        + min(solution["totalSharedEntitlements"] / (max(solution["totalRoles"], 1) * 40), 1) * 10
+    )
+
+
+def run_variant(phase1, threshold, min_group, variant_index):
+    """Solve one variant; the solution mirrors runVariant's (roles are dicts, users are Employee IDs)."""
+    config = VARIANT_CONFIGS[variant_index]
+    adj_threshold = variant_threshold(config, threshold)
+    adj_min_group = variant_min_group(config, min_group)
+
+    shared, avg_commonality = phase1.shared(adj_threshold)
+    candidates = np.flatnonzero((phase1.member_counts >= adj_min_group) & (shared > 0))
+    attr_count = np.array([len(STRATEGIES[s][1]) for s in phase1.strategy_idx], dtype=np.int64)[candidates]
+    if config.get("preferGranular"):
+        bonuses = attr_count * 0.10
+    elif config.get("preferSimple"):
+        bonuses = (1 / attr_count) * 0.15
+    else:
+        bonuses = np.zeros(len(candidates))
+
+    picked, uncovered = greedy_set_cover(phase1, candidates, shared[candidates], avg_commonality[candidates],
+                                         config["weights"], adj_min_group, bonuses)
+    ids = phase1.targets.ids
+    roles = []
+    for k in picked:
+        g = int(candidates[k])
+        member_count = int(phase1.member_counts[g])
+        org_total = int(phase1.org_totals[g])
+        users = phase1.users[phase1.user_offsets[g]:phase1.user_offsets[g + 1]]
+        roles.append({
+            "groupIndex": g,
+            "strategyName": STRATEGIES[phase1.strategy_idx[g]][0],
+            "attrCount": len(STRATEGIES[phase1.strategy_idx[g]][1]),
+            "groupKey": phase1.group_keys[g],
+            "memberIds": [ids[u] for u in users.tolist()],
+            "memberCount": member_count,
+            "criteria": phase1.criteria(g),
+            "roleName": " - ".join(v.strip() for v in phase1.group_keys[g].split("|")),
+            "sharedCount": int(shared[g]),
+            "threshold": adj_threshold,
+            "avgCommonality": float(avg_commonality[g]),
+            "orgTotal": org_total,
+            "overspill": org_total - member_count,
+            "precision": member_count / org_total,
+        })
+
+    user_total = len(ids)
+    covered = user_total - int(uncovered.sum())
+    solution = {
+        "roles": roles,
+        "ungroupedUsers": [ids[u] for u in np.flatnonzero(uncovered).tolist()],
+        "totalRoles": len(roles),
+        "totalUsersCovered": covered,
+        "totalUsers": user_total,
+        "coveragePercent": covered / user_total if user_total > 0 else 0,
+        "avgCommonality": _js_sum(r["avgCommonality"] for r in roles) / len(roles) if roles else 0,
+        "avgPrecision": _js_sum(r["precision"] for r in roles) / len(roles) if roles else 0,
+        "totalOverspill": sum(r["overspill"] for r in roles),
+        "totalSharedEntitlements": sum(r["sharedCount"] for r in roles),
+        "strategiesUsed": list(dict.fromkeys(r["strategyName"] for r in roles)),
+        "optionIndex": variant_index + 1,
+        "optionName": config["name"],
+        "optionDescription": config["description"],
+        "weights": config["weights"],
+    }
+    solution["compositeScore"] = score_solution(solution)
+    return solution
+
+
+# ─── Export Documents ───
+# The same text as exportOptionJson: JSON.stringify(document, null, 2),
+# with JavaScript's number formatting and property order.
+
+def _js_round(x):
+    """Math.round: halves go up."""
+    f = math.floor(x)
+    return f + 1 if x - f >= 0.5 else f
+
+
+def _js_number(x):
+    if isinstance(x, (int, np.integer)):
+        return str(int(x))
+    if not math.isfinite(x):
+        return "null"
+    if x == 0:
+        return "0"
+    text = repr(float(x))
+    if "e" not in text:
+        # Fixed notation reads the same in both, bar the ".0" of integral values
+        return text[:-2] if text.endswith(".0") else text
+    _, digits, exp = Decimal(text).normalize().as_tuple()
+    digits = "".join(map(str, digits))
+    k = len(digits)
+    n = k + exp  # decimal point position, as in Number::toString
+    sign = "-" if x < 0 else ""
+    if k <= n <= 21:
+        return sign + digits + "0" * (n - k)
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + digits
+    e = n - 1
+    mantissa = digits if k == 1 else digits[0] + "." + digits[1:]
+    return f"{sign}{mantissa}e{'+' if e >= 0 else '-'}{abs(e)}"
+
+
+def _is_array_index(k):
+    return k.isdigit() and (k == "0" or k[0] != "0") and int(k) < 2 ** 32 - 1
+
+
+# The string escaping of json.dumps(ensure_ascii=False), which is JSON.stringify's
+_encode_string = json.encoder.encode_basestring
+
+
+def to_json(value, indent="", _memo=None):
+    """JSON.stringify(value, null, 2).
+
+    Objects are serialized once per indent (an entitlement shows up under
+    every member it is an outlier for); the memo lives for one call, while
+    every object in value is alive, so ids cannot be reused.
+    """
+    kind = type(value)
+    if kind is str:
+        return _encode_string(value)
+    if kind is int:
+        return str(value)
+    if kind is float:
+        return _js_number(value)
+    if kind is dict:
+        if not value:
+            return "{}"
+        if _memo is None:
+            _memo = {}
+        text = _memo.get((id(value), indent))
+        if text is None:
+            inner = indent + "  "
+            parts = []
+            index_keys = []  # JavaScript lists array-index keys first, ascending
+            for k, v in value.items():
+                key = _memo.get(k)  # keys are few, so their text is kept too
+                if key is None:
+                    key = _memo[k] = _encode_string(k) + ": "
+                kind = type(v)
+                if k[:1].isdigit() and _is_array_index(k):
+                    index_keys.append((int(k), len(parts)))
+                parts.append(key + (_encode_string(v) if kind is str else str(v) if kind is int
+                                    else to_json(v, inner, _memo)))
+            if index_keys:
+                moved = {i for _, i in index_keys}
+                parts = [parts[i] for _, i in sorted(index_keys)] + [p for i, p in enumerate(parts) if i not in moved]
+            text = _memo[id(value), indent] = "{\n" + inner + f",\n{inner}".join(parts) + "\n" + indent + "}"
+        return text
+    if kind is list or kind is tuple:
+        if not value:
+            return "[]"
+        inner = indent + "  "
+        if all(type(v) is str for v in value):
+            parts = map(_encode_string, value)
+        else:
+            parts = [to_json(v, inner, _memo) for v in value]
+        return "[\n" + inner + f",\n{inner}".join(parts) + "\n" + indent + "]"
+    if value is True or value is False:
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    return _js_number(value)
+
+
+def export_base_name(sol):
+    return f"rbac_option{sol['optionIndex']}_{re.sub(r'[^a-zA-Z0-9]', '_', sol['optionName'])}"
+
+
+def export_summary(sol):
+    return {
+        "totalRoles": sol["totalRoles"],
+        "totalUsersCovered": sol["totalUsersCovered"],
+        "totalUsers": sol["totalUsers"],
+        "coveragePercent": _js_round(sol["coveragePercent"] * 100),
+        "avgCommonality": _js_round(sol["avgCommonality"] * 100),
+        "avgPrecision": _js_round((sol["avgPrecision"] or 0) * 100),
+        "totalOverspill": sol["totalOverspill"] or 0,
+        "strategiesUsed": sol["strategiesUsed"],
+    }
+
+
+def export_role(role, phase1):
+    g = role["groupIndex"]
+    return {
+        "roleName": role["roleName"],
+        "strategy": role["strategyName"],
+        "criteria": role["criteria"],
+        "memberCount": role["memberCount"],
+        "orgTotalMatch": role["orgTotal"] or role["memberCount"],
+        "overspill": role["overspill"] or 0,
+        "precision": _js_round((role["precision"] or 1) * 100),
+        "members": role["memberIds"],
+        "avgCommonality": _js_round(role["avgCommonality"] * 100),
+        "sharedEntitlements": phase1.shared_entitlements(g, role["threshold"]),
+        "outlierEntitlements": phase1.outlier_entitlements(g),
+        "userOutliers": phase1.user_outliers(g),
+    }
+
+
+def option_json_parts(sol, phase1):
+    """The option's JSON export a role at a time, as optionJsonParts in engine.js."""
+    head = to_json({
+        "option": sol["optionIndex"],
+        "name": sol["optionName"],
+        "description": sol["optionDescription"],
+        "summary": export_summary(sol),
+    })
+    yield head[:-2] + ',\n  "roles": ['
+    for r, role in enumerate(sol["roles"]):
+        yield (",\n    " if r > 0 else "\n    ") + to_json(export_role(role, phase1)).replace("\n", "\n    ")
+    yield (("\n  ]," if sol["roles"] else "],")
+           + '\n  "ungroupedUsers": ' + to_json(sol["ungroupedUsers"]).replace("\n", "\n  ") + "\n}")
+
+
+# ─── Pipeline ───
+
+def run(hr_path, entitlements_path, users_path, threshold=DEFAULT_THRESHOLD / 100,
+        min_group=DEFAULT_MIN_GROUP, out_dir="."):
+    """Run every variant and write its JSON export to out_dir; returns a report (phases, options, files)."""
+    phases = []
+
+    def phase(name, fn):
+        t0 = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - t0
+        phases.append({"name": name, "seconds": round(seconds, 4)})
+        print(f"{name:20s} {seconds:9.3f} s", file=sys.stderr)
+        return result
+
+    org = phase("load.hr", lambda: Org.load(hr_path))
+    user_ids, dropped = phase("load.users", lambda: load_user_ids(users_path, org))
+    if dropped:
+        print(f"{dropped} IDs not found in HR data were dropped", file=sys.stderr)
+    targets = Targets(user_ids, org)
+    phase("load.entitlements", lambda: targets.load_holdings(entitlements_path))
+    min_commonality = min(variant_threshold(c, threshold) for c in VARIANT_CONFIGS)
+    phase1 = phase("phase1", lambda: Phase1(org, targets, phase1_min_group(min_group), min_commonality))
+    solutions = [phase(f"variant.{v + 1}", lambda v=v: run_variant(phase1, threshold, min_group, v))
+                 for v in range(len(VARIANT_CONFIGS))]
+
+    def export():
+        os.makedirs(out_dir, exist_ok=True)
+        files = []
+        for sol in solutions:
+            path = os.path.join(out_dir, export_base_name(sol) + ".json")
+            with open(path, "w", encoding="utf-8") as f:
+                for part in option_json_parts(sol, phase1):
+                    f.write(part)
+            files.append(path)
+        return files
+    files = phase("export", export)
+
+    return {
+        "config": {"hr": hr_path, "entitlements": entitlements_path, "users": len(targets.ids),
+                   "employees": org.rows, "threshold": threshold, "minGroup": min_group, "outDir": out_dir},
+        "phases": phases,
+        "options": [{"option": sol["optionIndex"], "name": sol["optionName"], "roles": sol["totalRoles"],
+                     "usersCovered": sol["totalUsersCovered"], "ungroupedUsers": len(sol["ungroupedUsers"]),
+                     "compositeScore": round(sol["compositeScore"], 2), "file": path}
+                    for sol, path in zip(solutions, files)],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch role mining: the engine.js pipeline with NumPy.")
+    parser.add_argument("--users", required=True, help="user list CSV with an Employee ID column")
+    parser.add_argument("--hr", default=DEFAULT_HR_PATH,
+                        help="HR master CSV or .hrcol file (default: data/commercial_bank_hr_data.csv)")
+    parser.add_argument("--entitlements", default=DEFAULT_ENTITLEMENTS_PATH,
+                        help="entitlement extract CSV (default: data/entitlements.csv)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"commonality threshold in percent, 50-100 (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-group", type=int, default=DEFAULT_MIN_GROUP,
+                        help=f"minimum group size (default: {DEFAULT_MIN_GROUP})")
+    parser.add_argument("--out-dir", default=".", help="directory for the option JSON files (default: .)")
+    parser.add_argument("--report", default=None, help="write per-phase timings and option totals to this JSON file")
+    args = parser.parse_args(argv)
+    if not 50 <= args.threshold <= 100:
+        parser.error("--threshold must be between 50 and 100")
+    if args.min_group < 2:
+        parser.error("--min-group must be at least 2")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        report = run(args.hr, args.entitlements, args.users, args.threshold / 100, args.min_group, args.out_dir)
+    except (OSError, ValueError) as e:
+        sys.exit(f"role_engine: {e}")
+    if args.report is not None:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+    for option in report["options"]:
+        print(f"Option {option['option']}: {option['roles']} roles, "
+              f"{option['usersCovered']}/{report['config']['users']} users covered, "
+              f"score {option['compositeScore']} → {option['file']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Simulate one period of HR churn on an existing HR master.
+
+- Leavers: removed from the master
+- Movers: reassigned to another SNODE path (L2-L6, usually within their
+  business line), with the cost center, job family, job title, manager and
+  SNODE L7+ of the new position; name, ID, grade, location and hire date stay
+- Joiners: new employees appended with the effective date as their hire date
+- Writes the updated master and a delta file (Change Type, Effective Date,
+  then the employee's row: new values for joiners and movers, last values
+  for leavers)
+- Streams the base master row by row, so memory does not grow with its size
+
+Every decision is a keyed hash of (seed, effective date, Employee ID), so the
+same inputs always give the same outputs. Joiner IDs continue the base's
+Employee ID permutation past its high-water mark: the next unused index,
+kept in a sidecar next to each updated master (<out>.next_index.json). Chained
+periods (an updated master fed back in as --hr) read it, so a joiner never
+gets the ID of a current or former employee, even after the employee holding
+the highest index has left. A master without a sidecar (a freshly generated
+one) starts past the highest index in use.
+
+Usage: python simulate_hr_churn.py [--hr PATH] [--out PATH] [--delta PATH] [--effective-date YYYY-MM-DD]
+                                   [--leavers F] [--movers F] [--joiners F] [--seed S]
+"""
+import argparse
+import csv
+import json
+import os
+from datetime import datetime
+
+from regenerate_hr_data import (BL_CUM_WEIGHTS, BL_NAMES, COLUMNS, DEFAULT_SEED, EMPLOYEE_ID_SPACE,
+                                HIRE_DATE_END, ROW_FIELDS, TITLE_SUFFIXES, CounterRandom, build_bl_paths,
+                                employee_index, generate_deeper_snodes, generate_employee,
+                                generate_manager_names)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_HR_PATH = os.path.join(DATA_DIR, "commercial_bank_hr_data.csv")
+DEFAULT_OUT_PATH = os.path.join(DATA_DIR, "commercial_bank_hr_data_updated.csv")
+DEFAULT_DELTA_PATH = os.path.join(DATA_DIR, "hr_delta.csv")
+
+# Monthly churn profile: fractions of the base headcount
+DEFAULT_LEAVERS = 0.015
+DEFAULT_MOVERS = 0.03
+DEFAULT_JOINERS = 0.02
+# Share of movers who change business line rather than move within their own
+CROSS_BL_MOVE_RATE = 0.2
+# A churn draw decides the change, then a mover redraws the row's org fields
+CHURN_FIELDS = ROW_FIELDS + ("change", "cross_bl")
+
+DELTA_COLUMNS = ["Change Type", "Effective Date"] + COLUMNS
+
+
+# ─── Employee ID high-water mark ───
+
+def next_index_path(hr_path):
+    """Sidecar holding the next unused Employee ID index for an HR master."""
+    return hr_path + ".next_index.json"
+
+
+def read_next_index(hr_path, seed):
+    """The master's high-water mark from its sidecar, or 0 when it has none."""
+    path = next_index_path(hr_path)
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding='utf-8') as f:
+        mark = json.load(f)
+    if mark["seed"] != seed:
+        raise ValueError(f"{path} was written for seed {mark['seed']}, not {seed}")
+    return mark["next_index"]
+
+
+def write_next_index(hr_path, seed, next_index):
+    with open(next_index_path(hr_path), 'w', encoding='utf-8') as f:
+        json.dump({"seed": seed, "next_index": next_index}, f)
+        f.write("\n")
+
+
+# ─── Changes ───
+
+def move_employee(row, rng, bl_paths, manager_names):
+    """Return a copy of row reassigned to a new org position drawn from rng."""
+    bl = row["Business Line"]
+    if bl not in bl_paths or rng.random("cross_bl") < CROSS_BL_MOVE_RATE:
+        bl = rng.weighted_choice("bl", BL_NAMES, BL_CUM_WEIGHTS)
+    bl_info = bl_paths[bl]
+    division, department, team, sub_team = rng.choice("path", bl_info["paths"])
+    cc_code, cc_name = rng.choice("cost_center", bl_info["cost_centers"])
+    depth = sum(1 for lvl in range(1, 16) if row.get(f"SNODE L{lvl}"))
+
+    moved = dict(row)
+    moved.update({
+        "Job Title": f"{rng.choice('title_base', [sub_team, team])} {rng.choice('title_suffix', TITLE_SUFFIXES)}",
+        "Manager Name": rng.choice("manager", manager_names),
+        "Cost Center": cc_code,
+        "Cost Center Name": cc_name,
+        "Business Line": bl,
+    })
+    if bl != row["Business Line"]:
+        moved["Job Family"] = rng.choice("job_family", bl_info["job_families"])
+    snodes = [bl, division, department, team, sub_team] + generate_deeper_snodes(rng, depth)
+    for lvl in range(2, 16):
+        moved[f"SNODE L{lvl}"] = snodes[lvl - 2] if lvl - 2 < len(snodes) else ""
+    return moved
+
+
+def simulate_churn(hr_path, out_path, delta_path, effective_date=HIRE_DATE_END, seed=DEFAULT_SEED,
+                   leavers=DEFAULT_LEAVERS, movers=DEFAULT_MOVERS, joiners=DEFAULT_JOINERS):
+    """Stream hr_path into an updated master and a delta file. Returns {change type: count}.
+
+    seed must be the one the base master was generated with: joiner rows and
+    IDs continue its generator. The updated master's high-water mark is
+    written next to it (see next_index_path).
+    """
+    if os.path.abspath(hr_path) in (os.path.abspath(out_path), os.path.abspath(delta_path)):
+        raise ValueError("the updated master and delta must not overwrite the base master")
+    period = effective_date.strftime("%Y-%m-%d")
+    hire_date = effective_date.strftime("%m/%d/%Y")
+    bl_paths = build_bl_paths()
+    manager_names = generate_manager_names(seed)
+    counts = {"Leaver": 0, "Mover": 0, "Joiner": 0, "Unchanged": 0}
+    next_index = read_next_index(hr_path, seed)
+
+    with open(hr_path, newline='', encoding='utf-8') as base, \
+            open(out_path, 'w', newline='', encoding='utf-8') as out, \
+            open(delta_path, 'w', newline='', encoding='utf-8') as delta:
+        reader = csv.DictReader(base)
+        writer = csv.DictWriter(out, fieldnames=reader.fieldnames)
+        delta_writer = csv.DictWriter(delta, fieldnames=DELTA_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        delta_writer.writeheader()
+
+        for row in reader:
+            eid = row["Employee ID"]
+            next_index = max(next_index, employee_index(eid, seed) + 1)
+            rng = CounterRandom(seed, f"churn|{period}|{eid}", CHURN_FIELDS)
+            r = rng.random("change")
+            if r < leavers:
+                change = "Leaver"
+            elif r < leavers + movers:
+                change = "Mover"
+                row = move_employee(row, rng, bl_paths, manager_names)
+            else:
+                counts["Unchanged"] += 1
+                writer.writerow(row)
+                continue
+            counts[change] += 1
+            delta_writer.writerow({"Change Type": change, "Effective Date": period, **row})
+            if change == "Mover":
+                writer.writerow(row)
+
+        # Joiners are sized from the base headcount, which is only known now
+        base_count = counts["Leaver"] + counts["Mover"] + counts["Unchanged"]
+        n_joiners = min(round(base_count * joiners), EMPLOYEE_ID_SPACE - next_index)
+        for i in range(next_index, next_index + n_joiners):
+            row = generate_employee(i, seed, manager_names, bl_paths)
+            row["Hire Date"] = hire_date
+            writer.writerow(row)
+            delta_writer.writerow({"Change Type": "Joiner", "Effective Date": period, **row})
+        counts["Joiner"] = n_joiners
+    write_next_index(out_path, seed, next_index + n_joiners)
+    return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply one period of joiner/mover/leaver churn to an HR master.")
+    parser.add_argument("--hr", default=DEFAULT_HR_PATH, help="base HR master CSV (default: data/commercial_bank_hr_data.csv)")
+    parser.add_argument("--out", default=DEFAULT_OUT_PATH,
+                        help="updated HR master CSV (default: data/commercial_bank_hr_data_updated.csv)")
+    parser.add_argument("--delta", default=DEFAULT_DELTA_PATH, help="delta CSV (default: data/hr_delta.csv)")
+    parser.add_argument("--effective-date", type=lambda s: datetime.strptime(s, "%Y-%m-%d"), default=HIRE_DATE_END,
+                        help=f"date the changes take effect, YYYY-MM-DD (default: {HIRE_DATE_END:%Y-%m-%d})")
+    parser.add_argument("--leavers", type=float, default=DEFAULT_LEAVERS,
+                        help=f"fraction of employees who leave (default: {DEFAULT_LEAVERS})")
+    parser.add_argument("--movers", type=float, default=DEFAULT_MOVERS,
+                        help=f"fraction of employees who change org position (default: {DEFAULT_MOVERS})")
+    parser.add_argument("--joiners", type=float, default=DEFAULT_JOINERS,
+                        help=f"new hires as a fraction of the base headcount (default: {DEFAULT_JOINERS})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"seed the base master was generated with (default: {DEFAULT_SEED})")
+    args = parser.parse_args(argv)
+    if min(args.leavers, args.movers, args.joiners) < 0 or args.leavers + args.movers > 1:
+        parser.error("churn rates must be non-negative and --leavers + --movers at most 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Applying churn to {args.hr} effective {args.effective_date:%Y-%m-%d}...")
+    counts = simulate_churn(args.hr, args.out, args.delta, args.effective_date, args.seed,
+                            args.leavers, args.movers, args.joiners)
+    base = counts["Leaver"] + counts["Mover"] + counts["Unchanged"]
+    print(f"Base headcount: {base}")
+    for change in ("Leaver", "Mover", "Joiner"):
+        print(f"  {change}s: {counts[change]} ({counts[change] / max(base, 1) * 100:.1f}%)")
+    print(f"Written {base - counts['Leaver'] + counts['Joiner']} employees to {args.out}")
+    print(f"Written {counts['Leaver'] + counts['Mover'] + counts['Joiner']} changes to {args.delta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+profile_hr_data's strategy lists must match what engine.js enumerates, or
+the profiler sizes a different run from the one the engine performs.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import profile_hr_data  # noqa: E402
+
+MODES = ["standard", "lattice-1", "lattice-3", "lattice-11"]
+
+
+def engine_strategies(mode):
+    """RoleEngine.candidateStrategies(mode) as [(name, columns)], via node."""
+    script = (f"const e = require({json.dumps(os.path.join(ROOT, 'engine.js'))});"
+              f"console.log(JSON.stringify(e.candidateStrategies({json.dumps(mode)})"
+              ".map(s => [s.name, s.columns, s.attrCount])));")
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is needed to load engine.js")
+@pytest.mark.parametrize("mode", MODES)
+def test_strategies_match_engine(mode):
+    expected = engine_strategies(mode)
+    actual = [[name, columns, len(columns)] for name, columns in profile_hr_data.candidate_strategies(mode)]
+    assert actual == expected